@@ -0,0 +1,89 @@
+"""
+Compare SQLite connection profiles for write latency and list-read throughput.
+
+Each profile gets its own vault file. Writes are single-row commits shaped
+like the GUI's favorite toggles and soft deletes; reads are the All Items
+list query. Runs headless.
+
+Usage:
+    python benchmarks/bench_connection.py [--entries N] [--writes N] [--reads N]
+                                          [--profiles default,durable,legacy]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core import connection_profile
+from src.core.database import PasswordVault
+from src.core.encryption import Encryption
+
+
+def build_vault(db_path, profile, entries):
+    vault = PasswordVault(db_path, profile=profile)
+    vault.initialize_database()
+    vault.use_data_key(os.urandom(Encryption.KEY_LENGTH))
+    sealed = vault.cipher.encrypt_many(f"password-{i}" for i in range(entries))
+    vault.conn.executemany(
+        'INSERT INTO vault (title, username, encrypted_password, category) VALUES (?, ?, ?, ?)',
+        [(f"site-{i:07d}", f"user{i}", result.value, "Work") for i, result in enumerate(sealed)]
+    )
+    vault.conn.commit()
+    return vault
+
+
+def write_latencies(vault, entries, writes):
+    """Alternate favorite toggles and soft delete/restore, one commit each"""
+    timings = []
+    cursor = vault.conn.cursor()
+    for i in range(writes):
+        title = f"site-{i * 7919 % entries:07d}"
+        start = time.perf_counter()
+        if i % 2:
+            cursor.execute("UPDATE vault SET favorite = ? WHERE title = ?", (i // 2 % 2, title))
+        else:
+            cursor.execute("UPDATE vault SET deleted = ? WHERE title = ?", (i // 2 % 2, title))
+        vault.conn.commit()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def read_throughput(vault, reads):
+    """Rows per second returned by the All Items list query"""
+    rows = 0
+    start = time.perf_counter()
+    for _ in range(reads):
+        rows += len(vault.list_entries())
+    return rows / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entries', type=int, default=10000)
+    parser.add_argument('--writes', type=int, default=200)
+    parser.add_argument('--reads', type=int, default=20)
+    parser.add_argument('--profiles', default=",".join(connection_profile.PROFILES))
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="spm-bench-")
+    try:
+        print(f"{'profile':<10}{'journal':>9}{'sync':>8}{'write p50 ms':>14}{'write p95 ms':>14}{'list rows/s':>14}")
+        for name in args.profiles.split(','):
+            profile = connection_profile.get_profile(name.strip())
+            vault = build_vault(os.path.join(workdir, f"{profile.name}.db"), profile, args.entries)
+            timings = sorted(write_latencies(vault, args.entries, args.writes))
+            throughput = read_throughput(vault, args.reads)
+            vault.conn.close()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{profile.name:<10}{profile.journal_mode:>9}{profile.synchronous:>8}"
+                  f"{statistics.median(timings) * 1000:14.3f}{p95 * 1000:14.3f}{throughput:14.0f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
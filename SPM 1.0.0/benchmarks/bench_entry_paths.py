@@ -0,0 +1,74 @@
+"""
+Per-call latency of PasswordVault.get_entry/add_entry with and without the query cache.
+
+"uncached" clears the column metadata and SQL caches before every call, which
+reproduces the old path (PRAGMA table_info and string building on each call);
+"cached" is the normal path. Runs headless against a throwaway vault.
+
+Usage:
+    python benchmarks/bench_entry_paths.py [--entries N] [--calls N]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.database import PasswordVault
+from src.core.encryption import Encryption
+
+
+def per_call(vault, fn, calls, uncached):
+    timings = []
+    for i in range(calls):
+        if uncached:
+            vault.reset_query_cache()
+        start = time.perf_counter()
+        fn(i)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entries', type=int, default=10000)
+    parser.add_argument('--calls', type=int, default=2000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="spm-bench-")
+    try:
+        vault = PasswordVault(os.path.join(workdir, "bench.db"))
+        vault.initialize_database()
+        vault.use_data_key(os.urandom(Encryption.KEY_LENGTH))
+        sealed = vault.cipher.encrypt_many(f"password-{i}" for i in range(args.entries))
+        vault.conn.executemany(
+            'INSERT INTO vault (title, username, encrypted_password) VALUES (?, ?, ?)',
+            [(f"site-{i:07d}", f"user{i}", result.value) for i, result in enumerate(sealed)]
+        )
+        vault.conn.commit()
+
+        def get(i):
+            vault.get_entry('vault', title=f"site-{i * 7919 % args.entries:07d}")
+
+        def add(prefix):
+            return lambda i: vault.add_entry('vault', title=f"{prefix}-{i}", username="bench",
+                                             password="s3cret", website="https://example.com")
+
+        print(f"{'path':<12}{'uncached us':>14}{'cached us':>12}{'speedup':>10}")
+        for name, uncached_fn, cached_fn in [
+            ('get_entry', get, get),
+            ('add_entry', add("uncached"), add("cached")),
+        ]:
+            before = per_call(vault, uncached_fn, args.calls, uncached=True)
+            after = per_call(vault, cached_fn, args.calls, uncached=False)
+            print(f"{name:<12}{before:14.1f}{after:12.1f}{before / after:9.2f}x")
+        vault.conn.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
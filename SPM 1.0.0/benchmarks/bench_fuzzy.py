@@ -0,0 +1,92 @@
+"""
+Snapshot build time and query latency of the NumPy fuzzy matcher.
+
+Packs synthetic entries shaped like a real vault (site titles, e-mail
+usernames, URLs, categories, some favorites and recently used entries) and
+times subsequence, typo and filtered queries. Runs headless without a database.
+
+Usage:
+    python benchmarks/bench_fuzzy.py [--entries 100000] [--queries 200] [--budget-ms 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.fuzzy import FuzzyMatcher
+
+WORDS = ["mail", "bank", "cloud", "shop", "news", "git", "forum", "travel", "stream", "photo",
+         "music", "cred", "portal", "admin", "dev", "home", "office", "games", "health", "learn"]
+CATEGORIES = ["Work", "Personal", "Finance", "Social", "Shopping", None]
+
+
+def synthetic_rows(count, seed=0):
+    rng = random.Random(seed)
+    now = time.time()
+    rows = []
+    for row_id in range(1, count + 1):
+        name = f"{rng.choice(WORDS)}{rng.choice(WORDS)}{row_id}"
+        last_used = now - rng.uniform(0, 90 * 86400) if rng.random() < 0.1 else None
+        rows.append((row_id, name.capitalize(), f"{rng.choice(WORDS)}.{row_id}@example.com",
+                     f"https://www.{name}.com/login", rng.choice(CATEGORIES),
+                     rng.random() < 0.05, rng.random() < 0.02, last_used))
+    rows.sort(key=lambda row: row[1])
+    return rows
+
+
+def typo(word, rng):
+    """Swap two neighbouring characters"""
+    i = rng.randrange(len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entries', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--budget-ms', type=float, default=20.0,
+                        help="Exit nonzero if any workload's median exceeds this")
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.entries)
+    start = time.perf_counter()
+    matcher = FuzzyMatcher(rows)
+    print(f"Packed {len(matcher)} entries in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rng = random.Random(1)
+    titles = [row[1] for row in rows]
+    workloads = {
+        'one letter': [(rng.choice(WORDS)[0], None, None) for _ in range(args.queries)],
+        'word': [(rng.choice(WORDS), None, None) for _ in range(args.queries)],
+        'abbreviation': [(rng.choice(WORDS)[:2] + rng.choice(WORDS)[:2], None, None)
+                         for _ in range(args.queries)],
+        'exact title': [(rng.choice(titles), None, None) for _ in range(args.queries)],
+        'title typo': [(typo(rng.choice(titles).lower(), rng), None, None) for _ in range(args.queries)],
+        'word, category': [(rng.choice(WORDS), None, rng.choice(CATEGORIES[:-1])) for _ in range(args.queries)],
+        'word, favorites': [(rng.choice(WORDS), "favorites", None) for _ in range(args.queries)],
+    }
+    print(f"{'query':<18}{'median ms':>11}{'p95 ms':>10}{'avg hits':>10}")
+    slow = []
+    for name, queries in workloads.items():
+        timings, hits = [], 0
+        for query, filter_type, category in queries:
+            start = time.perf_counter()
+            hits += len(matcher.match(query, filter_type, category))
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        median = statistics.median(timings) * 1000
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000
+        print(f"{name:<18}{median:11.2f}{p95:10.2f}{hits / len(queries):10.1f}")
+        if median > args.budget_ms:
+            slow.append(name)
+
+    if slow:
+        print(f"Over the {args.budget_ms:.0f} ms budget: {', '.join(slow)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Icon decodes and paint time while scrolling the password list, per view and reload.
+
+Scrolls a PasswordListView over a synthetic vault from top to bottom ten
+rows at a time, painting each step, then does it again after a reload and in
+a second view, drawing the details panel icon of one entry per step.
+"per-model" gives each pass a fresh PixmapCache, as when every model kept its
+own decoded icons; "shared" uses one PixmapCache for the process.
+Entries use --icons distinct favicons; every fifth has no icon and every
+seventh stores the default icon's bytes, as the add dialog saves when a
+favicon can't be fetched. Runs under the offscreen QPA platform.
+
+Usage:
+    python benchmarks/bench_icon_cache.py [--entries 10000] [--icons 500]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.database import PasswordVault
+
+DETAIL_ICON_SIZE = 48
+
+
+def make_icons(count):
+    """count distinct 64x64 PNGs"""
+    from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+    from PyQt6.QtGui import QColor, QImage
+
+    icons = []
+    for i in range(count):
+        image = QImage(64, 64, QImage.Format.Format_ARGB32)
+        image.fill(QColor.fromHsv(i * 7 % 360, 128 + i % 128, 255))
+        buffer = QByteArray()
+        device = QBuffer(buffer)
+        device.open(QIODevice.OpenModeFlag.WriteOnly)
+        image.save(device, 'PNG')
+        icons.append(bytes(buffer))
+    return icons
+
+
+def build_vault(db_path, entries, icons, default_icon):
+    vault = PasswordVault(db_path)
+    vault.initialize_database()
+
+    def icon(i):
+        if i % 5 == 0:
+            return None
+        if i % 7 == 0:
+            return default_icon
+        return icons[i % len(icons)]
+
+    vault.conn.executemany(
+        'INSERT INTO vault (title, username, encrypted_password, icon) VALUES (?, ?, ?, ?)',
+        [(f"site-{i:07d}", f"user{i}", b"sealed", icon(i)) for i in range(entries)]
+    )
+    vault.conn.commit()
+    return vault
+
+
+def scroll_through(app, vault, cache):
+    """Show the list in a new view and scroll it to the bottom; (ms, decodes)"""
+    from src.gui.password_list import ICON_DATA_ROLE, PasswordListModel, PasswordListView
+
+    decodes = cache.decodes
+    start = time.perf_counter()
+    model = PasswordListModel()
+    view = PasswordListView(model)
+    view.resize(300, 600)
+    view.show()
+    model.set_pages(lambda after_key, limit: vault.list_entries(None, None, after_key, limit))
+    app.processEvents()
+    row = 0
+    while True:
+        view.scrollTo(model.index(row), PasswordListView.ScrollHint.PositionAtTop)
+        app.processEvents()
+        view.viewport().grab()
+        # The details panel, as update_password_details draws it
+        detail = min(row + 3, model.rowCount() - 1)
+        cache.pixmap(model.data(model.index(detail), ICON_DATA_ROLE), DETAIL_ICON_SIZE)
+        row += 10
+        if row >= model.rowCount():
+            if not model.canFetchMore():
+                break
+            model.fetchMore()
+    elapsed = time.perf_counter() - start
+    view.close()
+    view.deleteLater()
+    return elapsed * 1000, cache.decodes - decodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entries', type=int, default=10000)
+    parser.add_argument('--icons', type=int, default=500, help="Distinct favicons")
+    args = parser.parse_args()
+
+    from PyQt6.QtWidgets import QApplication
+    from src.gui import password_list
+    from src.gui.pixmap_cache import DEFAULT_ICON, PixmapCache
+
+    app = QApplication.instance() or QApplication([])
+    # resource_path() resolves against the working directory, as when the app runs from src
+    os.chdir(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+    workdir = tempfile.mkdtemp(prefix="spm-bench-")
+    try:
+        default_icon = PixmapCache().resource_data(DEFAULT_ICON)
+        vault = build_vault(os.path.join(workdir, "icons.db"), args.entries, make_icons(args.icons), default_icon)
+        print(f"{'cache':<10}{'pass':<14}{'ms':>9}{'decodes':>9}")
+        for mode in ('per-model', 'shared'):
+            PixmapCache._shared = PixmapCache()
+            PixmapCache.shared().preload(sizes=(password_list.LIST_ICON_SIZE,))
+            for label in ('first view', 'reload', 'second view'):
+                if mode == 'per-model':
+                    PixmapCache._shared = PixmapCache()
+                elapsed, decodes = scroll_through(app, vault, PixmapCache.shared())
+                print(f"{mode:<10}{label:<14}{elapsed:9.1f}{decodes:>9}")
+            stats = PixmapCache.shared().cache_stats()
+            print(f"{'':<10}{stats['size']} cached, {stats['bytes'] / 2**10:.0f} KiB, "
+                  f"{stats['hits']} hits, {stats['misses']} misses")
+        vault.conn.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
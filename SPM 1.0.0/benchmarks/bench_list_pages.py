@@ -0,0 +1,82 @@
+"""
+Time and memory of reading the password list whole vs one keyset page at a time.
+
+"full" is list_entries() as the list used to load it, every row and icon BLOB
+at once; "first page" is what the list now reads before its first paint and
+"deep page" the page after a key near the end of the vault, as when scrolled
+all the way down. Peak memory is Python allocations (tracemalloc) while
+reading. Every fifth entry has no icon, the rest a 2 KiB BLOB. Runs headless.
+
+Usage:
+    python benchmarks/bench_list_pages.py [--sizes 1000 10000 100000] [--page 200] [--rounds 20]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.database import PasswordVault
+
+ICON_BYTES = 2048
+
+
+def build_vault(db_path, entries):
+    vault = PasswordVault(db_path)
+    vault.initialize_database()
+    vault.conn.executemany(
+        'INSERT INTO vault (title, username, encrypted_password, icon) VALUES (?, ?, ?, ?)',
+        [(f"site-{i:07d}", f"user{i}", b"sealed", os.urandom(ICON_BYTES) if i % 5 else None)
+         for i in range(entries)]
+    )
+    vault.conn.commit()
+    return vault
+
+
+def measure(read, rounds):
+    """(median ms, peak MiB of one read)"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        read()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    read()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(timings) * 1000, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--page', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="spm-bench-")
+    try:
+        print(f"{'entries':>8}  {'read':<11}{'rows':>8}{'median ms':>11}{'peak MiB':>10}")
+        for size in args.sizes:
+            vault = build_vault(os.path.join(workdir, f"list-{size}.db"), size)
+            deep_key = (f"site-{max(size - args.page - 1, 0):07d}", 0)
+            reads = [
+                ('full', lambda: vault.list_entries()),
+                ('first page', lambda: vault.list_entries(limit=args.page)),
+                ('deep page', lambda: vault.list_entries(after_key=deep_key, limit=args.page)),
+            ]
+            for name, read in reads:
+                rows = len(read())
+                median, peak = measure(read, args.rounds)
+                print(f"{size:>8}  {name:<11}{rows:>8}{median:11.2f}{peak:10.2f}")
+            vault.conn.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
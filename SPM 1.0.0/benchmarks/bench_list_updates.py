@@ -0,0 +1,142 @@
+"""
+Cost of showing one edit in the password list: change events vs clear-and-reload.
+
+Applies edits, favorite toggles and trash/restore round trips to a synthetic
+vault shown in a PasswordListView (All Items). "reload" refreshes the list
+and recounts the sidebar after each write as MainWindow used to; "delta"
+applies the vault's change event to the model (PasswordListModel.apply_change)
+and adjusts the counts. "loaded" is how many rows the view had paged in.
+Times cover the write, the list update and the repaint. Runs under the
+offscreen QPA platform.
+
+Usage:
+    python benchmarks/bench_list_updates.py [--sizes 5000 50000 200000] [--ops 50]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.database import PasswordVault
+from src.core.encryption import Encryption
+from src.core.search_query import SearchQuery
+
+CATEGORIES = ["Work", "Personal", "Banking", "Social"]
+
+
+def build_vault(db_path, entries):
+    vault = PasswordVault(db_path)
+    vault.initialize_database()
+    vault.use_data_key(os.urandom(Encryption.KEY_LENGTH))
+    vault.conn.executemany('INSERT INTO categories (category_names, color) VALUES (?, ?)',
+                           [(name, "#808080") for name in CATEGORIES])
+    vault.conn.executemany(
+        'INSERT INTO vault (title, username, encrypted_password, category, favorite) VALUES (?, ?, ?, ?, ?)',
+        [(f"site-{i:07d}", f"user{i}", b"sealed", CATEGORIES[i % len(CATEGORIES)], i % 7 == 0)
+         for i in range(entries)]
+    )
+    vault.conn.commit()
+    return vault
+
+
+def recount(vault):
+    """The sidebar counts as MainWindow's update_*_count(None) calls read them"""
+    cursor = vault.conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM vault WHERE deleted = 0")
+    cursor.execute("SELECT COUNT(*) FROM vault WHERE favorite = 1 AND deleted = 0")
+    cursor.execute("SELECT COUNT(*) FROM vault WHERE deleted = 1")
+    for name in CATEGORIES:
+        cursor.execute("SELECT COUNT(*) FROM vault WHERE category = ? AND deleted = 0", (name,))
+        cursor.fetchone()
+
+
+def operations(size, count):
+    """(label, callable(vault, i)) writes spread over the vault"""
+    def edit(vault, i):
+        vault.update_entry(f"site-{i * 7919 % size:07d}", f"renamed{i}", "secret", category="Work")
+
+    def favorite(vault, i):
+        vault.set_favorite(f"site-{i * 7919 % size:07d}", i % 2 == 0)
+
+    def trash(vault, i):
+        title = f"site-{i * 7919 % size:07d}"
+        vault.trash_entry(title)
+        vault.restore_entry(title)
+
+    return [('edit', edit), ('favorite', favorite), ('trash+restore', trash)]
+
+
+def run(mode, vault, size, ops, scroll_all):
+    from PyQt6.QtWidgets import QApplication
+    from src.gui.password_list import PasswordListModel, PasswordListView
+
+    app = QApplication.instance() or QApplication([])
+    model = PasswordListModel()
+    view = PasswordListView(model)
+    view.resize(300, 600)
+    view.show()
+
+    def fetch_page(after_key, limit):
+        return vault.list_entries(None, None, after_key, limit)
+
+    model.set_pages(fetch_page)
+    if scroll_all:
+        while model.canFetchMore():
+            model.fetchMore()
+    view.setCurrentIndex(model.index(min(10, model.rowCount() - 1)))
+    app.processEvents()
+    view.viewport().grab()
+
+    listing = SearchQuery.for_filter()
+
+    def on_change(change):
+        model.apply_change(change, listing.accepts)
+
+    if mode == 'delta':
+        vault.subscribe(on_change)
+    results = []
+    try:
+        for label, operation in operations(size, ops):
+            timings = []
+            for i in range(ops):
+                start = time.perf_counter()
+                operation(vault, i)
+                if mode == 'reload':
+                    model.set_pages(fetch_page)
+                    recount(vault)
+                app.processEvents()
+                view.viewport().grab()
+                timings.append(time.perf_counter() - start)
+            results.append((label, statistics.median(timings) * 1000))
+    finally:
+        vault.unsubscribe(on_change)
+    return results, model.rowCount()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 50000, 200000])
+    parser.add_argument('--ops', type=int, default=50, help="Writes per operation")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="spm-bench-")
+    try:
+        print(f"{'entries':>8}  {'mode':<7}{'loaded':>8}  {'operation':<15}{'median ms':>10}")
+        for size in args.sizes:
+            vault = build_vault(os.path.join(workdir, f"updates-{size}.db"), size)
+            for mode, scroll_all in (('reload', False), ('delta', False), ('delta', True)):
+                results, loaded = run(mode, vault, size, args.ops, scroll_all)
+                for label, median in results:
+                    print(f"{size:>8}  {mode:<7}{loaded:>8}  {label:<15}{median:10.2f}")
+            vault.conn.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
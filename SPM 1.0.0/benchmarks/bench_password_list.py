@@ -0,0 +1,182 @@
+"""
+Build time and memory of the password list: per-row widgets vs model/delegate.
+
+"widgets" rebuilds the old QListWidget list (a QWidget, two layouts, two
+QLabels and a decoded QPixmap per row attached with setItemWidget); "model"
+is PasswordListModel + PasswordItemDelegate. Each measurement runs in a fresh
+process under the offscreen QPA platform; "first paint" covers filling the
+list, showing it and painting the first screen, "laid out" runs until the
+scroll range is final. Rows carry one of a few dozen PNG icons,
+each row its own bytes object as SQLite returns them.
+
+Usage:
+    python benchmarks/bench_password_list.py [--sizes 1000 10000 100000] [--widget-limit 10000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DISTINCT_ICONS = 40
+
+
+def rss_bytes():
+    """Current resident set size (Linux), else peak RSS"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        from src.core.importers import peak_rss_bytes
+        return peak_rss_bytes() or 0
+
+
+def synthetic_rows(count):
+    from PyQt6.QtCore import QBuffer, QIODevice
+    from PyQt6.QtGui import QColor, QImage
+
+    icons = []
+    for i in range(DISTINCT_ICONS):
+        image = QImage(64, 64, QImage.Format.Format_ARGB32)
+        image.fill(QColor.fromHsv(i * 360 // DISTINCT_ICONS, 200, 220))
+        buffer = QBuffer()
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        image.save(buffer, "PNG")
+        icons.append(bytes(buffer.data()))
+    return [(bytes(bytearray(icons[i % DISTINCT_ICONS])) if i % 5 else None,
+             f"site-{i:07d}.example", f"user{i}") for i in range(count)]
+
+
+def build_widgets(rows):
+    """The list as MainWindow.add_password_to_list used to build it"""
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtGui import QPixmap
+    from PyQt6.QtWidgets import QHBoxLayout, QLabel, QListWidget, QListWidgetItem, QVBoxLayout, QWidget
+    from src.resources.styles import ICON_LABEL_STYLE, PASSWORD_LIST_STYLE
+
+    view = QListWidget()
+    view.setStyleSheet(PASSWORD_LIST_STYLE)
+    view.setSpacing(2)
+    for icon_data, title, username in rows:
+        item = QListWidgetItem()
+        item.password_data = {'icon_data': icon_data, 'title': title, 'username': username}
+        item_widget = QWidget()
+        item_layout = QHBoxLayout()
+        item_layout.setContentsMargins(10, 8, 10, 8)
+        item_widget.setLayout(item_layout)
+        icon_label = QLabel()
+        icon_label.setFixedSize(40, 40)
+        icon_label.setStyleSheet(ICON_LABEL_STYLE)
+        pixmap = QPixmap()
+        if icon_data and pixmap.loadFromData(icon_data):
+            icon_label.setPixmap(pixmap.scaled(32, 32, Qt.AspectRatioMode.KeepAspectRatio))
+        text_container = QWidget()
+        text_layout = QVBoxLayout()
+        text_layout.setSpacing(2)
+        text_layout.setContentsMargins(10, 0, 0, 0)
+        text_container.setLayout(text_layout)
+        title_label = QLabel(title)
+        title_label.setWordWrap(True)
+        title_label.setStyleSheet("color: white; font-size: 16px; font-weight: bold;")
+        text_layout.addWidget(title_label)
+        item_layout.addWidget(icon_label)
+        item_layout.addWidget(text_container, 1)
+        item.setSizeHint(item_widget.sizeHint())
+        view.addItem(item)
+        view.setItemWidget(item, item_widget)
+    return view, None
+
+
+def build_model(rows):
+    from src.gui.password_list import PasswordItemDelegate, PasswordListModel, PasswordListView
+    from src.resources.styles import PASSWORD_LIST_STYLE
+
+    painted = [0]
+    paint = PasswordItemDelegate.paint
+
+    def counting_paint(self, painter, option, index):
+        painted[0] += 1
+        paint(self, painter, option, index)
+
+    PasswordItemDelegate.paint = counting_paint
+    model = PasswordListModel()
+    view = PasswordListView(model)
+    view.setStyleSheet(PASSWORD_LIST_STYLE)
+    model.set_rows(rows)
+    # Keep the model alive with the view
+    view.bench_model = model
+    return view, painted
+
+
+def child(kind, size):
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication([])
+    rows = synthetic_rows(size)
+    before = rss_bytes()
+    start = time.perf_counter()
+    view, painted = (build_widgets if kind == 'widgets' else build_model)(rows)
+    view.resize(300, 600)
+    view.show()
+    app.processEvents()
+    view.viewport().grab()
+    build = time.perf_counter() - start
+
+    # The model's view lays out in batches after the first paint; wait for the scroll range to settle
+    scrollbar, settled = view.verticalScrollBar(), 0
+    while settled < 3:
+        maximum = scrollbar.maximum()
+        app.processEvents()
+        settled = settled + 1 if scrollbar.maximum() == maximum else 0
+    layout = time.perf_counter() - start
+
+    start = time.perf_counter()
+    view.scrollToBottom()
+    app.processEvents()
+    view.viewport().grab()
+    scroll = time.perf_counter() - start
+
+    print(json.dumps({
+        'kind': kind,
+        'rows': size,
+        'build_ms': build * 1000,
+        'layout_ms': layout * 1000,
+        'scroll_ms': scroll * 1000,
+        'rss_mb': (rss_bytes() - before) / 2**20,
+        'painted': painted[0] if painted else None,
+    }))
+    app.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--widget-limit', type=int, default=10000,
+                        help="Skip the widget list above this many rows (it takes minutes and GBs)")
+    parser.add_argument('--child', nargs=2, metavar=('KIND', 'ROWS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child[0], int(args.child[1]))
+        return
+
+    print(f"{'list':<9}{'rows':>8}{'first paint ms':>16}{'laid out ms':>13}{'scroll ms':>11}"
+          f"{'RSS MiB':>10}{'painted':>9}")
+    for size in args.sizes:
+        for kind in ('widgets', 'model'):
+            if kind == 'widgets' and size > args.widget_limit:
+                continue
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', kind, str(size)],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            painted = result['painted'] if result['painted'] is not None else '-'
+            print(f"{kind:<9}{size:>8}{result['build_ms']:16.1f}{result['layout_ms']:13.1f}{result['scroll_ms']:11.1f}"
+                  f"{result['rss_mb']:10.1f}{painted:>9}")
+
+
+if __name__ == "__main__":
+    main()
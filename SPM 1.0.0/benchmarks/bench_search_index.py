@@ -0,0 +1,102 @@
+"""
+Build time, prefilter latency and memory of the in-memory trigram search index.
+
+Indexes synthetic entries shaped like a real vault (site titles, e-mail
+usernames, URLs, a handful of categories) and times TrigramIndex.candidates
+and fuzzy_search's ranking once the index is ready (prefiltered where that
+pays off) against the FuzzyMatcher scanning every entry. Prints a memory
+budget. Runs headless without a database.
+
+Usage:
+    python benchmarks/bench_search_index.py [--entries 100000] [--queries 200]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.database import PasswordVault
+from src.core.fuzzy import FuzzyMatcher
+from src.core.search_index import TrigramIndex
+
+WORDS = ["mail", "bank", "cloud", "shop", "news", "git", "forum", "travel", "stream", "photo",
+         "music", "cred", "portal", "admin", "dev", "home", "office", "games", "health", "learn"]
+CATEGORIES = ["Work", "Personal", "Finance", "Social", "Shopping", None]
+
+
+def synthetic_rows(count, seed=0):
+    """FuzzyMatcher rows ordered by title"""
+    rng = random.Random(seed)
+    rows = []
+    for row_id in range(1, count + 1):
+        name = f"{rng.choice(WORDS)}{rng.choice(WORDS)}{row_id}"
+        rows.append((row_id, name.capitalize(), f"{rng.choice(WORDS)}.{row_id}@example.com",
+                     f"https://www.{name}.com/login", rng.choice(CATEGORIES),
+                     rng.random() < 0.05, rng.random() < 0.02, None))
+    rows.sort(key=lambda row: row[1])
+    return rows
+
+
+def median_ms(timings):
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entries', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.entries)
+    index = TrigramIndex()
+    start = time.perf_counter()
+    index.build(row[:5] for row in rows)
+    print(f"Built index of {len(index)} entries in {time.perf_counter() - start:.2f} s")
+    matcher = FuzzyMatcher(rows)
+
+    rng = random.Random(1)
+    workloads = {
+        'rare (row id)': [f"{rng.randrange(1, args.entries)}@ex" for _ in range(args.queries)],
+        'word + id': [f"{rng.choice(WORDS)}{rng.randrange(1, args.entries)}" for _ in range(args.queries)],
+        'common word': [rng.choice(WORDS) for _ in range(args.queries)],
+        'two words': [rng.choice(WORDS) + rng.choice(WORDS) for _ in range(args.queries)],
+    }
+    print(f"{'query':<15}{'candidates':>11}{'index ms':>10}{'ranked ms':>11}{'full scan ms':>14}")
+    for name, queries in workloads.items():
+        # Warm the matcher's per-character masks, as a typing session does
+        for query in queries[:10]:
+            matcher.match(query)
+        lookups, ranked, full, hits = [], [], [], 0
+        for query in queries:
+            start = time.perf_counter()
+            hits += len(index.candidates(query))
+            lookups.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            PasswordVault._match_fuzzy(matcher, index, query)
+            ranked.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            matcher.match(query)
+            full.append(time.perf_counter() - start)
+        print(f"{name:<15}{hits / len(queries):11.0f}{median_ms(lookups):10.2f}"
+              f"{median_ms(ranked):11.2f}{median_ms(full):14.2f}")
+
+    start = time.perf_counter()
+    for row_id in range(1, 1001):
+        index.upsert(row_id, f"renamed{row_id}", "user@example.com", "https://renamed.example", "Work")
+    print(f"upsert: {(time.perf_counter() - start) * 1000:.1f} us per entry")
+
+    print("Memory budget:")
+    report = index.memory_report()
+    for key, value in report.items():
+        if key.endswith('_bytes'):
+            print(f"  {key:<22}{value / 2**20:10.1f} MiB")
+        else:
+            print(f"  {key:<22}{value:10d}")
+    print(f"  {'bytes per entry':<22}{report['total_bytes'] / max(report['entries'], 1):10.0f}")
+
+
+if __name__ == "__main__":
+    main()
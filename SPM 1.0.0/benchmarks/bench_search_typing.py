@@ -0,0 +1,164 @@
+"""
+UI-thread stalls while typing into the search box: synchronous vs SearchWorker.
+
+Types a query one character at a time (--interval ms apart) into a
+PasswordListView over a synthetic vault and runs a 1 ms heartbeat timer on
+the UI thread; the longest gap between heartbeats is the longest the window
+could not repaint. "sync" searches and rebuilds the list on every keystroke
+as MainWindow used to; "worker" hands keystrokes to SearchWorker and applies
+only the latest results. Runs under the offscreen QPA platform.
+
+Usage:
+    python benchmarks/bench_search_typing.py [--entries 100000] [--query github.com] [--interval 60]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.database import PasswordVault
+
+FRAME_MS = 1000 / 60
+SITES = ["github.com", "gitlab.com", "google.com", "amazon.com", "bank.example", "mail.example"]
+
+
+def build_vault(db_path, entries):
+    vault = PasswordVault(db_path)
+    vault.initialize_database()
+    vault.conn.executemany(
+        'INSERT INTO vault (title, username, encrypted_password, website) VALUES (?, ?, ?, ?)',
+        [(f"{SITES[i % len(SITES)].split('.')[0]}-{i:07d}", f"user{i}", b"sealed", SITES[i % len(SITES)])
+         for i in range(entries)]
+    )
+    vault.conn.commit()
+    return vault
+
+
+def run(mode, vault, query, interval_ms):
+    from PyQt6.QtCore import QElapsedTimer, QTimer
+    from PyQt6.QtWidgets import QApplication
+    from src.gui.password_list import PasswordListModel, PasswordListView
+    from src.gui.search_worker import SearchWorker
+
+    app = QApplication.instance() or QApplication([])
+    model = PasswordListModel()
+    view = PasswordListView(model)
+    view.resize(300, 600)
+    view.show()
+    # The window shows All Items before anyone types
+    model.set_pages(lambda after_key, limit: vault.list_entries(None, None, after_key, limit))
+    app.processEvents()
+    view.viewport().grab()
+
+    stats = {'searches': 0, 'applied': 0, 'last': None}
+    worker = SearchWorker(vault.db_path)
+    if mode == 'worker':
+        # As MainWindow does when it opens
+        worker.prepare()
+        while not worker.is_idle():
+            time.sleep(0.01)
+
+    def apply(serial, rows):
+        stats['applied'] += 1
+        stats['last'] = len(rows)
+        model.set_results(rows)
+
+    worker.results.connect(apply)
+
+    def keystroke(text):
+        if mode == 'sync':
+            rows = vault.fuzzy_search(text)
+            stats['searches'] += 1
+            stats['applied'] += 1
+            stats['last'] = len(rows)
+            model.set_rows(rows)
+        else:
+            worker.request(text)
+
+    # Count the worker's queries
+    fuzzy_search = PasswordVault.fuzzy_search
+
+    def counting_search(self, *args, **kwargs):
+        if self is not vault:
+            stats['searches'] += 1
+        return fuzzy_search(self, *args, **kwargs)
+
+    PasswordVault.fuzzy_search = counting_search
+
+    gaps = []
+    clock = QElapsedTimer()
+    clock.start()
+    last = [clock.nsecsElapsed()]
+
+    def heartbeat():
+        now = clock.nsecsElapsed()
+        gaps.append((now - last[0]) / 1e6)
+        last[0] = now
+
+    timer = QTimer()
+    timer.timeout.connect(heartbeat)
+    timer.start(1)
+
+    try:
+        start = time.perf_counter()
+        for i in range(1, len(query) + 1):
+            keystroke(query[:i])
+            deadline = time.perf_counter() + interval_ms / 1000
+            while time.perf_counter() < deadline:
+                app.processEvents()
+        # Wait for the last results
+        deadline = time.perf_counter() + 10
+        while stats['last'] is None or not worker.is_idle():
+            app.processEvents()
+            if time.perf_counter() > deadline:
+                break
+        deadline = time.perf_counter() + 0.3
+        while time.perf_counter() < deadline:
+            app.processEvents()
+        elapsed = time.perf_counter() - start
+    finally:
+        timer.stop()
+        worker.stop()
+        PasswordVault.fuzzy_search = fuzzy_search
+
+    gaps.sort()
+    return {
+        'max_gap': gaps[-1] if gaps else 0.0,
+        'p99_gap': gaps[int(len(gaps) * 0.99)] if gaps else 0.0,
+        'dropped': sum(1 for gap in gaps if gap > FRAME_MS),
+        'searches': stats['searches'],
+        'applied': stats['applied'],
+        'rows': stats['last'],
+        'elapsed': elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entries', type=int, default=100000)
+    parser.add_argument('--query', default="github.com")
+    parser.add_argument('--interval', type=int, default=60, help="Milliseconds between keystrokes")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="spm-bench-")
+    try:
+        vault = build_vault(os.path.join(workdir, "typing.db"), args.entries)
+        # Build the UI thread's fuzzy index up front, as an earlier search would have
+        vault.fuzzy_matcher()
+        print(f"{'mode':<8}{'searches':>10}{'applied':>9}{'rows':>8}{'max gap ms':>12}{'p99 ms':>8}"
+              f"{'>1 frame':>10}{'total s':>9}")
+        for mode in ('sync', 'worker'):
+            result = run(mode, vault, args.query, args.interval)
+            print(f"{mode:<8}{result['searches']:>10}{result['applied']:>9}{result['rows'] or 0:>8}"
+                  f"{result['max_gap']:12.1f}{result['p99_gap']:8.1f}{result['dropped']:>10}{result['elapsed']:9.2f}")
+        vault.conn.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
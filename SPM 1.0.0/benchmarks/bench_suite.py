@@ -0,0 +1,204 @@
+"""
+Crypto and storage microbenchmarks for the vault, with JSON output.
+
+Times Encryption.encrypt/decrypt, PasswordVault.setup_encryption, the bulk
+load (add_entries), the add/get/update/delete entry paths, the password
+list queries and search against throwaway vaults of each requested size.
+Runs headless (no Qt, no network).
+Pass --baseline with an earlier --output file to fail on regressions.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 100,10000,100000] [--output run.json]
+                                     [--baseline old.json] [--max-regression 0.25]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.database import PasswordVault
+from src.core.encryption import Encryption
+
+PASSWORD = "Correct-Horse-Battery-9"
+USERNAME = "bench"
+CATEGORIES = ["Work", "Personal", "Finance", "Social", "Shopping"]
+
+
+def summarize(name, size, timings):
+    """Per-call latency statistics in microseconds"""
+    timings = sorted(timings)
+    return {
+        'name': name,
+        'size': size,
+        'rounds': len(timings),
+        'median_us': statistics.median(timings) * 1e6,
+        'mean_us': statistics.fmean(timings) * 1e6,
+        'p95_us': timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1e6,
+        'min_us': timings[0] * 1e6,
+    }
+
+
+def measure(fn, args_list):
+    """Time fn(*args) once per entry of args_list"""
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def populate(vault, size, seed=0):
+    """Fill the vault with size entries through add_entries; returns (titles, seconds)"""
+    rng = random.Random(seed)
+    titles = [f"site-{i:07d}" for i in range(size)]
+    rows = ({
+        'title': title,
+        'username': f"user{i}@example.com",
+        'password': f"pw-{rng.random():.12f}",
+        'website': f"https://{title}.example.com",
+        'category': rng.choice(CATEGORIES),
+        'favorite': int(rng.random() < 0.1),
+        'deleted': int(rng.random() < 0.05),
+    } for i, title in enumerate(titles))
+    start = time.perf_counter()
+    vault.add_entries('vault', rows)
+    elapsed = time.perf_counter() - start
+    vault.add_entries('categories', ({'category_names': name, 'color': "#4a90e2"} for name in CATEGORIES))
+    return titles, elapsed
+
+
+def bench_crypto(rounds):
+    """encrypt/decrypt of a typical password under a vault data key"""
+    cipher = Encryption.from_data_key(os.urandom(Encryption.KEY_LENGTH))
+    plaintext = "Tr0ub4dor&3-correct-horse"
+    blob = cipher.encrypt(plaintext)
+    return [
+        summarize('encrypt', None, measure(cipher.encrypt, [(plaintext,)] * rounds)),
+        summarize('decrypt', None, measure(cipher.decrypt, [(blob,)] * rounds)),
+    ]
+
+
+def bench_vault(size, rounds, unlock_rounds, workdir):
+    """Storage and list benchmarks against a vault holding size entries"""
+    db_path = os.path.join(workdir, f"bench-{size}.db")
+    vault = PasswordVault(db_path)
+    vault.initialize_database()
+    vault.create_master_account(USERNAME, PASSWORD)
+    titles, load_time = populate(vault, size)
+    rng = random.Random(size)
+    # One bulk load of the whole vault; the row is the total time, not per call
+    results = [summarize('add_entries', size, [load_time])]
+
+    def unlock():
+        PasswordVault(db_path).setup_encryption(PASSWORD)
+    results.append(summarize('setup_encryption', size, measure(unlock, [()] * unlock_rounds)))
+
+    new_titles = [f"bench-new-{i:05d}" for i in range(rounds)]
+    results.append(summarize('add_entry', size, measure(
+        lambda title: vault.add_entry('vault', title=title, username=USERNAME, password="s3cret",
+                                      website="https://example.com", category=CATEGORIES[0]),
+        [(title,) for title in new_titles])))
+    results.append(summarize('get_entry', size, measure(
+        lambda title: vault.get_entry('vault', title=title),
+        [(rng.choice(titles),) for _ in range(rounds)])))
+    results.append(summarize('update_entry', size, measure(
+        lambda title: vault.update_entry(title, USERNAME, "n3w-s3cret", "https://example.com",
+                                         "notes", CATEGORIES[1]),
+        [(title,) for title in new_titles])))
+    results.append(summarize('delete_entry', size, measure(
+        vault.delete_entry, [(title,) for title in new_titles])))
+
+    # The queries behind MainWindow.load_vault_entries and the sidebar counts
+    list_rounds = max(3, min(rounds, 20))
+    results.append(summarize('list_all', size, measure(vault.list_entries, [()] * list_rounds)))
+    results.append(summarize('list_favorites', size, measure(
+        vault.list_entries, [("favorites",)] * list_rounds)))
+    results.append(summarize('list_trash', size, measure(vault.list_entries, [("trash",)] * list_rounds)))
+    results.append(summarize('list_category', size, measure(
+        vault.list_entries, [(None, rng.choice(CATEGORIES)) for _ in range(list_rounds)])))
+    results.append(summarize('list_metadata', size, measure(vault.read_list_metadata, [()] * list_rounds)))
+    # Typing in the search bar: substrings of titles and usernames
+    results.append(summarize('search', size, measure(
+        vault.search, [(rng.choice(titles)[3:10],) for _ in range(rounds)])))
+    results.append(summarize('search_user', size, measure(
+        vault.search, [(f"user{rng.randrange(size)}@",) for _ in range(rounds)])))
+
+    vault.conn.close()
+    return results
+
+
+def compare(results, baseline, max_regression):
+    """Return (name, size, old, new) for medians that regressed past the threshold"""
+    previous = {(row['name'], row['size']): row['median_us'] for row in baseline['results']}
+    regressions = []
+    for row in results:
+        old = previous.get((row['name'], row['size']))
+        if old and row['median_us'] > old * (1 + max_regression):
+            regressions.append((row['name'], row['size'], old, row['median_us']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default="100,10000,100000",
+                        help="Comma-separated vault sizes (default: 100,10000,100000)")
+    parser.add_argument('--rounds', type=int, default=200, help="Calls per per-row benchmark")
+    parser.add_argument('--crypto-rounds', type=int, default=5000, help="Calls per crypto benchmark")
+    parser.add_argument('--unlock-rounds', type=int, default=3, help="Unlocks per vault size")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--baseline', help="Earlier --output file to compare medians against")
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help="Allowed median slowdown against the baseline (default: 0.25)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    workdir = tempfile.mkdtemp(prefix="spm-bench-")
+    try:
+        results = bench_crypto(args.crypto_rounds)
+        for size in sizes:
+            print(f"Benchmarking vault with {size} entries...", file=sys.stderr)
+            results += bench_vault(size, args.rounds, args.unlock_rounds, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+
+    print(f"{'benchmark':<18}{'size':>8}{'median us':>12}{'p95 us':>12}")
+    for row in results:
+        size = '-' if row['size'] is None else row['size']
+        print(f"{row['name']:<18}{size:>8}{row['median_us']:12.1f}{row['p95_us']:12.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for name, size, old, new in regressions:
+            print(f"REGRESSION {name} (size {size}): {old:.1f} us -> {new:.1f} us", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Compare the cost of one unlock before and after the unified unlock KDF.
+
+Legacy unlock: argon2 PasswordHasher.verify in LoginDialog, PBKDF2 (100k) in
+PasswordVault.setup_encryption and PBKDF2 (310k) for each Encryption instance.
+Unified unlock: one argon2id derivation split into subkeys with HKDF.
+
+Usage:
+    python benchmarks/bench_unlock.py [--rounds N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from argon2 import PasswordHasher
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from src.core import unlock
+from src.core.encryption import Encryption
+
+PASSWORD = "Correct-Horse-Battery-9"
+
+
+def legacy_unlock(stored_hash, salt):
+    PasswordHasher().verify(stored_hash, PASSWORD + salt)
+    PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=b'static_salt',
+               iterations=100000).derive(PASSWORD.encode())
+    Encryption(PASSWORD)
+
+
+def unified_unlock(salt):
+    keys = unlock.derive_unlock_keys(PASSWORD, salt, unlock.DEFAULT_PARAMS)
+    keys.wipe()
+
+
+def measure(fn, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    legacy_salt = "legacy-salt"
+    stored_hash = PasswordHasher().hash(PASSWORD + legacy_salt)
+    salt = unlock.new_salt()
+
+    legacy = measure(lambda: legacy_unlock(stored_hash, legacy_salt), args.rounds)
+    unified = measure(lambda: unified_unlock(salt), args.rounds)
+
+    print(f"legacy unlock  (argon2 + PBKDF2 100k + PBKDF2 310k): {legacy * 1000:8.1f} ms")
+    print(f"unified unlock (argon2id + HKDF split):              {unified * 1000:8.1f} ms")
+    print(f"saved per unlock: {(legacy - unified) * 1000:.1f} ms ({(1 - unified / legacy) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Print ops/sec for each KDF choice here, the argon2 memory limit and the calibrated parameters.
+
+Usage:
+    python benchmarks/kdf_report.py [--target-ms 500]
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core import calibration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--target-ms', type=int, default=calibration.DEFAULT_TARGET_MS)
+    args = parser.parse_args()
+
+    print(f"Target unlock latency: {args.target_ms} ms, {os.cpu_count()} CPUs")
+    ram = calibration.physical_memory()
+    ram_text = f"{ram / 2**30:.1f} GiB RAM" if ram else "RAM unknown"
+    print(f"Argon2 memory limit: {calibration.memory_limit() // 1024} MiB "
+          f"(at most {calibration.MAX_MEMORY_COST // 1024} MiB and 1/{calibration.MAX_MEMORY_SHARE} of {ram_text})")
+    print(f"{'kdf':<28}{'params':<58}{'ms':>9}{'ops/sec':>10}")
+    for name, params, seconds, ops in calibration.kdf_report(args.target_ms):
+        formatted = ', '.join(f"{key}={value}" for key, value in sorted(params.items()))
+        print(f"{name:<28}{formatted:<58}{seconds * 1000:>9.1f}{ops:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
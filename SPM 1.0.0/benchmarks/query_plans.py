@@ -0,0 +1,163 @@
+"""
+Check that every compiled search query is answered from an index.
+
+Compiles representative search-bar queries under each list filter, with and
+without the FTS5 table, and runs EXPLAIN QUERY PLAN on each. Every query is
+expected to take a specific path: text terms through the FTS5 table, fav:
+and cat: through their (deleted, ..., title) index, the trash through the
+(deleted, title) index. The check fails if a plan takes another path,
+scans the vault table, or sorts a keyset page of the list in a temporary
+B-tree. LIKE queries that nothing but deleted=0 narrows walk every live
+row through the (deleted, title) index; they are listed rather than passed
+off as index-backed. Also reports how many SQL plans the shapes share.
+Runs headless against a throwaway vault.
+
+Usage:
+    python benchmarks/query_plans.py [--entries N] [--verbose]
+"""
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.database import PasswordVault
+from src.core.encryption import Encryption
+from src.core.migrations import TRIGRAM_LENGTH
+from src.core.search_query import SearchQuery
+
+QUERIES = [
+    "",
+    "git",
+    "gi",
+    "git hub",
+    "title:github",
+    "user:ops",
+    "user:op",
+    "site:github.com",
+    "site:\"my bank\"",
+    "cat:Work",
+    "fav:yes",
+    "fav:no",
+    "deleted:yes",
+    "deleted:no",
+    "site:github user:ops cat:Work fav:yes deleted:no",
+    "title:git fav:yes x",
+    "cat:Work deleted:yes",
+]
+FILTERS = [(None, None), ("favorites", None), ("trash", None), (None, "Work")]
+
+# A plan step that walks the vault table, with or without an index, instead of seeking into it
+FULL_SCAN = re.compile(r'^SCAN (v|vault)\b')
+# The plan step each access path must show
+FTS_STEP = re.compile(r'^SCAN vault_fts VIRTUAL TABLE INDEX')
+NARROWED_STEP = re.compile(r'^SEARCH v USING (COVERING )?INDEX idx_vault_deleted_(favorite|category)_title '
+                           r'\(deleted=\? AND (favorite|category)=\?')
+DELETED_STEP = re.compile(r'^SEARCH v USING (COVERING )?INDEX idx_vault_deleted_title \(deleted=\?')
+
+
+def expected_path(query: SearchQuery, fts: bool) -> tuple:
+    """
+    (path, plan step pattern) a compiled query should take.
+
+    'fts' matches text through vault_fts; 'narrowed' seeks a fav:/cat: index;
+    'trash' and 'listing' read the (deleted, title) index in order; 'live walk'
+    runs LIKE over every live row, as no index can serve '%term%'.
+    """
+    columns, match, like = query.shape(fts)
+    if match:
+        return 'fts', FTS_STEP
+    if 'favorite' in columns or 'category' in columns:
+        return 'narrowed', NARROWED_STEP
+    if ('deleted', 1) in query.conditions:
+        return 'trash', DELETED_STEP
+    if like:
+        return 'live walk', DELETED_STEP
+    return 'listing', DELETED_STEP
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entries', type=int, default=5000)
+    parser.add_argument('--verbose', action='store_true', help="Print every plan")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="spm-bench-")
+    try:
+        vault = PasswordVault(os.path.join(workdir, "bench.db"))
+        vault.initialize_database()
+        vault.use_data_key(os.urandom(Encryption.KEY_LENGTH))
+        sealed = vault.cipher.encrypt_many(f"password-{i}" for i in range(args.entries))
+        vault.conn.executemany(
+            'INSERT INTO vault (title, username, encrypted_password, website, category, favorite, deleted) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [(f"site-{i:07d}", f"user{i}", result.value, f"https://site{i}.example",
+              ("Work", "Personal", None)[i % 3], i % 7 == 0, i % 11 == 0)
+             for i, result in enumerate(sealed)]
+        )
+        vault.conn.commit()
+
+        fts_modes = [True, False] if vault.has_search_index() else [False]
+        failures, checked, shapes, paths, walks = [], 0, set(), {}, []
+        for fts in fts_modes:
+            for text in QUERIES:
+                for filter_type, category in FILTERS:
+                    query = SearchQuery.parse(text).restrict(filter_type, category)
+                    shapes.add((query.shape(fts), fts))
+                    path, step_pattern = expected_path(query, fts)
+                    variants = [("", query.sql(fts), query.params(fts))]
+                    if not text:
+                        # The list's keyset pages (list_entries with after_key and limit)
+                        variants.append((" page", query.sql(fts, limit=True, keyed=True, after=True),
+                                         query.params(fts) + ("site-0002500", 2501, 200)))
+                    for variant, sql, params in variants:
+                        plan = [row[3] for row in vault.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+                        vault.conn.execute(sql, params).fetchall()
+                        checked += 1
+                        paths[path] = paths.get(path, 0) + 1
+                        label = f"{'fts' if fts else 'like'} {filter_type or category or 'all'}{variant}: {text!r}"
+                        if path == 'live walk':
+                            walks.append(label)
+                        # Pages must also come straight off an index in (title, id) order
+                        wrong = [step for step in plan if FULL_SCAN.match(step) or (variant and 'TEMP B-TREE' in step)]
+                        if not any(step_pattern.match(step) for step in plan):
+                            wrong.append(f"expected the {path} path")
+                        if wrong:
+                            failures.append((label, plan))
+                        if args.verbose or wrong:
+                            print(f"{label} [{path}]")
+                            for step in plan:
+                                print(f"    {step}")
+                            for problem in wrong:
+                                print(f"    !! {problem}")
+
+        # The vault compiles each shape once however many values it is run with
+        start = time.perf_counter()
+        for _ in range(3):
+            for text in QUERIES:
+                vault.search(text)
+        elapsed = (time.perf_counter() - start) / (3 * len(QUERIES))
+        cached = sum(1 for key in vault._query_cache if key[0] == 'search')
+
+        print(f"Checked {checked} queries ({len(shapes)} shapes); "
+              f"{cached} cached plans after running {len(QUERIES)} queries 3 times, "
+              f"{elapsed * 1000:.2f} ms per search")
+        print("Paths: " + ', '.join(f"{path} {count}" for path, count in sorted(paths.items())))
+        if walks:
+            print(f"{len(walks)} LIKE queries walk every live row (terms under {TRIGRAM_LENGTH} characters "
+                  f"or no FTS5, and no fav:/cat: to narrow them):")
+            for label in walks:
+                print(f"    {label}")
+        if failures:
+            print(f"{len(failures)} plans don't take their expected path")
+            sys.exit(1)
+        print("Every plan takes its expected path")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+from src.core import unlock
+from src.core.encryption import Encryption, pbkdf2_derive
+import os
+import time
+
+# Unlock latency the calibration aims for
+DEFAULT_TARGET_MS = 500
+
+# Floors keep weak hosts at a sane minimum (OWASP argon2id: 19 MiB, t=2)
+MIN_MEMORY_COST = 19456
+MIN_TIME_COST = 2
+# Ceilings: the chosen cost is stored with the vault and every machine that opens it
+# has to pay it, so memory stays at 256 MiB and at most 1/8 of this host's RAM
+MAX_MEMORY_COST = 262144
+MAX_MEMORY_SHARE = 8
+MAX_PARALLELISM = 4
+MIN_PBKDF2_ITERATIONS = 100000
+
+CALIBRATION_PASSWORD = "calibration-probe"
+
+
+def physical_memory() -> int:
+    """Bytes of RAM on this host, None where the platform won't say"""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def memory_limit() -> int:
+    """Largest argon2 memory_cost (KiB) calibration may pick on this host"""
+    limit = MAX_MEMORY_COST
+    ram = physical_memory()
+    if ram:
+        limit = min(limit, ram // 1024 // MAX_MEMORY_SHARE)
+    return max(MIN_MEMORY_COST, limit // 1024 * 1024)
+
+
+def measure_argon2(params: dict) -> float:
+    """Seconds taken by one unlock derivation with the given argon2 params"""
+    start = time.perf_counter()
+    unlock.derive_unlock_keys(CALIBRATION_PASSWORD, unlock.new_salt(), params).wipe()
+    return time.perf_counter() - start
+
+
+def measure_pbkdf2(iterations: int) -> float:
+    """Seconds taken by one PBKDF2-SHA256 derivation"""
+    start = time.perf_counter()
+    pbkdf2_derive(CALIBRATION_PASSWORD, os.urandom(Encryption.SALT_LENGTH), iterations, Encryption.KEY_LENGTH)
+    return time.perf_counter() - start
+
+
+def calibrate_argon2(target_ms: int = DEFAULT_TARGET_MS, rounds: int = 4) -> dict:
+    """
+    Pick argon2id parameters that take about target_ms on this host.
+
+    Parallelism follows the core count (up to MAX_PARALLELISM lanes), memory is
+    scaled first since it is what hurts attackers most, and time cost only
+    grows once memory reaches memory_limit(). Never goes below the floors.
+    """
+    target = target_ms / 1000.0
+    max_memory = memory_limit()
+    params = {
+        'time_cost': MIN_TIME_COST,
+        'memory_cost': min(unlock.DEFAULT_PARAMS['memory_cost'], max_memory),
+        'parallelism': max(1, min(os.cpu_count() or 1, MAX_PARALLELISM)),
+    }
+    for _ in range(rounds):
+        elapsed = measure_argon2(params)
+        # Argon2 cost is roughly linear in memory_cost * time_cost
+        work = params['memory_cost'] * params['time_cost'] * target / max(elapsed, 1e-6)
+        memory_cost = int(work / MIN_TIME_COST)
+        if memory_cost > max_memory:
+            params['memory_cost'] = max_memory
+            params['time_cost'] = max(MIN_TIME_COST, int(work / max_memory))
+        else:
+            params['memory_cost'] = max(MIN_MEMORY_COST, memory_cost // 1024 * 1024)
+            params['time_cost'] = MIN_TIME_COST
+        # Argon2 needs at least 8 KiB per lane
+        params['memory_cost'] = max(params['memory_cost'], 8 * params['parallelism'])
+        if abs(elapsed - target) / target < 0.1:
+            break
+    return params
+
+
+def calibrate_pbkdf2(target_ms: int = DEFAULT_TARGET_MS) -> int:
+    """PBKDF2-SHA256 iteration count that takes about target_ms on this host"""
+    probe = MIN_PBKDF2_ITERATIONS
+    elapsed = measure_pbkdf2(probe)
+    iterations = int(probe * (target_ms / 1000.0) / max(elapsed, 1e-6))
+    return max(MIN_PBKDF2_ITERATIONS, iterations // 1000 * 1000)
+
+
+def kdf_report(target_ms: int = DEFAULT_TARGET_MS) -> list:
+    """
+    Measure every KDF choice on this host.
+
+    Returns:
+        list: (name, params, seconds, ops_per_sec) tuples, calibrated choices last
+    """
+    candidates = [
+        ('argon2id', {'time_cost': t, 'memory_cost': m, 'parallelism': p})
+        for t, m, p in [(2, 19456, 1), (3, 65536, 4), (2, 131072, 4), (2, 262144, 4)]
+        if m <= memory_limit()
+    ]
+    candidates += [('pbkdf2-sha256', {'iterations': n}) for n in (100000, 310000, 600000)]
+    candidates.append(('argon2id (calibrated)', calibrate_argon2(target_ms)))
+    candidates.append(('pbkdf2-sha256 (calibrated)', {'iterations': calibrate_pbkdf2(target_ms)}))
+
+    report = []
+    for name, params in candidates:
+        if 'iterations' in params:
+            elapsed = measure_pbkdf2(params['iterations'])
+        else:
+            elapsed = measure_argon2(params)
+        report.append((name, params, elapsed, 1.0 / elapsed if elapsed else 0.0))
+    return report
@@ -0,0 +1,44 @@
+INSERTED = 'inserted'
+UPDATED = 'updated'
+# Into or out of the trash
+MOVED = 'moved'
+REMOVED = 'removed'
+# Opened or copied: only its last use changed, which no list shows but search ranking weighs
+USED = 'used'
+# Too many rows changed to describe one by one; reload
+RESET = 'reset'
+
+# Vault columns a change carries: what the password list and sidebar show and searches match, never secrets
+ENTRY_COLUMNS = ('id', 'icon', 'title', 'username', 'website', 'category', 'favorite', 'deleted')
+
+
+class VaultChange:
+    """
+    One committed change, as PasswordVault publishes it to its listeners.
+
+    `before` and `after` are the row's list-visible columns as dicts
+    (ENTRY_COLUMNS for 'vault', id and name for 'categories'), None where the
+    row did not or does not exist, so a listener can tell whether the row
+    enters, leaves or stays in whatever it shows without another query.
+    """
+
+    __slots__ = ('kind', 'table', 'before', 'after')
+
+    def __init__(self, kind: str, table: str = 'vault', before: dict = None, after: dict = None):
+        self.kind = kind
+        self.table = table
+        self.before = before
+        self.after = after
+
+    @property
+    def id(self):
+        state = self.after or self.before
+        return state['id'] if state else None
+
+    @staticmethod
+    def list_row(state: dict) -> tuple:
+        """An entry state as a password list row: (icon, title, username, id)"""
+        return state['icon'], state['title'], state['username'], state['id']
+
+    def __repr__(self):
+        return f"VaultChange({self.kind!r}, {self.table!r}, id={self.id!r})"
@@ -0,0 +1,102 @@
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+import base64
+import os
+import time
+
+# Settings table key naming the suite new rows are sealed with
+CIPHER_SUITE_SETTING = 'cipher_suite'
+
+# AES-GCM must beat ChaCha20 by this factor before it is picked, so timer noise
+# on hosts without AES instructions never flips the choice
+SELECTION_MARGIN = 1.1
+
+
+class CipherSuite:
+    """A cipher registered under the id stored in the ciphertext header"""
+
+    def __init__(self, suite_id: int, name: str, factory, aead: bool = True):
+        self.suite_id = suite_id
+        self.name = name
+        self.aead = aead
+        self._factory = factory
+
+    def new(self, key: bytes):
+        """Cipher object for a 32-byte key"""
+        return self._factory(bytes(key))
+
+    def __repr__(self):
+        return f"CipherSuite({self.suite_id}, {self.name!r})"
+
+
+CHACHA20_POLY1305 = CipherSuite(1, 'chacha20-poly1305', ChaCha20Poly1305)
+AES_256_GCM = CipherSuite(2, 'aes-256-gcm', AESGCM)
+# Read-only: rows of pre-envelope vaults. Fernet tokens carry their own format,
+# so this id is never written to an envelope header.
+FERNET = CipherSuite(0, 'fernet', lambda key: Fernet(base64.urlsafe_b64encode(key)), aead=False)
+
+DEFAULT_SUITE = CHACHA20_POLY1305
+
+_SUITES = {suite.suite_id: suite for suite in (CHACHA20_POLY1305, AES_256_GCM, FERNET)}
+
+
+def get_suite(suite_id: int) -> CipherSuite:
+    """AEAD suite for a header cipher id; raises ValueError for unknown or read-only ids"""
+    suite = _SUITES.get(suite_id)
+    if suite is None or not suite.aead:
+        raise ValueError(f"Unsupported cipher id {suite_id}")
+    return suite
+
+
+def get_suite_by_name(name: str) -> CipherSuite:
+    """Suite stored in the settings table; None falls back to the default"""
+    if name is None:
+        return DEFAULT_SUITE
+    for suite in _SUITES.values():
+        if suite.name == name:
+            return suite
+    raise ValueError(f"Unknown cipher suite {name}")
+
+
+def aead_suites() -> list:
+    """Suites that can seal new data"""
+    return [suite for suite in _SUITES.values() if suite.aead]
+
+
+def measure_suite(suite: CipherSuite, payload_size: int = 1024, duration: float = 0.05) -> float:
+    """Seal + open throughput of a suite on this host, in MB/s"""
+    cipher = suite.new(os.urandom(32))
+    nonce = os.urandom(12)
+    payload = os.urandom(payload_size)
+    # Warm up so one-time setup is not timed
+    cipher.decrypt(nonce, cipher.encrypt(nonce, payload, None), None)
+
+    processed = 0
+    start = time.perf_counter()
+    while True:
+        cipher.decrypt(nonce, cipher.encrypt(nonce, payload, None), None)
+        processed += payload_size
+        elapsed = time.perf_counter() - start
+        if elapsed >= duration:
+            return processed / elapsed / 1e6
+
+
+def benchmark_suites(payload_size: int = 1024, duration: float = 0.05) -> list:
+    """
+    Measure every AEAD suite on this host.
+
+    Returns:
+        list: (suite, megabytes_per_sec) tuples, fastest first
+    """
+    report = [(suite, measure_suite(suite, payload_size, duration)) for suite in aead_suites()]
+    return sorted(report, key=lambda item: item[1], reverse=True)
+
+
+def select_fastest_suite(payload_size: int = 1024, duration: float = 0.05) -> CipherSuite:
+    """Pick the suite new vaults seal with; the default wins unless clearly slower"""
+    report = benchmark_suites(payload_size, duration)
+    throughput = dict((suite.suite_id, rate) for suite, rate in report)
+    fastest, rate = report[0]
+    if fastest is not DEFAULT_SUITE and rate < throughput[DEFAULT_SUITE.suite_id] * SELECTION_MARGIN:
+        return DEFAULT_SUITE
+    return fastest
@@ -1,21 +1,54 @@
-import sqlite3
-from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
-import hashlib
 import os
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError
+from src.core.encryption import Encryption
+from src.core import calibration, changes, cipher_suites, envelope, migrations, unlock
+from src.core.connection_profile import ConnectionProfile, DEFAULT_PROFILE
+from src.core.fuzzy import FuzzyMatcher
+from src.core.search_index import TrigramIndex
+from src.core.search_query import SearchQuery
 
 class PasswordVault:
-    def __init__(self, db_path):
+    # fuzzy_search ranks only the search index's candidates when it finds at least PREFILTER_HITS
+    # (fewer, and typos and scattered letters count) and at most 1/PREFILTER_SHARE of the vault
+    # (more, and scanning every entry is as fast)
+    PREFILTER_HITS = FuzzyMatcher.TYPO_FALLBACK_HITS
+    PREFILTER_SHARE = 8
+    # add_entries publishes one INSERTED change per row up to this many rows and a single RESET
+    # beyond (a bulk import); kept under the search worker's queue limit
+    INSERT_EVENT_ROWS = 100
+
+    def __init__(self, db_path, profile: ConnectionProfile = None):
         self.db_path = db_path
+        # PRAGMAs for every connection this vault opens (WAL + synchronous=NORMAL by default)
+        self.profile = profile if profile is not None else DEFAULT_PROFILE
         self.conn = None
+        # Per-connection column metadata and SQL text built for get_entry/add_entry
+        self._table_columns = {}
+        self._query_cache = {}
+        # Fuzzy matcher snapshot and the change stamp it was built at
+        self._fuzzy = None
+        self._fuzzy_stamp = None
+        # In-memory trigram index narrowing fuzzy_search down, built by start_search_index()
+        self.search_index = None
+        # Callables receiving a changes.VaultChange after each committed entry or category change
+        self._listeners = []
+        # Background ciphertext migration and the event asking it to stop, joined by close()
+        self._migration = None
+        self._migration_stop = threading.Event()
         self.connect() 
         
     def connect(self):
         """Establish database connection"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = self.profile.connect(self.db_path)
+            self.reset_query_cache()
             print(f"Debug - Database connected: {bool(self.conn)}")
         except Exception as e:
             print(f"Debug - Database connection error: {str(e)}")
@@ -29,12 +62,10 @@ class PasswordVault:
         
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        self.close()
 
     def initialize_database(self):
-        """Create database tables if they don't exist"""
+        """Create or upgrade the database schema"""
         if self.conn:
             self.conn.close()
         
@@ -48,58 +79,340 @@ class PasswordVault:
         if self.conn is None:
             raise Exception("Database connection is not established.")
 
+        # Runs only the migrations this file is missing; a current schema costs a PRAGMA and a sqlite_master read
+        if migrations.migrate(self.conn):
+            self.reset_query_cache()
+
+    def reset_query_cache(self):
+        """Forget cached column lists and SQL (after reconnecting or changing the schema)"""
+        self._table_columns.clear()
+        self._query_cache.clear()
+        self._fuzzy = None
+
+    def _columns(self, table: str) -> tuple:
+        """Column names of a table, read with PRAGMA table_info once per connection"""
+        columns = self._table_columns.get(table)
+        if columns is None:
+            cursor = self.conn.cursor()
+            cursor.execute(f"PRAGMA table_info({table})")
+            columns = tuple(col[1] for col in cursor.fetchall())
+            self._table_columns[table] = columns
+        return columns
+
+    def _insert_sql(self, table: str, columns: tuple) -> str:
+        """INSERT statement for a column set; identical text reuses sqlite3's prepared statement"""
+        key = ('insert', table, columns)
+        sql = self._query_cache.get(key)
+        if sql is None:
+            placeholders = ', '.join('?' for _ in columns)
+            sql = f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({placeholders})'
+            self._query_cache[key] = sql
+        return sql
+
+    def _select_sql(self, table: str, condition_keys: tuple) -> tuple:
+        """(SELECT statement, column names) for a lookup on the given condition columns"""
+        key = ('select', table, condition_keys)
+        cached = self._query_cache.get(key)
+        if cached is None:
+            columns = self._columns(table)
+            sql = f'SELECT {", ".join(columns)} FROM {table}'
+            if condition_keys:
+                sql += ' WHERE ' + ' AND '.join(f'{column} = ?' for column in condition_keys)
+            cached = (sql, columns)
+            self._query_cache[key] = cached
+        return cached
+
+    def subscribe(self, listener):
+        """Call listener(change) with a changes.VaultChange after every change made through this vault"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _publish(self, kind: str, table: str = 'vault', before: dict = None, after: dict = None):
+        for listener in list(self._listeners):
+            try:
+                listener(changes.VaultChange(kind, table, before, after))
+            except Exception as e:
+                print(f"Debug - Change listener failed: {str(e)}")
+
+    def _entry_state(self, where: str, params: tuple = ()) -> dict:
+        """List-visible columns of one vault row (changes.ENTRY_COLUMNS), or None; skipped without listeners"""
+        if not self._listeners:
+            return None
         cursor = self.conn.cursor()
-        
-        cursor.executescript('''
-            CREATE TABLE IF NOT EXISTS master_account (
-                username TEXT PRIMARY KEY,
-                master_password TEXT NOT NULL,
-                salt TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS vault (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                username TEXT,
-                encrypted_password BLOB NOT NULL,
-                salt BLOB,
-                website TEXT,
-                icon BLOB,
-                notes TEXT,
-                category TEXT,
-                favorite BOOLEAN DEFAULT 0,
-                deleted BOOLEAN DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-                             
-            CREATE TABLE IF NOT EXISTS categories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                category_names TEXT NOT NULL UNIQUE,
-                color TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-                             
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL
-            );
-
-           
-        ''')
-        self.conn.commit()
+        cursor.execute(f"SELECT {', '.join(changes.ENTRY_COLUMNS)} FROM vault WHERE {where}", params)
+        row = cursor.fetchone()
+        return dict(zip(changes.ENTRY_COLUMNS, row)) if row else None
+
+    def get_setting(self, key: str, default=None):
+        """Read a value from the settings table"""
+        if not self.conn:
+            self.connect()
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT value FROM settings WHERE key = ?', (key,))
+        row = cursor.fetchone()
+        return row[0] if row else default
+
+    def set_setting(self, key: str, value: str, commit: bool = True):
+        """Insert or replace a value in the settings table"""
+        if not self.conn:
+            self.connect()
+        cursor = self.conn.cursor()
+        cursor.execute('INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)', (key, value))
+        if commit:
+            self.conn.commit()
 
     def setup_encryption(self, master_password: str):
-        """Initialize encryption with master password"""
+        """
+        Unlock the vault data key with the master password.
+
+        Rows are sealed with a random per-vault data key that is stored in the
+        settings table wrapped by a key derived from the master password, so an
+        unlock costs exactly one KDF. Accounts on the unified unlock scheme use
+        the argon2id/HKDF wrapping key; older vaults use the PBKDF2 envelope, and
+        the first unlock of a pre-envelope vault creates the data key and
+        re-encrypts the legacy Fernet rows under it.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT master_password, salt FROM master_account')
+        account = cursor.fetchone()
+        if account and unlock.is_unlock_verifier(account[0]):
+            keys = self._derive_unlock_keys(master_password, account[1])
+            if not keys.matches(account[0]):
+                raise ValueError("Invalid master password")
+            self._unwrap_with(keys)
+            return
+
+        wrapped = self.get_setting(envelope.WRAPPED_DATA_KEY_SETTING)
+        if wrapped is None:
+            self._create_data_key(master_password)
+            return
+
+        salt = base64.b64decode(self.get_setting(envelope.WRAPPING_SALT_SETTING))
+        wrapping_key = envelope.derive_wrapping_key(master_password, salt)
+        data_key = envelope.unwrap_data_key(wrapping_key, wrapped)
+        self._set_cipher(self._vault_cipher(data_key, salt=salt))
+
+    def _derive_unlock_keys(self, master_password: str, salt: str) -> unlock.UnlockKeys:
+        """Run the single unlock KDF with this vault's stored parameters"""
+        params = unlock.load_params(self.get_setting(unlock.UNLOCK_PARAMS_SETTING))
+        return unlock.derive_unlock_keys(master_password, unlock.decode_salt(salt), params)
+
+    def _unwrap_with(self, keys: unlock.UnlockKeys):
+        """Unwrap the data key with the unlock wrapping subkey and install the vault cipher"""
+        wrapped = self.get_setting(envelope.WRAPPED_DATA_KEY_SETTING)
+        data_key = envelope.unwrap_data_key(keys.wrapping_key, wrapped)
+        keys.wipe()
+        self._set_cipher(self._vault_cipher(data_key))
+
+    def _store_unlock_material(self, username: str, master_password: str, data_key: bytes,
+                               params: dict = None, derived: tuple = None):
+        """
+        Derive fresh unlock keys for a password and store its verifier and wrapped data key.
+
+        `derived` may carry a (salt, keys) pair that was already computed with
+        `params`, e.g. in parallel with another derivation.
+        """
+        if params is None:
+            params = unlock.load_params(self.get_setting(unlock.UNLOCK_PARAMS_SETTING))
+        if derived is None:
+            salt = unlock.new_salt()
+            keys = unlock.derive_unlock_keys(master_password, salt, params)
+        else:
+            salt, keys = derived
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM master_account WHERE username = ?', (username,))
+            if cursor.fetchone()[0]:
+                cursor.execute(
+                    'UPDATE master_account SET master_password = ?, salt = ? WHERE username = ?',
+                    (unlock.encode_verifier(keys.verifier), unlock.encode_salt(salt), username)
+                )
+            else:
+                cursor.execute(
+                    'INSERT INTO master_account (username, master_password, salt) VALUES (?, ?, ?)',
+                    (username, unlock.encode_verifier(keys.verifier), unlock.encode_salt(salt))
+                )
+            self.set_setting(unlock.UNLOCK_PARAMS_SETTING, unlock.dump_params(params), commit=False)
+            self.set_setting(envelope.WRAPPED_DATA_KEY_SETTING, envelope.wrap_data_key(keys.wrapping_key, data_key), commit=False)
+            cursor.execute('DELETE FROM settings WHERE key = ?', (envelope.WRAPPING_SALT_SETTING,))
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            raise Exception(f"Failed to store unlock keys: {str(e)}")
+        finally:
+            keys.wipe()
+        self._set_cipher(self._vault_cipher(data_key))
+
+    def use_data_key(self, data_key: bytes):
+        """Install a data key unlocked elsewhere (e.g. by a worker thread's connection)"""
+        self._set_cipher(self._vault_cipher(data_key))
+
+    def _set_cipher(self, cipher: Encryption):
+        """Install the vault cipher, wiping the keys of the one it replaces"""
+        old = getattr(self, 'cipher', None)
+        if old is not None and old is not cipher:
+            old.clear_key_cache()
+        self.cipher = cipher
+
+    def close(self):
+        """Lock the vault: stop the ciphertext migration, wipe the cipher's keys and close the connection"""
+        self.stop_ciphertext_migration()
+        self._set_cipher(None)
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def _vault_cipher(self, data_key: bytes, salt: bytes = None) -> Encryption:
+        """Data-key cipher sealing new rows with the vault's chosen suite"""
+        suite = cipher_suites.get_suite_by_name(self.get_setting(cipher_suites.CIPHER_SUITE_SETTING))
+        return Encryption.from_data_key(data_key, salt=salt, suite=suite)
+
+    def _create_data_key(self, master_password: str):
+        """Generate and store the wrapped data key, migrating any legacy rows to it"""
+        salt = os.urandom(Encryption.SALT_LENGTH)
+        data_key = envelope.generate_data_key()
+        wrapping_key = envelope.derive_wrapping_key(master_password, salt)
+        cipher = self._vault_cipher(data_key, salt=salt)
+
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT id, encrypted_password FROM vault')
+        legacy_rows = cursor.fetchall()
+        try:
+            if legacy_rows:
+                legacy_cipher = self._legacy_cipher(master_password)
+                plaintexts = [legacy_cipher.decrypt(blob).decode() for _, blob in legacy_rows]
+                sealed = cipher.encrypt_many(plaintexts)
+                cursor.executemany(
+                    'UPDATE vault SET encrypted_password = ? WHERE id = ?',
+                    [(result.value, row_id) for result, (row_id, _) in zip(sealed, legacy_rows)]
+                )
+            self.set_setting(envelope.WRAPPING_SALT_SETTING, base64.b64encode(salt).decode('ascii'), commit=False)
+            self.set_setting(envelope.WRAPPED_DATA_KEY_SETTING, envelope.wrap_data_key(wrapping_key, data_key), commit=False)
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            raise Exception(f"Failed to create vault data key: {str(e)}")
+        self._set_cipher(cipher)
+
+    def _legacy_cipher(self, master_password: str):
+        """Read-only Fernet cipher used by vaults created before envelope encryption"""
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
             salt=b'static_salt',  
             iterations=100000,
         )
-        key = base64.urlsafe_b64encode(kdf.derive(master_password.encode()))
-        self.cipher = Fernet(key)
+        return cipher_suites.FERNET.new(kdf.derive(master_password.encode()))
+
+    def change_master_password(self, old_password: str, new_password: str) -> bool:
+        """
+        Rewrap the vault data key under a new master password.
+
+        Only the login verifier and the small wrapped-key blob are rewritten;
+        vault rows stay untouched.
+
+        Returns:
+            bool: True if the data key was rewrapped, False if old_password is wrong
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT username FROM master_account')
+        account = cursor.fetchone()
+        # login() also migrates a legacy account onto the unified unlock scheme
+        if not account or not self.login(account[0], old_password):
+            return False
+
+        self._store_unlock_material(account[0], new_password, self.cipher.get_data_key())
+        return True
+
+    def migrate_ciphertext_format(self, batch_size: int = 500, cipher: Encryption = None,
+                                  stop: threading.Event = None) -> int:
+        """
+        Rewrite legacy base64 password blobs into the binary envelope format.
+
+        Runs on its own connection so it can be driven from a background thread.
+        Rows are converted in batches (AEAD only, no KDF) and each batch is
+        committed separately; a row changed concurrently keeps its newer value.
+
+        Args:
+            batch_size (int): Rows per batch and commit
+            cipher (Encryption, optional): Cipher to convert with instead of the vault's own
+            stop (threading.Event, optional): Checked between batches; once set, returns early
+
+        Returns:
+            int: Number of rows converted
+        """
+        cipher = cipher if cipher is not None else getattr(self, 'cipher', None)
+        if not cipher:
+            raise Exception("Encryption not initialized. Please login first.")
+
+        version = bytes((Encryption.FORMAT_VERSION,))
+        conn = self.profile.connect(self.db_path)
+        converted = 0
+        last_id = 0
+        try:
+            while not (stop and stop.is_set()):
+                rows = conn.execute('''
+                    SELECT id, encrypted_password FROM vault
+                    WHERE id > ? AND substr(encrypted_password, 1, 1) != ?
+                    ORDER BY id LIMIT ?
+                ''', (last_id, version, batch_size)).fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+
+                plaintexts = cipher.decrypt_many(blob for _, blob in rows)
+                readable = [(row, result.value) for row, result in zip(rows, plaintexts) if result.error is None]
+                sealed = cipher.encrypt_many(value for _, value in readable)
+                cursor = conn.executemany(
+                    'UPDATE vault SET encrypted_password = ? WHERE id = ? AND encrypted_password = ?',
+                    [(result.value, row_id, old_blob)
+                     for ((row_id, old_blob), _), result in zip(readable, sealed) if result.error is None]
+                )
+                conn.commit()
+                # Only rows the compare-and-swap actually rewrote (not lost races or failed re-encryptions)
+                converted += max(cursor.rowcount, 0)
+        finally:
+            conn.close()
+        return converted
+
+    def start_ciphertext_migration(self, batch_size: int = 500) -> threading.Thread:
+        """
+        Convert legacy password blobs on a background thread after unlock.
+
+        The thread seals with its own copy of the data-key cipher, wiped when
+        it finishes, so locking the vault never swaps keys out from under a
+        batch; close() stops and joins it before wiping the vault's cipher.
+        """
+        if not getattr(self, 'cipher', None):
+            raise Exception("Encryption not initialized. Please login first.")
+        self.stop_ciphertext_migration()
+        cipher = self._vault_cipher(self.cipher.get_data_key())
+        stop = self._migration_stop = threading.Event()
+
+        def run():
+            try:
+                converted = self.migrate_ciphertext_format(batch_size, cipher=cipher, stop=stop)
+                if converted:
+                    print(f"Debug - Converted {converted} password blobs to the binary format")
+            except Exception as e:
+                print(f"Debug - Ciphertext migration failed: {str(e)}")
+            finally:
+                cipher.clear_key_cache()
+
+        thread = self._migration = threading.Thread(target=run, name="ciphertext-migration", daemon=True)
+        thread.start()
+        return thread
+
+    def stop_ciphertext_migration(self):
+        """Ask the background ciphertext migration to stop and wait for its current batch"""
+        thread, self._migration = self._migration, None
+        self._migration_stop.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
 
     def add_entry(self, table: str, **kwargs):
         """
@@ -119,17 +432,14 @@ class PasswordVault:
             if not hasattr(self, 'cipher') or not self.cipher:
                 raise Exception("Encryption not initialized. Please login first.")
             try:
-                kwargs["encrypted_password"] = self.cipher.encrypt(kwargs.pop("password").encode())
+                kwargs["encrypted_password"] = self.cipher.encrypt(kwargs.pop("password"))
             except Exception as e:
                 raise Exception(f"Encryption failed: {str(e)}. Please ensure proper login.")
 
-        # Construct the query dynamically
-        columns = ', '.join(kwargs.keys())
-        placeholders = ', '.join('?' for _ in kwargs)
+        # Reuse the statement built for this column set
+        sql = self._insert_sql(table, tuple(kwargs.keys()))
         values = tuple(kwargs.values())
 
-        sql = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
-
         # Execute the query
         try:
             cursor = self.conn.cursor()
@@ -138,6 +448,103 @@ class PasswordVault:
         except Exception as e:
             raise Exception(f"Database insertion failed: {str(e)}")
 
+        if table == 'vault':
+            after = self._entry_state('id = ?', (cursor.lastrowid,))
+            if after:
+                self._publish(changes.INSERTED, after=after)
+        elif table == 'categories' and self._listeners:
+            self._publish(changes.INSERTED, 'categories',
+                          after={'id': cursor.lastrowid, 'name': kwargs.get('category_names')})
+
+
+    def add_entries(self, table: str, rows, chunk_size: int = 1000, progress=None) -> int:
+        """
+        Insert many rows in a single transaction.
+
+        Rows are read lazily, so a generator of any length uses memory for one
+        chunk at a time. Each chunk's passwords are encrypted with one batch
+        call and its rows go through executemany. The rows are written under a
+        savepoint, so any failure rolls back every row of this call and
+        nothing else. Outside a transaction the call commits once at the end;
+        inside the caller's transaction it leaves committing to the caller.
+        Listeners get one INSERTED change per row, or a single RESET when more
+        than INSERT_EVENT_ROWS rows were added.
+
+        Args:
+            table (str): Name of the table to insert into
+            rows: Iterable of dicts of column-value pairs, as add_entry's kwargs
+            chunk_size (int): Rows per encryption batch and executemany call
+            progress (callable, optional): Called with the running row count after each chunk
+
+        Returns:
+            int: Number of rows inserted
+        """
+        if not self.conn:
+            self.connect()
+        if not self.conn:
+            raise Exception("Database connection failed")
+
+        rows = iter(rows)
+        inserted = 0
+        cursor = self.conn.cursor()
+        # Releasing the outermost savepoint commits; inside the caller's transaction it only nests
+        cursor.execute('SAVEPOINT add_entries')
+        last_id = None
+        try:
+            # Ids above the current maximum are this call's rows (AUTOINCREMENT never reuses ids)
+            if table in ('vault', 'categories') and self._listeners:
+                cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}')
+                last_id = cursor.fetchone()[0]
+            while True:
+                chunk = [dict(row) for row in itertools.islice(rows, max(chunk_size, 1))]
+                if not chunk:
+                    break
+
+                secret_rows = [row for row in chunk if "password" in row]
+                if secret_rows:
+                    if not hasattr(self, 'cipher') or not self.cipher:
+                        raise Exception("Encryption not initialized. Please login first.")
+                    sealed = self.cipher.encrypt_many(row.pop("password") for row in secret_rows)
+                    for row, result in zip(secret_rows, sealed):
+                        if result.error is not None:
+                            raise Exception(f"Encryption failed: {str(result.error)}")
+                        row["encrypted_password"] = result.value
+
+                # One executemany per column set, keeping the chunk's order within each set
+                groups = {}
+                for row in chunk:
+                    groups.setdefault(tuple(row.keys()), []).append(tuple(row.values()))
+                for columns, values in groups.items():
+                    cursor.executemany(self._insert_sql(table, columns), values)
+
+                inserted += len(chunk)
+                if progress:
+                    progress(inserted)
+            cursor.execute('RELEASE add_entries')
+        except Exception as e:
+            cursor.execute('ROLLBACK TO add_entries')
+            cursor.execute('RELEASE add_entries')
+            raise Exception(f"Bulk insertion failed, no rows were added: {str(e)}")
+
+        if inserted:
+            self._publish_inserted(table, last_id, inserted)
+        return inserted
+
+    def _publish_inserted(self, table: str, last_id, inserted: int):
+        """INSERTED for each row add_entries added after last_id, or one RESET for a bulk import"""
+        if last_id is None or inserted > self.INSERT_EVENT_ROWS:
+            self._publish(changes.RESET, table)
+            return
+        cursor = self.conn.cursor()
+        if table == 'vault':
+            cursor.execute(f"SELECT {', '.join(changes.ENTRY_COLUMNS)} FROM vault WHERE id > ? ORDER BY id",
+                           (last_id,))
+            for row in cursor.fetchall():
+                self._publish(changes.INSERTED, after=dict(zip(changes.ENTRY_COLUMNS, row)))
+        else:
+            cursor.execute('SELECT id, category_names FROM categories WHERE id > ? ORDER BY id', (last_id,))
+            for category_id, name in cursor.fetchall():
+                self._publish(changes.INSERTED, 'categories', after={'id': category_id, 'name': name})
 
     def get_entry(self, table: str, **conditions):
         """
@@ -152,19 +559,9 @@ class PasswordVault:
 
         cursor = self.conn.cursor()
         
-        # Get column names for the table
-        cursor.execute(f"PRAGMA table_info({table})")
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        # Build query
-        query = f'SELECT {", ".join(columns)} FROM {table}'
-        values = tuple()
-        
-        # Add WHERE clause only if conditions exist
-        if conditions:
-            where_clause = ' AND '.join(f'{key} = ?' for key in conditions.keys())
-            query += f' WHERE {where_clause}'
-            values = tuple(conditions.values())
+        # Column names come from the per-connection cache, the query from the SQL cache
+        query, columns = self._select_sql(table, tuple(conditions.keys()))
+        values = tuple(conditions.values())
         
         cursor.execute(query, values)
         entry = cursor.fetchone()
@@ -176,7 +573,7 @@ class PasswordVault:
             # Decrypt password if it exists and cipher is initialized
             if 'encrypted_password' in result and hasattr(self, 'cipher'):
                 try:
-                    result['password'] = self.cipher.decrypt(result['encrypted_password']).decode()
+                    result['password'] = self.cipher.decrypt(result['encrypted_password'])
                     del result['encrypted_password']
                 except Exception as e:
                     raise Exception(f"Failed to decrypt password: {str(e)}")
@@ -185,10 +582,25 @@ class PasswordVault:
             
         return None
 
-    def create_master_account(self, username: str, master_password: str) -> bool:
-        """Create the master account for first-time setup"""
-        if self.conn is None:
-            raise Exception("Database connection is not established.")
+    def create_master_account(self, username: str, master_password: str, progress=None) -> bool:
+        """
+        Create the master account for first-time setup.
+
+        Calibrating the KDF and timing the cipher suites takes seconds; the
+        GUI runs this on UnlockWorker, as it does login.
+
+        Args:
+            username (str): Master account username
+            master_password (str): Master password
+            progress (callable, optional): Called as progress(percent, message)
+                between setup stages
+
+        Returns:
+            bool: False if a master account already exists
+        """
+        def report(percent, message):
+            if progress:
+                progress(percent, message)
 
         if self.conn is None:
             raise Exception("Database connection is not established.")
@@ -199,30 +611,63 @@ class PasswordVault:
         cursor.execute('SELECT COUNT(*) FROM master_account')
         if cursor.fetchone()[0] > 0:
             return False
-        
-        # Generate salt and hash password
-        salt = os.urandom(16).hex()
-        password_hash = self._hash_password(master_password, salt)
-        
-        # Store master account
-        cursor.execute('''
-            INSERT INTO master_account (username, password_hash, salt)
-            VALUES (?, ?, ?)
-        ''', (username, password_hash, salt))
-        self.conn.commit()
-        
-        # Setup encryption with master password
-        self.setup_encryption(master_password)
+
+        # Size the KDF for this host, then one argon2id pass yields both the
+        # login verifier and the data key wrapping key
+        report(5, "Measuring this device")
+        params = calibration.calibrate_argon2()
+        # Seal rows with whichever AEAD is fastest here (AES-GCM on AES-NI hosts)
+        report(50, "Choosing a cipher")
+        suite = cipher_suites.select_fastest_suite()
+        print(f"Debug - Selected cipher suite: {suite.name}")
+        self.set_setting(cipher_suites.CIPHER_SUITE_SETTING, suite.name, commit=False)
+        report(70, "Deriving keys")
+        self._store_unlock_material(username, master_password, envelope.generate_data_key(), params)
         return True
 
-    def login(self, username: str, master_password: str) -> bool:
-        """Verify login credentials and setup encryption"""
+    def recalibrate_unlock(self, master_password: str, target_ms: int = calibration.DEFAULT_TARGET_MS) -> dict:
+        """
+        Re-measure this host and re-derive the unlock keys with new argon2 costs.
+
+        Returns:
+            dict: The stored parameters, or None if master_password is wrong
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT username FROM master_account')
+        account = cursor.fetchone()
+        if not account or not self.login(account[0], master_password):
+            return None
+
+        params = calibration.calibrate_argon2(target_ms)
+        self._store_unlock_material(account[0], master_password, self.cipher.get_data_key(), params)
+        return params
+
+    def login(self, username: str, master_password: str, progress=None) -> bool:
+        """
+        Verify login credentials and setup encryption.
+
+        Runs a single memory-hard KDF whose output is split into the login
+        verifier and the key that unwraps the vault data key. Accounts still
+        holding a legacy argon2 PasswordHasher hash are verified the old way
+        once and then migrated onto the unified scheme.
+
+        Args:
+            username (str): Master account username
+            master_password (str): Master password
+            progress (callable, optional): Called as progress(percent, message)
+                between unlock stages
+        """
+        def report(percent, message):
+            if progress:
+                progress(percent, message)
+
         if self.conn is None:
             raise Exception("Database connection is not established.")
 
+        report(5, "Reading account")
         cursor = self.conn.cursor()
         cursor.execute('''
-            SELECT password_hash, salt 
+            SELECT master_password, salt 
             FROM master_account 
             WHERE username = ?
         ''', (username,))
@@ -232,39 +677,394 @@ class PasswordVault:
             return False
         
         stored_hash, salt = result
-        password_hash = self._hash_password(master_password, salt)
-        
-        if password_hash == stored_hash:
-            # Make sure encryption is set up when login is successful
-            self.setup_encryption(master_password)
+        if unlock.is_unlock_verifier(stored_hash):
+            report(15, "Deriving keys")
+            keys = self._derive_unlock_keys(master_password, salt)
+            if not keys.matches(stored_hash):
+                keys.wipe()
+                return False
+            report(90, "Unlocking vault")
+            self._unwrap_with(keys)
             return True
-        return False
 
-    def _hash_password(self, password: str, salt: str) -> str:
-        """Hash password with salt using SHA-256"""
-        return hashlib.sha256(
-            password.encode() + bytes.fromhex(salt)
-        ).hexdigest()
+        # Legacy account: argon2 hash of password + salt, see LoginDialog history.
+        # The new unlock keys do not depend on the old hash, so derive them on
+        # another core while the legacy hash is verified.
+        report(15, "Verifying password")
+        params = unlock.load_params(self.get_setting(unlock.UNLOCK_PARAMS_SETTING))
+        new_salt = unlock.new_salt()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending_keys = executor.submit(unlock.derive_unlock_keys, master_password, new_salt, params)
+            try:
+                PasswordHasher().verify(stored_hash, master_password + salt)
+                verified = True
+            except VerifyMismatchError:
+                verified = False
+            keys = pending_keys.result()
+        if not verified:
+            keys.wipe()
+            return False
+
+        report(60, "Upgrading account")
+        self._migrate_to_unified_unlock(username, master_password, params, (new_salt, keys))
+        return True
+
+    def _migrate_to_unified_unlock(self, username: str, master_password: str,
+                                   params: dict = None, derived: tuple = None):
+        """Move a verified legacy account onto the single-KDF unlock scheme"""
+        # Unlock (or create) the data key through the legacy envelope path first
+        self.setup_encryption(master_password)
+        self._store_unlock_material(username, master_password, self.cipher.get_data_key(), params, derived)
 
     def verify_master_password(self, input_password: str) -> bool:
         """Verify the input password against the stored master password"""
         if self.conn is None:
             raise Exception("Database connection is not established.")
 
-        if self.conn is None:
-            raise Exception("Database connection is not established.")
-
         cursor = self.conn.cursor()
-        cursor.execute('SELECT password_hash, salt FROM master_account')
+        cursor.execute('SELECT username FROM master_account')
         result = cursor.fetchone()
 
         if not result:
             return False
 
-        stored_hash, salt = result
-        input_hash = self._hash_password(input_password, salt)
+        return self.login(result[0], input_password)
+
+    def list_entries(self, filter_type: str = None, category: str = None,
+                     after_key: tuple = None, limit: int = None) -> list:
+        """
+        Read the (icon, title, username, id) rows the password list shows, ordered by title.
+
+        With a limit the rows come one keyset page at a time: passing the last
+        row's (title, id) as after_key reads the next page. A page costs an index seek plus its own rows, however
+        deep into the vault it starts.
+
+        Args:
+            filter_type (str, optional): "favorites" or "trash"
+            category (str, optional): Only live entries in this category
+            after_key (tuple, optional): (title, id) of the last row already read
+            limit (int, optional): Page size
+
+        Returns:
+            list: Row tuples; no passwords are read or decrypted
+        """
+        query = SearchQuery.for_filter(filter_type, category)
+        if limit is None and after_key is None:
+            return self.query_entries(query)
+        return self.query_entries(query, limit, keyed=True, after_key=after_key)
+
+    def query_entries(self, query: SearchQuery, limit: int = None, keyed: bool = False,
+                      after_key: tuple = None) -> list:
+        """
+        Run a SearchQuery, compiling its SQL once per query shape.
+
+        Args:
+            query (SearchQuery): Parsed query, list filter included
+            limit (int, optional): Maximum rows to return
+            keyed (bool): Keyset page in (title, id) order
+            after_key (tuple, optional): (title, id) to start after (keyed only)
+
+        Returns:
+            list: (icon, title, username, id) row tuples, best match first
+        """
+        if not self.conn:
+            self.connect()
+        fts = self.has_search_index()
+        after = keyed and after_key is not None
+        key = ('search', query.shape(fts), bool(limit), keyed, after)
+        sql = self._query_cache.get(key)
+        if sql is None:
+            sql = self._query_cache[key] = query.sql(fts, limit=bool(limit), keyed=keyed, after=after)
+        params = query.params(fts) + (tuple(after_key) if after else ()) + ((limit,) if limit else ())
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+    def has_search_index(self) -> bool:
+        """True if the FTS5 trigram table exists (SQLite builds without FTS5 fall back to LIKE)"""
+        if not self.conn:
+            self.connect()
+        return bool(self._columns('vault_fts'))
+
+    def search_fallback(self) -> str:
+        """Why search matches with LIKE instead of the full-text index, or None when the index exists"""
+        if self.has_search_index():
+            return None
+        return self.get_setting(migrations.SEARCH_FALLBACK_SETTING, "Full-text search index missing")
+
+    def search(self, query: str, filter_type: str = None, category: str = None, limit: int = None) -> list:
+        """
+        Find entries matching a search-bar query (see SearchQuery).
+
+        Plain words match title, username or website as substrings; fields
+        narrow it down: `site:github user:ops cat:Work fav:yes deleted:no`.
+        The compiled query uses the FTS5 trigram index ranked by bm25 (title
+        matches weigh most, then username, then website); terms shorter than
+        a trigram, or vaults without FTS5, use LIKE within the filtered rows,
+        ordered by title.
+
+        Args:
+            query (str): Search-bar text (case-insensitive)
+            filter_type (str, optional): "favorites" or "trash"
+            category (str, optional): Only live entries in this category
+            limit (int, optional): Maximum rows to return
+
+        Returns:
+            list: (icon, title, username, id) row tuples, best match first
+        """
+        if not self.conn:
+            self.connect()
+        parsed = SearchQuery.parse(query)
+        if not parsed.terms and not parsed.conditions:
+            return self.list_entries(filter_type, category)
+
+        # cat: is typed by hand; match it to the stored category name case-insensitively
+        cursor = self.conn.cursor()
+        for i, (column, value) in enumerate(parsed.conditions):
+            if column == 'category':
+                cursor.execute('SELECT category_names FROM categories WHERE category_names = ? COLLATE NOCASE',
+                               (value,))
+                row = cursor.fetchone()
+                if row:
+                    parsed.conditions[i] = (column, row[0])
+        return self.query_entries(parsed.restrict(filter_type, category), limit)
+
+    def _change_stamp(self) -> tuple:
+        """Changes made through this connection, and a counter other connections' commits bump"""
+        return self.conn.total_changes, self.conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def fuzzy_matcher(self) -> FuzzyMatcher:
+        """
+        FuzzyMatcher over the whole vault, rebuilt only after the vault changed.
+
+        Any write, whether through this class, raw SQL on self.conn or another
+        connection, moves the change stamp, so the GUI's own UPDATEs (favorites,
+        trash, categories) need no hooks. A vault that is told about another
+        connection's writes (apply_changes) patches the snapshot instead.
+        """
+        if not self.conn:
+            self.connect()
+        stamp = self._change_stamp()
+        if self._fuzzy is None or stamp != self._fuzzy_stamp:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                SELECT id, title, username, website, category, favorite, deleted,
+                       CAST(strftime('%s', last_used_at) AS INTEGER)
+                FROM vault
+                ORDER BY title
+            """)
+            self._fuzzy = FuzzyMatcher(cursor.fetchall())
+            self._fuzzy_stamp = stamp
+            if self.search_index is not None:
+                # Rebuilt from the same vault; fuzzy_search ranks every entry until it is ready
+                self.start_search_index()
+        return self._fuzzy
+
+    def start_search_index(self) -> threading.Thread:
+        """
+        Build the in-memory search index on a background thread (SearchWorker does, after unlock).
+
+        The index is installed right away; changes passed to apply_changes
+        while the build runs are queued and applied when it finishes, and
+        fuzzy_search doesn't use the index until then.
+        """
+        index = TrigramIndex()
+        self.search_index = index
+
+        def run():
+            conn = None
+            try:
+                conn = self.profile.connect(self.db_path)
+                index.build(conn.execute('SELECT id, title, username, website, category FROM vault'))
+                print(f"Debug - Search index ready: {len(index)} entries")
+            except Exception as e:
+                print(f"Debug - Search index build failed: {str(e)}")
+            finally:
+                if conn:
+                    conn.close()
+
+        thread = threading.Thread(target=run, name="search-index", daemon=True)
+        thread.start()
+        return thread
 
-        return input_hash == stored_hash
+    @staticmethod
+    def _fuzzy_row(state: dict) -> tuple:
+        """An entry state (changes.ENTRY_COLUMNS) as a FuzzyMatcher row; last use left as it is"""
+        return (state['id'], state['title'], state['username'], state['website'],
+                state['category'], state['favorite'], state['deleted'], None)
+
+    def apply_changes(self, vault_changes):
+        """
+        Patch the fuzzy matcher and search index with another connection's committed changes.
+
+        SearchWorker forwards the GUI vault's changes here, so a favorite,
+        trash, edit, delete or use updates one snapshot row instead of making
+        the next search rebuild it from SQL; a RESET drops the snapshot. The
+        snapshot is then stamped current, taking the commits that moved the
+        stamp to be the ones these changes describe: a commit by some other
+        writer landing at the same moment shows at the next rebuild.
+
+        Args:
+            vault_changes: changes.VaultChange objects, oldest first
+        """
+        if self._fuzzy is None or not vault_changes:
+            return
+        for change in vault_changes:
+            if change.table != 'vault':
+                continue
+            if change.kind == changes.RESET:
+                self._fuzzy = None
+                return
+            if change.kind == changes.USED:
+                self._fuzzy.touch(change.id)
+            elif change.after:
+                self._fuzzy.upsert(self._fuzzy_row(change.after))
+                if self.search_index is not None:
+                    after = change.after
+                    self.search_index.upsert(after['id'], after['title'], after['username'],
+                                             after['website'], after['category'])
+            else:
+                self._fuzzy.remove(change.id)
+                if self.search_index is not None:
+                    self.search_index.remove(change.id)
+        self._fuzzy_stamp = self._change_stamp()
+
+    def fuzzy_search(self, query: str, filter_type: str = None, category: str = None, limit: int = None) -> list:
+        """
+        Fuzzy-ranked entries for the search box (see FuzzyMatcher).
+
+        Queries naming a field (site:, user:, cat:, ...) go to search() instead.
+        Once the search index is ready, a query of a trigram or more that a
+        modest number of entries contain is ranked among those entries only,
+        leaving out ones that merely hold its letters in order; rarer queries,
+        typos included, and very common ones are matched against every entry.
+
+        Args:
+            query (str): Text to match; typos and skipped characters are allowed
+            filter_type (str, optional): "favorites" or "trash"
+            category (str, optional): Only live entries in this category
+            limit (int, optional): Maximum rows to return
+
+        Returns:
+            list: (icon, title, username, id) row tuples, best match first
+        """
+        if not query.strip():
+            return self.list_entries(filter_type, category)
+        if SearchQuery.parse(query).is_qualified():
+            return self.search(query, filter_type, category, limit)
+        ids = self._match_fuzzy(self.fuzzy_matcher(), self.search_index, query, filter_type, category, limit)
+        return self._rows_by_id(ids, filter_type, category)
+
+    @classmethod
+    def _match_fuzzy(cls, matcher: FuzzyMatcher, index: TrigramIndex, query: str,
+                     filter_type: str = None, category: str = None, limit: int = None) -> list:
+        """Ranked ids for fuzzy_search, prefiltered by the search index where that pays off"""
+        if index is not None and index.ready:
+            candidates = index.candidates(query)
+            if candidates is not None and \
+                    cls.PREFILTER_HITS <= len(candidates) <= len(matcher) // cls.PREFILTER_SHARE:
+                ids = matcher.match(query, filter_type, category, limit, candidates=candidates)
+                if len(ids) >= min(limit or cls.PREFILTER_HITS, cls.PREFILTER_HITS):
+                    return ids
+        return matcher.match(query, filter_type, category, limit)
+
+    def search_predicate(self, query: str, filter_type: str = None, category: str = None):
+        """
+        Callable telling whether an entry would be among fuzzy_search's results.
+
+        It takes an entry state (changes.ENTRY_COLUMNS) and runs no SQL, so a
+        view showing search results can apply vault changes to them. Field
+        queries are checked like the SQL they compile to; plain text is
+        fuzzy-matched against that one entry, typos included.
+        """
+        parsed = SearchQuery.parse(query)
+        if not query.strip() or parsed.is_qualified():
+            return parsed.restrict(filter_type, category).accepts
+
+        def accepts(state):
+            matcher = FuzzyMatcher([self._fuzzy_row(state)])
+            return bool(matcher.match(query, filter_type, category))
+        return accepts
+
+    def mark_used(self, title: str):
+        """Stamp an entry as used now; recently used entries rank higher in fuzzy_search"""
+        if not self.conn:
+            self.connect()
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT id FROM vault WHERE title = ?', (title,))
+            row = cursor.fetchone()
+            if not row:
+                return
+            cursor.execute('UPDATE vault SET last_used_at = CURRENT_TIMESTAMP WHERE id = ?', (row[0],))
+            self.conn.commit()
+            # SearchWorker's matcher takes the new last use from this instead of rebuilding
+            state = self._entry_state('id = ?', (row[0],))
+            if state:
+                self._publish(changes.USED, before=state, after=state)
+        except Exception as e:
+            print(f"Debug - Failed to record use of '{title}': {str(e)}")
+
+    def _rows_by_id(self, ids: list, filter_type: str = None, category: str = None) -> list:
+        """(icon, title, username, id) rows for ids that pass the filter, in the order of ids"""
+        where, params = SearchQuery.for_filter(filter_type, category).where()
+        found = {}
+        cursor = self.conn.cursor()
+        for start in range(0, len(ids), 900):
+            batch = ids[start:start + 900]
+            # NOT INDEXED keeps the planner on rowid lookups; left to itself it walks a filter index
+            cursor.execute(f"""
+                SELECT id, icon, title, username FROM vault NOT INDEXED
+                WHERE id IN ({', '.join('?' for _ in batch)}) AND {where}
+            """, tuple(batch) + params)
+            for row_id, icon, title, username in cursor.fetchall():
+                found[row_id] = (icon, title, username, row_id)
+        return [found[row_id] for row_id in ids if row_id in found]
+
+    def read_list_metadata(self, limit: int = None) -> dict:
+        """
+        Read everything the main window lists at startup; none of it is encrypted.
+
+        Args:
+            limit (int, optional): Read only the first keyset page of entries
+                (see list_entries)
+
+        Returns:
+            dict: 'entries' (icon, title, username, id rows of All Items ordered by
+            title), 'categories' (names ordered) and 'counts' ('total',
+            'favorites', 'trash' and per-category 'categories')
+        """
+        entries = self.list_entries(limit=limit)
+        cursor = self.conn.cursor()
+
+        cursor.execute('SELECT category_names FROM categories ORDER BY category_names')
+        categories = [row[0] for row in cursor.fetchall() if row[0]]
+
+        cursor.execute('''
+            SELECT COALESCE(SUM(deleted = 0), 0),
+                   COALESCE(SUM(favorite = 1 AND deleted = 0), 0),
+                   COALESCE(SUM(deleted = 1), 0)
+            FROM vault
+        ''')
+        total, favorites, trash = cursor.fetchone()
+
+        cursor.execute('''
+            SELECT category, COUNT(*) FROM vault
+            WHERE deleted = 0 AND category IS NOT NULL
+            GROUP BY category
+        ''')
+        category_counts = dict(cursor.fetchall())
+
+        return {
+            'entries': entries,
+            'categories': categories,
+            'counts': {
+                'total': total,
+                'favorites': favorites,
+                'trash': trash,
+                'categories': {name: category_counts.get(name, 0) for name in categories},
+            },
+        }
 
     def delete_entry(self, title: str):
         """Delete password entry by title"""
@@ -273,12 +1073,73 @@ class PasswordVault:
         
         try:
             cursor = self.conn.cursor()
+            before = self._entry_state('title = ?', (title,))
             cursor.execute('DELETE FROM vault WHERE title = ?', (title,))
             self.conn.commit()
+            if before:
+                self._publish(changes.REMOVED, before=before)
             return cursor.rowcount > 0
         except Exception as e:
             raise Exception(f"Failed to delete entry: {str(e)}")
 
+    def _update_entry_flags(self, title: str, kind: str, **values) -> bool:
+        """SET the given columns on one entry by title, commit and publish the change"""
+        if not self.conn:
+            self.connect()
+        before = self._entry_state('title = ?', (title,))
+        assignments = ', '.join(f"{column} = ?" for column in values)
+        cursor = self.conn.cursor()
+        cursor.execute(f'UPDATE vault SET {assignments} WHERE title = ?', tuple(values.values()) + (title,))
+        self.conn.commit()
+        if before:
+            self._publish(kind, before=before, after=self._entry_state('id = ?', (before['id'],)))
+        return cursor.rowcount > 0
+
+    def set_favorite(self, title: str, favorite: bool) -> bool:
+        """Mark or unmark an entry as a favorite"""
+        try:
+            return self._update_entry_flags(title, changes.UPDATED, favorite=bool(favorite))
+        except Exception as e:
+            raise Exception(f"Failed to update favorite status: {str(e)}")
+
+    def trash_entry(self, title: str) -> bool:
+        """Move an entry to the trash"""
+        try:
+            return self._update_entry_flags(title, changes.MOVED, deleted=1)
+        except Exception as e:
+            raise Exception(f"Failed to move entry to trash: {str(e)}")
+
+    def restore_entry(self, title: str) -> bool:
+        """Move an entry out of the trash"""
+        try:
+            return self._update_entry_flags(title, changes.MOVED, deleted=0)
+        except Exception as e:
+            raise Exception(f"Failed to restore entry from trash: {str(e)}")
+
+    def delete_category(self, name: str):
+        """Delete a category; its entries are kept without a category"""
+        if not self.conn:
+            self.connect()
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT id FROM categories WHERE category_names = ?', (name,))
+            category = cursor.fetchone()
+            cursor.execute('SELECT id FROM vault WHERE category = ?', (name,))
+            affected_ids = [row[0] for row in cursor.fetchall()]
+            before = [self._entry_state('id = ?', (entry_id,)) for entry_id in affected_ids]
+            cursor.execute('DELETE FROM categories WHERE category_names = ?', (name,))
+            cursor.execute('UPDATE vault SET category = NULL WHERE category = ?', (name,))
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            raise Exception(f"Failed to delete category: {str(e)}")
+
+        for state in before:
+            if state:
+                self._publish(changes.UPDATED, before=state, after=dict(state, category=None))
+        if category:
+            self._publish(changes.REMOVED, 'categories', before={'id': category[0], 'name': name})
+
     def update_entry(self, title: str, username: str, password: str, website: str = None, 
                     notes: str = None, category: str = None, master_password: str = None) -> bool:
         """
@@ -304,8 +1165,9 @@ class PasswordVault:
                 self.setup_encryption(master_password)
             
             # Encrypt the new password
-            encrypted_password = self.cipher.encrypt(password.encode())
+            encrypted_password = self.cipher.encrypt(password)
             
+            before = self._entry_state('title = ?', (title,))
             cursor = self.conn.cursor()
             cursor.execute('''
                 UPDATE vault 
@@ -319,6 +1181,8 @@ class PasswordVault:
             ''', (username, encrypted_password, website, notes, category, title))
             
             self.conn.commit()
+            if before:
+                self._publish(changes.UPDATED, before=before, after=self._entry_state('id = ?', (before['id'],)))
             return True
             
         except Exception as e:
@@ -1,10 +1,31 @@
-from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 import os
 import base64
+import hashlib
 import logging
+import threading
+import weakref
+from src.core import cipher_suites
+
+# Outcome of one item in a batch call: exactly one of value/error is set
+BatchResult = namedtuple('BatchResult', ['value', 'error'])
+
+
+def pbkdf2_derive(master_password: str, salt: bytes, iterations: int, length: int) -> bytes:
+    """PBKDF2-SHA256 of the master password"""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=length,
+        salt=salt,
+        iterations=iterations,
+        backend=default_backend()
+    )
+    return kdf.derive(master_password.encode())
+
 
 class Encryption:
     # Add constants
@@ -12,78 +33,361 @@ class Encryption:
     SALT_LENGTH = 16
     KEY_LENGTH = 32
     NONCE_LENGTH = 12
+    KEY_CACHE_SIZE = 64
+    # Batch tuning: AEAD items per worker task
+    BATCH_CHUNK_SIZE = 256
 
-    def __init__(self, master_password: str, salt: bytes = None):
+    # Binary envelope: version | kdf_id << 4 | cipher_id | [salt] | nonce | ciphertext
+    FORMAT_VERSION = 1
+    HEADER_LENGTH = 2
+    KDF_DATA_KEY = 0   # sealed with the vault data key, no salt stored
+    KDF_PBKDF2 = 1     # key derived from the master password, 16-byte salt follows
+    CIPHER_CHACHA20_POLY1305 = cipher_suites.CHACHA20_POLY1305.suite_id
+    CIPHER_AES_256_GCM = cipher_suites.AES_256_GCM.suite_id
+    TAG_LENGTH = 16
+
+    # Live instances, so every key cache can be wiped when the vault locks
+    _instances = weakref.WeakSet()
+
+    def __init__(self, master_password: str = None, salt: bytes = None, cache_size: int = None,
+                 data_key: bytes = None, iterations: int = None, suite: cipher_suites.CipherSuite = None):
+        if master_password is None and data_key is None:
+            raise ValueError("Either a master password or a data key is required")
+        # Suite new data is sealed with; blobs record theirs, so any registered suite decrypts
+        self.suite = suite if suite is not None else cipher_suites.DEFAULT_SUITE
+        if not self.suite.aead:
+            raise ValueError(f"Cipher suite {self.suite.name} is read-only")
         # Allow salt to be passed in or generate new one
         self.salt = salt if salt is not None else os.urandom(16)
-        # Increase iterations for better security
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=self.salt,
-            iterations=310000,
-            backend=default_backend()
-        )
-        self.key = kdf.derive(master_password.encode())
         self.master_password = master_password
+        # Callers may pass a calibrated count; blobs must be read back with the same value
+        self.iterations = iterations if iterations is not None else self.PBKDF2_ITERATIONS
+        # Envelope mode: every salt maps to the unwrapped vault data key, no KDF runs
+        self._data_key = bytearray(data_key) if data_key is not None else None
+
+        # Bounded LRU of salt -> (derived key, {suite id: cipher}) so repeated decrypts skip the KDF
+        self.cache_size = cache_size if cache_size is not None else self.KEY_CACHE_SIZE
+        self._key_cache = OrderedDict()
+        self._cache_lock = threading.RLock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        Encryption._instances.add(self)
+
+        # Derive (or install) our own salt's key now; it lives only in the zeroizable cache
+        self._get_key_entry(self.salt)
+
+    @classmethod
+    def from_data_key(cls, data_key: bytes, salt: bytes = None, suite: cipher_suites.CipherSuite = None):
+        """Create an instance that seals everything with an already unwrapped data key"""
+        return cls(salt=salt, data_key=data_key, suite=suite)
 
     # Add method to get salt
     def get_salt(self) -> bytes:
         return self.salt
 
-    def encrypt(self, data: str) -> bytes:
+    def get_data_key(self) -> bytes:
+        """Return the unwrapped vault data key (envelope mode only)"""
+        if self._data_key is None:
+            raise ValueError("Encryption is not using a vault data key")
+        return bytes(self._data_key)
+
+    def _derive_key(self, salt: bytes) -> bytes:
+        """Derive the AEAD key for a salt from the master password"""
+        if self._data_key is not None:
+            return bytes(self._data_key)
+        if self.master_password is None:
+            raise ValueError("Encryption keys were cleared; unlock the vault again")
+        # Increase iterations for better security
+        return pbkdf2_derive(self.master_password, salt, self.iterations, self.KEY_LENGTH)
+
+    def _get_key_entry(self, salt: bytes):
+        """Return the cached (key, ciphers) pair for a salt, deriving it on a miss"""
+        salt = bytes(salt)
+        with self._cache_lock:
+            entry = self._key_cache.get(salt)
+            if entry is not None:
+                self._key_cache.move_to_end(salt)
+                self.cache_hits += 1
+                return entry
+            self.cache_misses += 1
+        return self._store_key(salt, self._derive_key(salt))
+
+    def _store_key(self, salt: bytes, derived_key: bytes):
+        """Insert a derived key into the cache, evicting the least recently used salts"""
+        key = bytearray(derived_key)
+        entry = (key, {})
+        with self._cache_lock:
+            self._key_cache[salt] = entry
+            self._key_cache.move_to_end(salt)
+            while len(self._key_cache) > max(self.cache_size, 1):
+                _, (old_key, _) = self._key_cache.popitem(last=False)
+                self._zeroize(old_key)
+        return entry
+
+    def _get_cipher(self, salt: bytes, suite: cipher_suites.CipherSuite = None):
+        """Cached AEAD for a salt's key under a suite (this instance's suite by default)"""
+        suite = suite if suite is not None else self.suite
+        salt = bytes(salt)
+        while True:
+            entry = self._get_key_entry(salt)
+            key, ciphers = entry
+            cipher = ciphers.get(suite.suite_id)
+            if cipher is not None:
+                return cipher
+            with self._cache_lock:
+                # A batch worker may have evicted (and zeroed) the key since the lookup; derive it again
+                if self._key_cache.get(salt) is entry:
+                    return ciphers.setdefault(suite.suite_id, suite.new(key))
+
+    @staticmethod
+    def _zeroize(buffer: bytearray):
+        for i in range(len(buffer)):
+            buffer[i] = 0
+
+    def clear_key_cache(self):
+        """
+        Zero and drop every cached key and the data key (call when the vault locks).
+
+        The instance can't encrypt or decrypt afterwards.
+        """
+        with self._cache_lock:
+            while self._key_cache:
+                _, (key, _) = self._key_cache.popitem()
+                self._zeroize(key)
+            if self._data_key is not None:
+                self._zeroize(self._data_key)
+                self._data_key = None
+            self.master_password = None
+
+    def cache_stats(self) -> dict:
+        """Return key cache size and hit/miss counters"""
+        return {
+            'size': len(self._key_cache),
+            'max_size': self.cache_size,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+        }
+
+    @classmethod
+    def clear_all_key_caches(cls):
+        """Lock hook: wipe the key caches of every live Encryption instance"""
+        for instance in list(cls._instances):
+            instance.clear_key_cache()
+
+    def _header(self) -> bytes:
+        kdf_id = self.KDF_DATA_KEY if self._data_key is not None else self.KDF_PBKDF2
+        return bytes((self.FORMAT_VERSION, kdf_id << 4 | self.suite.suite_id))
+
+    def _seal(self, cipher, header: bytes, plaintext: bytes) -> bytes:
+        """Build a binary envelope; the header is authenticated as associated data"""
         # Generate a random nonce
-        nonce = os.urandom(12)
-        # Create ChaCha20-Poly1305 cipher
-        chacha = ChaCha20Poly1305(self.key)
-        # Encrypt the data
-        encrypted_data = chacha.encrypt(
-            nonce,
-            data.encode(),
-            None
-        )
-        # Combine salt + nonce + encrypted data
-        return base64.b64encode(self.salt + nonce + encrypted_data)
+        nonce = os.urandom(self.NONCE_LENGTH)
+        salt = b'' if self._data_key is not None else self.salt
+        return b''.join((header, salt, nonce, cipher.encrypt(nonce, plaintext, header)))
+
+    def encrypt(self, data: str) -> bytes:
+        # Reuse the cached cipher for our salt and suite
+        cipher = self._get_cipher(self.salt)
+        return self._seal(cipher, self._header(), data.encode())
+
+    def _split(self, encrypted_data: bytes):
+        """
+        Parse a stored blob into (salt, nonce, ciphertext, associated_data, suite).
+
+        Binary envelopes are sliced through a memoryview without copying; salt is
+        None for data-key envelopes and suite comes from the header's cipher id.
+        Legacy base64(salt + nonce + ciphertext) blobs are still accepted; they
+        are always ChaCha20-Poly1305 and have no associated data.
+        """
+        view = memoryview(encrypted_data)
+        if len(view) and view[0] == self.FORMAT_VERSION:
+            kdf_id, cipher_id = view[1] >> 4, view[1] & 0x0F
+            suite = cipher_suites.get_suite(cipher_id)
+            offset = self.HEADER_LENGTH
+            if kdf_id == self.KDF_PBKDF2:
+                salt = view[offset:offset + self.SALT_LENGTH]
+                offset += self.SALT_LENGTH
+            elif kdf_id == self.KDF_DATA_KEY:
+                salt = None
+            else:
+                raise ValueError(f"Unsupported KDF id {kdf_id}")
+            if len(view) < offset + self.NONCE_LENGTH + self.TAG_LENGTH:
+                logging.error(f"Encrypted data too short: {len(view)} bytes")
+                raise ValueError("Encrypted data is too short")
+            nonce = view[offset:offset + self.NONCE_LENGTH]
+            return salt, nonce, view[offset + self.NONCE_LENGTH:], view[:self.HEADER_LENGTH], suite
+
+        # Legacy format: decode the base64 data
+        raw_data = base64.b64decode(encrypted_data)
+
+        # Verify minimum data length
+        min_length = self.SALT_LENGTH + self.NONCE_LENGTH
+        if len(raw_data) < min_length:
+            logging.error(f"Encrypted data too short: {len(raw_data)} bytes")
+            raise ValueError("Encrypted data is too short")
+
+        # Split salt, nonce and ciphertext
+        view = memoryview(raw_data)
+        salt = view[:16]
+        nonce = view[16:28]
+        ciphertext = view[28:]
+        return salt, nonce, ciphertext, None, cipher_suites.CHACHA20_POLY1305
+
+    def _cipher_for(self, salt, suite: cipher_suites.CipherSuite):
+        """Cipher for a parsed salt and suite; None means the blob was sealed with the data key"""
+        if salt is None:
+            if self._data_key is None:
+                raise ValueError("Data is sealed with a vault data key")
+            return self._get_cipher(self.salt, suite)
+        return self._get_cipher(salt, suite)
 
     def decrypt(self, encrypted_data: bytes) -> str:
         try:
             if encrypted_data is None:
                 return ""
-                
-            # Decode the data
-            raw_data = base64.b64decode(encrypted_data)
-            
-            # Verify minimum data length
-            min_length = self.SALT_LENGTH + self.NONCE_LENGTH
-            if len(raw_data) < min_length:
-                logging.error(f"Encrypted data too short: {len(raw_data)} bytes")
-                raise ValueError("Encrypted data is too short")
-            
-            # Split salt, nonce and ciphertext
-            salt = raw_data[:16]
-            nonce = raw_data[16:28]
-            ciphertext = raw_data[28:]
-            
-            # Use the salt from the encrypted data to derive the key
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=310000,
-                backend=default_backend()
-            )
-            key = kdf.derive(self.master_password.encode())
-            
-            # Create cipher with derived key
-            chacha = ChaCha20Poly1305(key)
-            
+
+            salt, nonce, ciphertext, associated_data, suite = self._split(encrypted_data)
+
+            # Use the salt and suite from the encrypted data to look up (or derive) the key
+            cipher = self._cipher_for(salt, suite)
+
             # Decrypt the data
-            decrypted_data = chacha.decrypt(
+            decrypted_data = cipher.decrypt(
                 nonce,
                 ciphertext,
-                None
+                associated_data
             )
             return decrypted_data.decode()
         except Exception as e:
             logging.error(f"Decryption failed: {str(e)}")
-            raise ValueError("Failed to decrypt data") from e
\ No newline at end of file
+            raise ValueError("Failed to decrypt data") from e
+
+    def _prefetch_keys(self, salts, max_workers: int = None):
+        """
+        Derive keys for all uncached salts once, on a thread pool.
+
+        hashlib's PBKDF2 (same output as pbkdf2_derive) releases the GIL, so
+        the derivations run in parallel without process pools, which the
+        py2app bundle can't spawn safely and which would need the master
+        password pickled to every child.
+        """
+        if self._data_key is not None or self.master_password is None:
+            return
+        with self._cache_lock:
+            missing = [salt for salt in salts if salt not in self._key_cache]
+        if not missing:
+            return
+        # Never derive more keys than the cache can hold at once
+        missing = missing[:max(self.cache_size, 1)]
+
+        password = self.master_password.encode()
+
+        def derive(salt):
+            return hashlib.pbkdf2_hmac('sha256', password, salt, self.iterations, self.KEY_LENGTH)
+
+        try:
+            if len(missing) == 1:
+                keys = [derive(missing[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    keys = list(executor.map(derive, missing))
+        except Exception as e:
+            # Fall back to lazy derivation per group
+            logging.warning(f"Batch key derivation failed, deriving lazily: {str(e)}")
+            return
+        with self._cache_lock:
+            self.cache_misses += len(missing)
+        for salt, key in zip(missing, keys):
+            self._store_key(salt, key)
+
+    def _run_chunks(self, work, tasks, max_workers: int = None):
+        """Run work(task) over a thread pool, or inline when there is a single task"""
+        if len(tasks) <= 1:
+            for task in tasks:
+                work(task)
+            return
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Consume the iterator so worker exceptions propagate
+            list(executor.map(work, tasks))
+
+    def decrypt_many(self, items, max_workers: int = None) -> list:
+        """
+        Decrypt many blobs, deriving each distinct salt's key only once.
+
+        Args:
+            items: Iterable of encrypted blobs (as returned by encrypt)
+            max_workers (int, optional): Thread pool size
+
+        Returns:
+            list: One BatchResult per input, in input order. A row that fails to
+            decrypt carries a ValueError in `error` and does not abort the batch.
+        """
+        items = list(items)
+        results = [None] * len(items)
+
+        # Group rows by salt (and suite, for mixed-suite vaults) so each key is derived once
+        groups = OrderedDict()
+        for index, encrypted_data in enumerate(items):
+            if encrypted_data is None:
+                results[index] = BatchResult("", None)
+                continue
+            try:
+                salt, nonce, ciphertext, associated_data, suite = self._split(encrypted_data)
+            except Exception as e:
+                results[index] = BatchResult(None, ValueError(f"Failed to decrypt data: {str(e)}"))
+                continue
+            group = (bytes(salt) if salt is not None else None, suite)
+            groups.setdefault(group, []).append((index, nonce, ciphertext, associated_data))
+
+        self._prefetch_keys(list(OrderedDict.fromkeys(salt for salt, _ in groups if salt is not None)),
+                            max_workers=max_workers)
+
+        def work(task):
+            (salt, suite), rows = task
+            try:
+                cipher = self._cipher_for(salt, suite)
+            except Exception as e:
+                for index, _, _, _ in rows:
+                    results[index] = BatchResult(None, ValueError(f"Failed to derive key: {str(e)}"))
+                return
+            for index, nonce, ciphertext, associated_data in rows:
+                try:
+                    results[index] = BatchResult(cipher.decrypt(nonce, ciphertext, associated_data).decode(), None)
+                except Exception as e:
+                    results[index] = BatchResult(None, ValueError(f"Failed to decrypt data: {type(e).__name__}"))
+
+        tasks = []
+        for group, rows in groups.items():
+            for start in range(0, len(rows), self.BATCH_CHUNK_SIZE):
+                tasks.append((group, rows[start:start + self.BATCH_CHUNK_SIZE]))
+        self._run_chunks(work, tasks, max_workers=max_workers)
+        return results
+
+    def encrypt_many(self, values, max_workers: int = None) -> list:
+        """
+        Encrypt many strings under this instance's salt, spreading AEAD work over threads.
+
+        Args:
+            values: Iterable of strings to encrypt
+            max_workers (int, optional): Thread pool size
+
+        Returns:
+            list: One BatchResult per input, in input order
+        """
+        values = list(values)
+        results = [None] * len(values)
+        cipher = self._get_cipher(self.salt)
+        header = self._header()
+
+        def work(bounds):
+            start, end = bounds
+            for index in range(start, end):
+                try:
+                    results[index] = BatchResult(self._seal(cipher, header, values[index].encode()), None)
+                except Exception as e:
+                    results[index] = BatchResult(None, ValueError(f"Failed to encrypt data: {str(e)}"))
+
+        tasks = [(start, min(start + self.BATCH_CHUNK_SIZE, len(values)))
+                 for start in range(0, len(values), self.BATCH_CHUNK_SIZE)]
+        self._run_chunks(work, tasks, max_workers=max_workers)
+        return results
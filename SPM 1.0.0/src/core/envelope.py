@@ -0,0 +1,39 @@
+from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+from cryptography.exceptions import InvalidTag
+from src.core.encryption import Encryption, pbkdf2_derive
+import os
+import base64
+
+# Settings table keys for the envelope
+WRAPPED_DATA_KEY_SETTING = 'wrapped_data_key'
+WRAPPING_SALT_SETTING = 'wrapping_key_salt'
+
+# Associated data binds the wrapped blob to its purpose and format version
+WRAP_AAD = b'spm-data-key-v1'
+
+
+def generate_data_key() -> bytes:
+    """Create a random per-vault data-encryption key"""
+    return os.urandom(Encryption.KEY_LENGTH)
+
+
+def derive_wrapping_key(master_password: str, salt: bytes) -> bytes:
+    """Derive the key-encryption key from the master password (the single unlock KDF)"""
+    return pbkdf2_derive(master_password, salt, Encryption.PBKDF2_ITERATIONS, Encryption.KEY_LENGTH)
+
+
+def wrap_data_key(wrapping_key: bytes, data_key: bytes) -> str:
+    """Seal the data key under the wrapping key, returned as text for the settings table"""
+    nonce = os.urandom(Encryption.NONCE_LENGTH)
+    sealed = ChaCha20Poly1305(wrapping_key).encrypt(nonce, data_key, WRAP_AAD)
+    return base64.b64encode(nonce + sealed).decode('ascii')
+
+
+def unwrap_data_key(wrapping_key: bytes, wrapped: str) -> bytes:
+    """Recover the data key; raises ValueError when the wrapping key is wrong"""
+    raw = base64.b64decode(wrapped)
+    nonce, sealed = raw[:Encryption.NONCE_LENGTH], raw[Encryption.NONCE_LENGTH:]
+    try:
+        return ChaCha20Poly1305(wrapping_key).decrypt(nonce, sealed, WRAP_AAD)
+    except InvalidTag as e:
+        raise ValueError("Invalid master password or corrupted data key") from e
@@ -0,0 +1,331 @@
+"""
+Streaming encrypted export of the vault, and the matching importer.
+
+The archive is a header followed by independently sealed chunks:
+
+    header: "SPMX" | version | suite id | format | salt (16) | params length (2) | argon2 params JSON
+    chunk:  length (4) | flags (1) | nonce (12) | AEAD(rows)
+
+The archive key is an HKDF subkey of an argon2id derivation of the export
+passphrase (salt and costs are in the header). Each chunk authenticates the
+header, its index and its flags, so chunks cannot be reordered, swapped
+between archives or dropped; the last chunk carries FINAL_FLAG, so a
+truncated archive is detected. Every chunk has a random nonce, so resuming
+an interrupted export never reuses one. Resuming checks the passphrase
+against the last sealed chunk; an archive with no chunk yet is started over.
+
+Rows are read by id in keyset pages and decrypted in batches; memory does
+not grow with the vault.
+
+Headless use (from the "SPM 1.0.0" directory):
+    python -m src.core.exporters export path/to/vault.db backup.spmx [--format csv] [--resume]
+    python -m src.core.exporters import path/to/vault.db backup.spmx
+"""
+import argparse
+import base64
+import csv
+import getpass
+import io
+import json
+import os
+import struct
+import sys
+from src.core import cipher_suites, unlock
+from src.core.importers import VaultImporter
+
+MAGIC = b'SPMX'
+ARCHIVE_VERSION = 1
+FORMAT_JSONL = 1
+FORMAT_CSV = 2
+FORMATS = {'jsonl': FORMAT_JSONL, 'csv': FORMAT_CSV}
+
+HEADER = struct.Struct('>4sBBB16sH')
+CHUNK = struct.Struct('>IB')
+NONCE_LENGTH = 12
+FINAL_FLAG = 0x01
+
+# Rows per sealed chunk (and per keyset page / decrypt batch)
+ROWS_PER_CHUNK = 500
+
+COLUMNS = ('id', 'title', 'username', 'password', 'website', 'icon', 'notes',
+           'category', 'favorite', 'deleted', 'created_at', 'updated_at')
+
+
+def _archive_key(passphrase: str, salt: bytes, params: dict) -> bytes:
+    keys = unlock.derive_unlock_keys(passphrase, salt, params)
+    try:
+        return keys.subkey(unlock.EXPORT_KEY_INFO)
+    finally:
+        keys.wipe()
+
+
+def _chunk_aad(header: bytes, index: int, flags: int) -> bytes:
+    return header + struct.pack('>QB', index, flags)
+
+
+def _read_header(f):
+    """Parse and return (header bytes, suite, format id, salt, params)"""
+    fixed = f.read(HEADER.size)
+    if len(fixed) < HEADER.size:
+        raise ValueError("Not an SPM archive (file too short)")
+    magic, version, suite_id, fmt, salt, params_length = HEADER.unpack(fixed)
+    if magic != MAGIC:
+        raise ValueError("Not an SPM archive")
+    if version != ARCHIVE_VERSION:
+        raise ValueError(f"Unsupported archive version {version}")
+    if fmt not in FORMATS.values():
+        raise ValueError(f"Unsupported archive format {fmt}")
+    params_json = f.read(params_length)
+    if len(params_json) < params_length:
+        raise ValueError("Archive header is truncated")
+    return fixed + params_json, cipher_suites.get_suite(suite_id), fmt, salt, json.loads(params_json)
+
+
+def _read_chunks(f):
+    """Yield (offset, index, flags, nonce, ciphertext) for each complete chunk; stops at a torn tail"""
+    index = 0
+    while True:
+        offset = f.tell()
+        prefix = f.read(CHUNK.size)
+        if len(prefix) < CHUNK.size:
+            return
+        length, flags = CHUNK.unpack(prefix)
+        body = f.read(NONCE_LENGTH + length)
+        if len(body) < NONCE_LENGTH + length:
+            return
+        yield offset, index, flags, body[:NONCE_LENGTH], body[NONCE_LENGTH:]
+        index += 1
+
+
+def _encode_rows(rows, fmt: int, with_header: bool) -> bytes:
+    if fmt == FORMAT_JSONL:
+        return b''.join(json.dumps(row, separators=(',', ':')).encode() + b'\n' for row in rows)
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=COLUMNS, lineterminator='\n')
+    if with_header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue().encode()
+
+
+def _decode_rows(plaintext: bytes, fmt: int) -> list:
+    text = plaintext.decode()
+    if fmt == FORMAT_JSONL:
+        return [json.loads(line) for line in text.splitlines() if line]
+    reader = csv.reader(io.StringIO(text))
+    rows = [row for row in reader if row and row != list(COLUMNS)]
+    return [dict(zip(COLUMNS, row)) for row in rows]
+
+
+class VaultExporter:
+    """Write an unlocked PasswordVault to an encrypted, resumable archive"""
+
+    def __init__(self, vault, rows_per_chunk: int = ROWS_PER_CHUNK):
+        self.vault = vault
+        self.rows_per_chunk = max(rows_per_chunk, 1)
+
+    def _pages(self, after_id: int):
+        """Keyset pages of decrypted rows with id > after_id, one page in memory at a time"""
+        cursor = self.vault.conn.cursor()
+        while True:
+            cursor.execute('''
+                SELECT id, title, username, encrypted_password, website, icon, notes,
+                       category, favorite, deleted, created_at, updated_at
+                FROM vault WHERE id > ? ORDER BY id LIMIT ?
+            ''', (after_id, self.rows_per_chunk))
+            page = cursor.fetchall()
+            if not page:
+                return
+            passwords = self.vault.cipher.decrypt_many(row[3] for row in page)
+            rows = []
+            for row, password in zip(page, passwords):
+                if password.error is not None:
+                    raise Exception(f"Failed to decrypt entry '{row[1]}': {str(password.error)}")
+                rows.append({
+                    'id': row[0], 'title': row[1], 'username': row[2], 'password': password.value,
+                    'website': row[4], 'icon': base64.b64encode(row[5]).decode('ascii') if row[5] else None,
+                    'notes': row[6], 'category': row[7], 'favorite': int(bool(row[8])),
+                    'deleted': int(bool(row[9])), 'created_at': row[10], 'updated_at': row[11],
+                })
+            yield rows
+            after_id = page[-1][0]
+
+    def _resume_point(self, f, passphrase: str):
+        """
+        Read an interrupted archive: (header, suite, fmt, key, next index, last id, complete).
+
+        Returns None if no chunk was sealed yet: with nothing to decrypt the
+        passphrase can't be checked, so the caller starts the archive over.
+        """
+        header, suite, fmt, salt, params = _read_header(f)
+        last = None
+        end = f.tell()
+        for offset, index, flags, nonce, ciphertext in _read_chunks(f):
+            last = (index, flags, nonce, ciphertext)
+            end = f.tell()
+        # Drop a chunk that was only partly written
+        f.seek(end)
+        f.truncate()
+        if last is None:
+            return None
+        key = _archive_key(passphrase, salt, params)
+        index, flags, nonce, ciphertext = last
+        try:
+            plaintext = suite.new(key).decrypt(nonce, ciphertext, _chunk_aad(header, index, flags))
+        except Exception as e:
+            raise ValueError("Wrong passphrase or corrupted archive") from e
+        rows = _decode_rows(plaintext, fmt)
+        last_id = int(rows[-1]['id']) if rows else 0
+        return header, suite, fmt, key, index + 1, last_id, bool(flags & FINAL_FLAG)
+
+    def export(self, path: str, passphrase: str, fmt: str = 'jsonl', resume: bool = False,
+               progress=None) -> dict:
+        """
+        Stream every vault row (trash included) into an encrypted archive.
+
+        Args:
+            path (str): Archive file to write
+            passphrase (str): Protects the archive; needed again to import it
+            fmt (str): 'jsonl' or 'csv' for the rows inside the chunks
+            resume (bool): Continue an interrupted export at path instead of starting over
+            progress (callable, optional): Called with the running row count after each chunk
+
+        Returns:
+            dict: 'rows' written by this call, 'chunks' and 'resumed'
+        """
+        if not getattr(self.vault, 'cipher', None):
+            raise Exception("Encryption not initialized. Please login first.")
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format {fmt}; expected jsonl or csv")
+
+        resumed = resume and os.path.exists(path) and os.path.getsize(path) > 0
+        f = open(path, 'r+b' if resumed else 'wb')
+        try:
+            point = self._resume_point(f, passphrase) if resumed else None
+            if point is not None:
+                header, suite, fmt_id, key, index, last_id, complete = point
+                if complete:
+                    return {'rows': 0, 'chunks': index, 'resumed': True}
+            else:
+                # A fresh archive, or one interrupted before its first chunk
+                resumed = False
+                f.seek(0)
+                f.truncate()
+                suite = self.vault.cipher.suite
+                fmt_id = FORMATS[fmt]
+                salt = unlock.new_salt()
+                params = unlock.load_params(self.vault.get_setting(unlock.UNLOCK_PARAMS_SETTING))
+                params_json = json.dumps(params, sort_keys=True).encode()
+                header = HEADER.pack(MAGIC, ARCHIVE_VERSION, suite.suite_id, fmt_id, salt, len(params_json)) + params_json
+                key = _archive_key(passphrase, salt, params)
+                f.write(header)
+                index, last_id = 0, 0
+            cipher = suite.new(key)
+
+            def write_chunk(plaintext: bytes, flags: int):
+                nonce = os.urandom(NONCE_LENGTH)
+                ciphertext = cipher.encrypt(nonce, plaintext, _chunk_aad(header, index, flags))
+                f.write(CHUNK.pack(len(ciphertext), flags) + nonce + ciphertext)
+                # Each chunk is durable before the next, so an interrupted export can resume
+                f.flush()
+                os.fsync(f.fileno())
+
+            written = 0
+            for rows in self._pages(last_id):
+                write_chunk(_encode_rows(rows, fmt_id, with_header=index == 0), 0)
+                index += 1
+                written += len(rows)
+                if progress:
+                    progress(written)
+            write_chunk(b'', FINAL_FLAG)
+            return {'rows': written, 'chunks': index + 1, 'resumed': bool(resumed)}
+        finally:
+            f.close()
+
+
+def read_archive(path: str, passphrase: str):
+    """
+    Stream the rows of an archive as add_entry-style dicts.
+
+    Raises ValueError on a wrong passphrase, a tampered chunk, or an archive
+    that ends without its final chunk (after yielding the rows before it).
+    """
+    with open(path, 'rb') as f:
+        header, suite, fmt, salt, params = _read_header(f)
+        cipher = suite.new(_archive_key(passphrase, salt, params))
+        finished = False
+        for offset, index, flags, nonce, ciphertext in _read_chunks(f):
+            if finished:
+                raise ValueError("Archive has data after its final chunk")
+            try:
+                plaintext = cipher.decrypt(nonce, ciphertext, _chunk_aad(header, index, flags))
+            except Exception as e:
+                raise ValueError(f"Wrong passphrase or corrupted archive (chunk {index})") from e
+            for row in _decode_rows(plaintext, fmt):
+                yield {
+                    'title': row['title'],
+                    'username': row['username'] or '',
+                    'password': row['password'] or '',
+                    'website': row['website'] or None,
+                    'icon': base64.b64decode(row['icon']) if row['icon'] else None,
+                    'notes': row['notes'] or None,
+                    'category': row['category'] or None,
+                    'favorite': int(row['favorite'] or 0),
+                    'deleted': int(row['deleted'] or 0),
+                }
+            finished = bool(flags & FINAL_FLAG)
+        if not finished:
+            raise ValueError("Archive is truncated (no final chunk)")
+
+
+def import_archive(vault, path: str, passphrase: str, on_duplicate: str = 'skip', progress=None) -> dict:
+    """Import an archive written by VaultExporter; see VaultImporter.import_rows for the report"""
+    report = VaultImporter(vault, on_duplicate).import_rows(read_archive(path, passphrase), progress=progress)
+    report['format'] = 'spm-archive'
+    return report
+
+
+def main():
+    from src.core.database import PasswordVault
+
+    parser = argparse.ArgumentParser(description="Export a vault to an encrypted archive, or import one")
+    parser.add_argument('action', choices=('export', 'import'))
+    parser.add_argument('vault', help="Path to vault.db")
+    parser.add_argument('archive', help="Archive file")
+    parser.add_argument('--format', choices=tuple(FORMATS), default='jsonl', help="Row format inside the archive")
+    parser.add_argument('--resume', action='store_true', help="Continue an interrupted export")
+    parser.add_argument('--on-duplicate', choices=('skip', 'rename'), default='skip')
+    parser.add_argument('--password-stdin', action='store_true',
+                        help="Read the master password and the archive passphrase from stdin, one per line")
+    args = parser.parse_args()
+
+    def ask(prompt):
+        return sys.stdin.readline().rstrip('\n') if args.password_stdin else getpass.getpass(prompt)
+
+    vault = PasswordVault(args.vault)
+    vault.initialize_database()
+    account = vault.conn.execute('SELECT username FROM master_account').fetchone()
+    if not account:
+        sys.exit("Vault has no master account; create one in the app first")
+    if not vault.login(account[0], ask("Master password: ")):
+        sys.exit("Invalid master password")
+    passphrase = ask("Archive passphrase: ")
+
+    def progress(count):
+        print(f"\r{count} rows", end='', file=sys.stderr)
+
+    if args.action == 'export':
+        report = VaultExporter(vault).export(args.archive, passphrase, args.format, args.resume, progress)
+        print(file=sys.stderr)
+        print(f"Exported {report['rows']} rows in {report['chunks']} chunks"
+              f"{' (resumed)' if report['resumed'] else ''}")
+    else:
+        report = import_archive(vault, args.archive, passphrase, args.on_duplicate, progress)
+        print(file=sys.stderr)
+        print(f"Imported {report['imported']} of {report['rows']} rows "
+              f"({report['duplicates']} duplicates skipped, {report['renamed']} renamed) "
+              f"in {report['seconds']:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+import time
+import numpy as np
+
+
+class FuzzyMatcher:
+    """
+    fzf-style fuzzy matcher over a snapshot of the vault list.
+
+    Each entry's "title, username, website" is packed into one row of a
+    (entries x COLUMNS) uint16 character matrix, next to per-character
+    boundary bonuses and a 64-bit bag of the characters it contains; for
+    each character typed, a uint64 per entry marks the columns holding it.
+    A query is scored against all candidates at once with NumPy: the bag test
+    drops entries missing a query character, a forward and a backward pass
+    over the column masks find the tightest subsequence match, and the score
+    adds word-boundary and consecutive-character bonuses minus gap penalties.
+    When few entries match and none verbatim, an edit distance (with
+    transpositions) against the start of each entry catches typos such as
+    "gihtub".
+
+    Favorites and recently used entries get a boost; the list filter is
+    applied on the packed flags, so no SQL runs while matching. upsert,
+    remove and touch patch single entries, so a snapshot can follow the
+    vault's change events instead of being rebuilt.
+    """
+
+    # Characters of "title, username, website" kept per entry
+    COLUMNS = 48
+    # Characters the typo fallback aligns against (title and the start of username)
+    TYPO_COLUMNS = 32
+    SEPARATOR = '\x1f'
+
+    SCORE_MATCH = 16
+    SCORE_GAP_START = -3
+    SCORE_GAP_EXTENSION = -1
+    BONUS_BOUNDARY = 8
+    BONUS_CAMEL = 7
+    BONUS_CONSECUTIVE = 4
+    # Whole match inside the title
+    BONUS_TITLE = 16
+    BONUS_FAVORITE = 16
+    # Boost for an entry used just now; halves every RECENT_HALF_LIFE seconds
+    BONUS_RECENT = 24
+    RECENT_HALF_LIFE = 7 * 24 * 3600
+
+    # Shortest query the typo fallback runs for, and the hit count below which it runs
+    MIN_TYPO_QUERY = 3
+    TYPO_FALLBACK_HITS = 20
+    # Distinct query characters whose position masks stay cached
+    MASK_CACHE_CHARS = 64
+    # Keeps (SORT_OFFSET - score) positive in the sort key
+    SORT_OFFSET = 1 << 20
+    # Per-entry arrays, in the order _pack returns them
+    _ROW_ARRAYS = ('_ids', '_text', '_bonus', '_bags', '_title_len', '_category', '_favorite',
+                   '_deleted', '_last_used')
+
+    def __init__(self, rows):
+        """
+        Args:
+            rows: Iterable of (id, title, username, website, category, favorite,
+                deleted, last_used) where last_used is epoch seconds or None;
+                row order breaks ties, so pass them ordered by title
+        """
+        rows = list(rows)
+        self._categories = {}
+        self._char_masks = {}
+        for name, values in zip(self._ROW_ARRAYS, self._pack(rows)):
+            setattr(self, name, values)
+        self._id_order = np.argsort(self._ids, kind='stable')
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _pack(self, rows: list) -> tuple:
+        """The _ROW_ARRAYS values for rows, registering any new category"""
+        count = len(rows)
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+
+        texts = [self.SEPARATOR.join((row[1] or '', row[2] or '', row[3] or '')) for row in rows]
+        width = f'<U{self.COLUMNS}'
+        # Fixed-width unicode arrays truncate to COLUMNS and pad with NUL
+        original = np.array(texts, dtype=width).view(np.uint32).reshape(count, self.COLUMNS)
+        lowered = np.array([text.lower() for text in texts], dtype=width).view(np.uint32).reshape(count, self.COLUMNS)
+        text = np.minimum(lowered, 0xFFFF).astype(np.uint16)
+        bonus = self._boundary_bonus(original)
+        bags = np.bitwise_or.reduce(self._bag_bits(text), axis=1) if count else np.zeros(0, np.uint64)
+
+        separator = text == ord(self.SEPARATOR)
+        title_len = np.where(separator.any(axis=1), separator.argmax(axis=1), self.COLUMNS)
+
+        for row in rows:
+            if row[4] is not None:
+                self._categories.setdefault(row[4], len(self._categories))
+        category = np.array([self._categories.get(row[4], -1) for row in rows], dtype=np.int32)
+        favorite = np.array([bool(row[5]) for row in rows], dtype=bool)
+        deleted = np.array([bool(row[6]) for row in rows], dtype=bool)
+        last_used = np.array([row[7] or 0 for row in rows], dtype=np.float64)
+        return ids, text, bonus, bags, title_len, category, favorite, deleted, last_used
+
+    @classmethod
+    def _boundary_bonus(cls, codes: np.ndarray) -> np.ndarray:
+        """Bonus for a match at each character: word starts and camelCase/letter-digit humps"""
+        lower = (codes >= 97) & (codes <= 122)
+        upper = (codes >= 65) & (codes <= 90)
+        digit = (codes >= 48) & (codes <= 57)
+        word = lower | upper | digit | (codes >= 128)
+
+        def previous(mask):
+            shifted = np.zeros_like(mask)
+            shifted[:, 1:] = mask[:, :-1]
+            return shifted
+
+        prev_lower, prev_upper, prev_word = previous(lower), previous(upper), previous(word)
+        bonus = np.where(word & ~prev_word, cls.BONUS_BOUNDARY, 0)
+        bonus = np.where((upper & prev_lower) | (digit & (prev_lower | prev_upper)), cls.BONUS_CAMEL, bonus)
+        return bonus.astype(np.int8)
+
+    @staticmethod
+    def _bag_bits(codes: np.ndarray) -> np.ndarray:
+        """One bit per character: a-z and 0-9 get their own, everything else shares 28"""
+        codes = codes.astype(np.int64)
+        letter = (codes >= 97) & (codes <= 122)
+        digit = (codes >= 48) & (codes <= 57)
+        bits = np.where(letter, codes - 97, np.where(digit, codes - 48 + 26, 36 + codes % 28))
+        return np.where(codes != 0, np.left_shift(np.uint64(1), bits.astype(np.uint64)), np.uint64(0))
+
+    def _filter_mask(self, filter_type: str = None, category: str = None) -> np.ndarray:
+        """Same conditions as SearchQuery.for_filter, on the packed flags"""
+        if filter_type == "favorites":
+            return self._favorite & ~self._deleted
+        if filter_type == "trash":
+            return self._deleted.copy()
+        if category:
+            code = self._categories.get(category)
+            if code is None:
+                return np.zeros(len(self._ids), dtype=bool)
+            return (self._category == code) & ~self._deleted
+        return ~self._deleted
+
+    def _position(self, row_id: int):
+        """Row of an entry id, None if the snapshot doesn't hold it"""
+        position = np.searchsorted(self._ids, row_id, sorter=self._id_order)
+        if position < len(self._ids) and self._ids[self._id_order[position]] == row_id:
+            return self._id_order[position]
+        return None
+
+    def _id_mask(self, ids) -> np.ndarray:
+        """True for the entries whose id is in ids"""
+        # Sorted lookups walk _id_order in step, which is much faster for thousands of ids
+        ids = np.sort(np.asarray(ids, dtype=np.int64))
+        mask = np.zeros(len(self._ids), dtype=bool)
+        if not len(ids) or not len(self._ids):
+            return mask
+        positions = np.minimum(np.searchsorted(self._ids, ids, sorter=self._id_order), len(self._ids) - 1)
+        rows = self._id_order[positions]
+        mask[rows[self._ids[rows] == ids]] = True
+        return mask
+
+    def touch(self, row_id: int, when: float = None):
+        """Record that an entry was used (mirrors PasswordVault.mark_used)"""
+        position = self._position(row_id)
+        if position is not None:
+            self._last_used[position] = time.time() if when is None else when
+
+    def upsert(self, row):
+        """
+        Add an entry or replace one in place, as a rebuild would see it.
+
+        Args:
+            row: (id, title, username, website, category, favorite, deleted,
+                last_used) as in __init__; a replaced entry keeps its last use
+                when last_used is None. New entries go after the others, so they
+                lose ties until the next rebuild.
+        """
+        position = self._position(row[0])
+        packed = self._pack([row])
+        if position is not None:
+            for name, values in zip(self._ROW_ARRAYS, packed):
+                if name != '_last_used' or row[7] is not None:
+                    getattr(self, name)[position] = values[0]
+            for char, masks in self._char_masks.items():
+                masks[position] = self._masks_of(packed[1], char)[0]
+            return
+        for name, values in zip(self._ROW_ARRAYS, packed):
+            setattr(self, name, np.concatenate([getattr(self, name), values]))
+        for char, masks in self._char_masks.items():
+            self._char_masks[char] = np.concatenate([masks, self._masks_of(packed[1], char)])
+        self._id_order = np.argsort(self._ids, kind='stable')
+
+    def remove(self, row_id: int):
+        """Drop an entry (no-op if the snapshot doesn't hold it)"""
+        position = self._position(row_id)
+        if position is None:
+            return
+        for name in self._ROW_ARRAYS:
+            setattr(self, name, np.delete(getattr(self, name), position, axis=0))
+        for char, masks in self._char_masks.items():
+            self._char_masks[char] = np.delete(masks, position)
+        self._id_order = np.argsort(self._ids, kind='stable')
+
+    @staticmethod
+    def _masks_of(text: np.ndarray, char: int) -> np.ndarray:
+        """Per row of text, a bit for every column holding char"""
+        packed = np.packbits(text == char, axis=1, bitorder='little')
+        words = np.zeros((len(text), 8), dtype=np.uint8)
+        words[:, :packed.shape[1]] = packed
+        return words.view('<u8').ravel()
+
+    def _char_mask(self, char: int) -> np.ndarray:
+        """Per entry, a bit for every column holding char (computed on first use, then cached)"""
+        masks = self._char_masks.get(char)
+        if masks is None:
+            if len(self._char_masks) >= self.MASK_CACHE_CHARS:
+                self._char_masks.clear()
+            masks = self._char_masks[char] = self._masks_of(self._text, char)
+        return masks
+
+    @staticmethod
+    def _bit_index(bits: np.ndarray) -> np.ndarray:
+        """Index of the highest set bit (exact, since masks stay below 2**53)"""
+        return np.frexp(bits.astype(np.float64))[1] - 1
+
+    def _subsequence(self, rows: np.ndarray, needle: np.ndarray) -> tuple:
+        """Rows that contain needle as a subsequence, their scores, and which contain it verbatim"""
+        one = np.uint64(1)
+
+        # Forward: earliest end of a match
+        position = np.full(len(rows), -1, dtype=np.int64)
+        for char in needle:
+            above = self._char_mask(char)[rows] & ~((one << (position + 1).astype(np.uint64)) - one)
+            found = above != 0
+            if not found.all():
+                rows, above = rows[found], above[found]
+            # Isolate the lowest set bit
+            position = self._bit_index(above & (~above + one))
+            if not len(rows):
+                return rows, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+
+        # Backward from that end: latest start, so the match window is as tight as possible
+        positions = [position]
+        for char in needle[-2::-1]:
+            below = self._char_mask(char)[rows] & ((one << position.astype(np.uint64)) - one)
+            position = self._bit_index(below)
+            positions.append(position)
+        positions = np.stack(positions[::-1], axis=1)
+
+        bonus = self._bonus[rows[:, None], positions].astype(np.int64)
+        # The first character's bonus counts double, as in fzf
+        score = self.SCORE_MATCH * len(needle) + bonus.sum(axis=1) + bonus[:, 0]
+        if len(needle) > 1:
+            gaps = np.diff(positions, axis=1) - 1
+            score += np.where(gaps > 0, self.SCORE_GAP_START + self.SCORE_GAP_EXTENSION * (gaps - 1),
+                              self.BONUS_CONSECUTIVE).sum(axis=1)
+        score += np.where(positions[:, -1] < self._title_len[rows], self.BONUS_TITLE, 0)
+        return rows, score, positions[:, -1] - positions[:, 0] == len(needle) - 1
+
+    @staticmethod
+    def _max_typos(length: int) -> int:
+        """Edits the typo fallback allows: one, plus one per further 12 characters"""
+        return 1 + length // 12
+
+    def _typos(self, rows: np.ndarray, needle: np.ndarray, max_typos: int) -> tuple:
+        """Rows where needle is within max_typos edits of some substring, and those distances"""
+        # Every query character missing from an entry costs at least one edit
+        bags = self._bags[rows]
+        missing = np.zeros(len(rows), dtype=np.int64)
+        for char in np.unique(needle):
+            bit = self._bag_bits(np.array([[char]]))[0, 0]
+            missing += (bags & bit) == 0
+        rows = rows[missing <= max_typos]
+
+        # An edit (a transposition included) breaks at most three of the query's bigrams
+        masks = {char: self._char_mask(char)[rows] for char in np.unique(needle)}
+        shared = np.zeros(len(rows), dtype=np.int64)
+        for first, second in zip(needle[:-1], needle[1:]):
+            shared += ((masks[first] << np.uint64(1)) & masks[second]) != 0
+        rows = rows[shared >= len(needle) - 1 - 3 * max_typos]
+        if not len(rows):
+            return rows, np.zeros(0, dtype=np.int64)
+
+        # Optimal string alignment distance, free to start and end anywhere in the text.
+        # Insertions along a row are folded in with a cumulative minimum instead of a loop.
+        text = self._text[rows, :self.TYPO_COLUMNS]
+        offsets = np.arange(self.TYPO_COLUMNS + 1, dtype=np.int16)
+        before = None
+        current = np.zeros((len(rows), self.TYPO_COLUMNS + 1), dtype=np.int16)
+        for i, char in enumerate(needle, start=1):
+            candidate = np.empty_like(current)
+            candidate[:, 0] = i
+            candidate[:, 1:] = np.minimum(current[:, :-1] + (text != char), current[:, 1:] + 1)
+            if before is not None:
+                swapped = (text[:, :-1] == char) & (text[:, 1:] == needle[i - 2])
+                candidate[:, 2:] = np.where(swapped, np.minimum(candidate[:, 2:], before[:, :-2] + 1),
+                                            candidate[:, 2:])
+            before, current = current, np.minimum.accumulate(candidate - offsets, axis=1) + offsets
+        distance = current.min(axis=1).astype(np.int64)
+        close = distance <= max_typos
+        return rows[close], distance[close]
+
+    def match(self, query: str, filter_type: str = None, category: str = None,
+              limit: int = None, now: float = None, candidates=None) -> list:
+        """
+        Rank the entries matching query within a list filter.
+
+        Args:
+            query (str): Text typed in the search box
+            filter_type (str, optional): "favorites" or "trash"
+            category (str, optional): Only live entries in this category
+            limit (int, optional): Maximum ids to return
+            now (float, optional): Epoch seconds recency is measured from
+            candidates (optional): Ids to rank instead of every entry, e.g. a
+                TrigramIndex prefilter
+
+        Returns:
+            list: Row ids, best match first; subsequence matches rank above typo matches
+        """
+        needle = query.strip().lower()[:self.COLUMNS]
+        if not needle or not len(self._ids):
+            return []
+        needle = np.array([min(ord(char), 0xFFFF) for char in needle], dtype=np.uint16)
+
+        allowed = self._filter_mask(filter_type, category)
+        if candidates is not None:
+            allowed &= self._id_mask(candidates)
+        allowed = np.flatnonzero(allowed)
+        wanted = np.bitwise_or.reduce(self._bag_bits(needle[None, :]), axis=1)[0]
+        rows, score, verbatim = self._subsequence(allowed[(self._bags[allowed] & wanted) == wanted], needle)
+        tier = np.zeros(len(rows), dtype=np.int64)
+
+        # Look for typos only when the query matched few entries and none of them verbatim
+        if (len(needle) >= self.MIN_TYPO_QUERY and len(rows) < self.TYPO_FALLBACK_HITS
+                and not verbatim.any()):
+            matched = np.zeros(len(self._ids), dtype=bool)
+            matched[rows] = True
+            typo_rows, distance = self._typos(allowed[~matched[allowed]], needle, self._max_typos(len(needle)))
+            rows = np.concatenate([rows, typo_rows])
+            score = np.concatenate([score, -self.SCORE_MATCH * distance])
+            tier = np.concatenate([tier, np.ones(len(typo_rows), dtype=np.int64)])
+
+        now = time.time() if now is None else now
+        last_used = self._last_used[rows]
+        age = np.maximum(now - last_used, 0) / self.RECENT_HALF_LIFE
+        boost = np.where(last_used > 0, self.BONUS_RECENT * np.exp2(-age), 0.0)
+        boost += np.where(self._favorite[rows], self.BONUS_FAVORITE, 0)
+        total = score + np.rint(boost).astype(np.int64)
+
+        # One integer key: tier, then boosted score, then shorter title; the stable
+        # sort keeps title order (rows ascend within each tier) for the rest
+        key = (tier << 32) | ((self.SORT_OFFSET - total) << 8) | self._title_len[rows]
+        order = np.argsort(key, kind='stable')
+        if limit:
+            order = order[:limit]
+        return self._ids[rows[order]].tolist()
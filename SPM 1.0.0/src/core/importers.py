@@ -0,0 +1,444 @@
+"""
+Streaming import of exports from other password managers.
+
+Supported: Chrome and Firefox CSV, Bitwarden JSON (unencrypted) and KeePass
+2.x XML. Files are parsed incrementally on a background thread and handed to
+PasswordVault.add_entries in chunks, so memory stays flat however large the
+export is. Duplicate titles are found through the unique title index.
+
+Headless use (from the "SPM 1.0.0" directory):
+    python -m src.core.importers path/to/vault.db export.csv [--format chrome]
+"""
+from collections import deque
+from urllib.parse import urlparse
+import argparse
+import csv
+import getpass
+import itertools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+# Category color for categories created by an import (same as AddCategoryDialog)
+DEFAULT_CATEGORY_COLOR = '#FFD700'
+
+# Parsed chunks buffered between the parser thread and the vault
+QUEUE_CHUNKS = 4
+
+# SQLite host parameter limit is 999 on older builds
+MAX_SQL_VARIABLES = 900
+
+FORMATS = ('chrome', 'firefox', 'csv', 'bitwarden', 'keepass')
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _hostname(url: str) -> str:
+    if not url:
+        return ''
+    parsed = urlparse(url if '://' in url else f'//{url}')
+    host = parsed.hostname or ''
+    return host[4:] if host.startswith('www.') else host
+
+
+def _entry(title=None, username=None, password=None, website=None, notes=None,
+           category=None, favorite=False) -> dict:
+    """Normalize one parsed credential into add_entry columns"""
+    title = (title or '').strip() or _hostname(website) or (username or '').strip() or "Imported entry"
+    return {
+        'title': title,
+        'username': username or '',
+        'password': password or '',
+        'website': website or None,
+        'notes': notes or None,
+        'category': (category or '').strip() or None,
+        'favorite': 1 if favorite else 0,
+    }
+
+
+def parse_csv(path: str):
+    """
+    Chrome (name,url,username,password[,note]) or Firefox
+    (url,username,password,httpRealm,...) CSV, told apart by the header.
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        fields = {name.lower() for name in reader.fieldnames or ()}
+        if not {'url', 'username', 'password'} <= fields:
+            raise ValueError("Unrecognized CSV export: expected url, username and password columns")
+        for row in reader:
+            row = {key.lower(): value for key, value in row.items() if key}
+            yield _entry(
+                title=row.get('name') or row.get('title'),
+                username=row.get('username'),
+                password=row.get('password'),
+                website=row.get('url'),
+                notes=row.get('note') or row.get('notes'),
+            )
+
+
+class _JsonObjectStream:
+    """
+    Walk a top-level JSON object without loading the file.
+
+    Yields (key, value) pairs; array values are yielded one element at a time
+    as (key, element), so only one element is held in memory.
+    """
+
+    def __init__(self, f, read_size: int = 1 << 16):
+        self.f = f
+        self.read_size = read_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        data = self.f.read(self.read_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf += data
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char: str) -> str:
+        found = self._peek()
+        if found not in char:
+            raise ValueError(f"Malformed JSON: expected {char!r}, found {found!r}")
+        self.pos += 1
+        return found
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                value, end = None, None
+            # A value ending exactly at the buffer end may be cut short (e.g. a number)
+            if end is not None and (end < len(self.buf) or self.eof):
+                self.pos = end
+                return value
+            if not self._fill():
+                if end is None:
+                    raise ValueError("Malformed or truncated JSON")
+                self.pos = end
+                return value
+
+    def __iter__(self):
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            if self._peek() == '[':
+                self.pos += 1
+                if self._peek() == ']':
+                    self.pos += 1
+                else:
+                    while True:
+                        yield key, self._value()
+                        if self._expect(',]') == ']':
+                            break
+            else:
+                yield key, self._value()
+            if self._expect(',}') == '}':
+                return
+
+
+def parse_bitwarden_json(path: str):
+    """
+    Unencrypted Bitwarden JSON export. Login items are imported; folders map to
+    categories (Bitwarden writes "folders" before "items").
+    """
+    folders = {}
+    with open(path, encoding='utf-8-sig') as f:
+        for key, value in _JsonObjectStream(f):
+            if key == 'encrypted' and value:
+                raise ValueError("Encrypted Bitwarden exports are not supported; export as unencrypted JSON")
+            if key == 'folders' and isinstance(value, dict):
+                folders[value.get('id')] = value.get('name')
+            elif key == 'items' and isinstance(value, dict):
+                login = value.get('login')
+                if value.get('type') != 1 or not isinstance(login, dict):
+                    continue
+                uris = login.get('uris') or []
+                yield _entry(
+                    title=value.get('name'),
+                    username=login.get('username'),
+                    password=login.get('password'),
+                    website=uris[0].get('uri') if uris and isinstance(uris[0], dict) else None,
+                    notes=value.get('notes'),
+                    category=folders.get(value.get('folderId')),
+                    favorite=value.get('favorite'),
+                )
+
+
+def parse_keepass_xml(path: str):
+    """
+    KeePass 2.x XML export. The innermost group names the category; entries of
+    the root group get none and <History> snapshots are skipped.
+    """
+    stack = []
+    groups = []
+    for event, elem in ET.iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            if elem.tag == 'Group':
+                groups.append(None)
+            continue
+
+        stack.pop()
+        parent = stack[-1] if stack else None
+        if elem.tag == 'Name' and parent is not None and parent.tag == 'Group':
+            groups[-1] = elem.text
+        elif elem.tag == 'Entry' and not any(node.tag == 'History' for node in stack):
+            fields = {}
+            for string in elem.findall('String'):
+                fields[string.findtext('Key')] = string.findtext('Value')
+            yield _entry(
+                title=fields.get('Title'),
+                username=fields.get('UserName'),
+                password=fields.get('Password'),
+                website=fields.get('URL'),
+                notes=fields.get('Notes'),
+                category=groups[-1] if len(groups) > 1 else None,
+            )
+        elif elem.tag == 'Group':
+            groups.pop()
+
+        # Drop finished subtrees so the parsed tree never grows
+        if elem.tag in ('Entry', 'Group') and parent is not None:
+            elem.clear()
+            parent.remove(elem)
+
+
+PARSERS = {
+    'chrome': parse_csv,
+    'firefox': parse_csv,
+    'csv': parse_csv,
+    'bitwarden': parse_bitwarden_json,
+    'keepass': parse_keepass_xml,
+}
+
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    formats = {'.csv': 'csv', '.json': 'bitwarden', '.xml': 'keepass'}
+    if extension not in formats:
+        raise ValueError(f"Cannot tell the export format of {path}; pass it explicitly")
+    return formats[extension]
+
+
+def _threaded(iterable, chunk_size: int):
+    """Run a parser on its own thread, handing rows over through a bounded queue"""
+    handoff = queue.Queue(QUEUE_CHUNKS)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                handoff.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for chunk in _chunks(iterable, chunk_size):
+                if not put(chunk):
+                    return
+            put(done)
+        except Exception as e:
+            put(e)
+
+    threading.Thread(target=produce, name="import-parser", daemon=True).start()
+    try:
+        while True:
+            item = handoff.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield from item
+    finally:
+        stop.set()
+
+
+class VaultImporter:
+    """Stream parsed credentials into an unlocked PasswordVault"""
+
+    def __init__(self, vault, on_duplicate: str = 'skip', chunk_size: int = 1000):
+        """
+        Args:
+            vault (PasswordVault): Unlocked vault (its cipher is used for the passwords)
+            on_duplicate (str): 'skip' rows whose title exists, or 'rename' them "title (2)"
+            chunk_size (int): Rows per parse hand-off, duplicate lookup and insert batch
+        """
+        if on_duplicate not in ('skip', 'rename'):
+            raise ValueError("on_duplicate must be 'skip' or 'rename'")
+        self.vault = vault
+        self.on_duplicate = on_duplicate
+        self.chunk_size = max(chunk_size, 1)
+
+    def _existing_titles(self, titles) -> set:
+        """Titles already in the vault, looked up through the unique title index"""
+        found = set()
+        cursor = self.vault.conn.cursor()
+        titles = list(titles)
+        for start in range(0, len(titles), MAX_SQL_VARIABLES):
+            batch = titles[start:start + MAX_SQL_VARIABLES]
+            cursor.execute(f'SELECT title FROM vault WHERE title IN ({", ".join("?" for _ in batch)})', batch)
+            found.update(row[0] for row in cursor.fetchall())
+        return found
+
+    def _free_title(self, title: str, taken: set) -> str:
+        for n in itertools.count(2):
+            candidate = f"{title} ({n})"
+            if candidate not in taken and not self._existing_titles([candidate]):
+                return candidate
+
+    def _new_rows(self, rows, report: dict):
+        """Drop or rename duplicates and create missing categories, one chunk at a time"""
+        cursor = self.vault.conn.cursor()
+        cursor.execute('SELECT category_names FROM categories')
+        categories = {row[0] for row in cursor.fetchall()}
+        # add_entries inserts in chunks, so up to chunk_size yielded titles may not be in the table yet
+        recent = deque()
+        pending = set()
+        for chunk in _chunks(rows, self.chunk_size):
+            report['rows'] += len(chunk)
+            taken = self._existing_titles({row['title'] for row in chunk})
+            for row in chunk:
+                if row['title'] in taken or row['title'] in pending:
+                    if self.on_duplicate == 'skip':
+                        report['duplicates'] += 1
+                        continue
+                    row['title'] = self._free_title(row['title'], taken | pending)
+                    report['renamed'] += 1
+                taken.add(row['title'])
+                recent.append(row['title'])
+                pending.add(row['title'])
+                if len(recent) > self.chunk_size:
+                    pending.discard(recent.popleft())
+
+                category = row['category']
+                if category and category not in categories:
+                    # Same transaction as the rows, so a failed import leaves no categories behind
+                    cursor.execute('INSERT OR IGNORE INTO categories (category_names, color) VALUES (?, ?)',
+                                   (category, DEFAULT_CATEGORY_COLOR))
+                    categories.add(category)
+                    report['categories_created'] += 1
+                yield row
+
+    def import_rows(self, rows, progress=None) -> dict:
+        """
+        Import already-parsed entry dicts (see _entry).
+
+        Returns:
+            dict: 'rows' read, 'imported', 'duplicates' skipped, 'renamed',
+            'categories_created', 'seconds' and 'rows_per_sec'
+        """
+        report = {'rows': 0, 'imported': 0, 'duplicates': 0, 'renamed': 0, 'categories_created': 0}
+        start = time.perf_counter()
+        report['imported'] = self.vault.add_entries(
+            'vault', self._new_rows(_threaded(rows, self.chunk_size), report),
+            chunk_size=self.chunk_size, progress=progress)
+        report['seconds'] = time.perf_counter() - start
+        report['rows_per_sec'] = report['rows'] / report['seconds'] if report['seconds'] else 0.0
+        return report
+
+    def import_file(self, path: str, fmt: str = None, progress=None) -> dict:
+        """Parse an export file and import it; see import_rows for the report"""
+        fmt = fmt or detect_format(path)
+        if fmt not in PARSERS:
+            raise ValueError(f"Unknown import format {fmt}; expected one of {', '.join(FORMATS)}")
+        report = self.import_rows(PARSERS[fmt](path), progress=progress)
+        report['format'] = fmt
+        return report
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None where the resource module is missing"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def main():
+    from src.core.database import PasswordVault
+
+    parser = argparse.ArgumentParser(description="Import a password manager export into a vault")
+    parser.add_argument('vault', help="Path to vault.db")
+    parser.add_argument('export', help="Export file (.csv, .json or .xml)")
+    parser.add_argument('--format', choices=FORMATS, help="Export format (default: from the extension)")
+    parser.add_argument('--on-duplicate', choices=('skip', 'rename'), default='skip')
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--password-stdin', action='store_true', help="Read the master password from stdin")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Also report the Python heap peak (tracemalloc, slower)")
+    args = parser.parse_args()
+
+    vault = PasswordVault(args.vault)
+    vault.initialize_database()
+    account = vault.conn.execute('SELECT username FROM master_account').fetchone()
+    if not account:
+        sys.exit("Vault has no master account; create one in the app first")
+    password = sys.stdin.readline().rstrip('\n') if args.password_stdin else getpass.getpass("Master password: ")
+    if not vault.login(account[0], password):
+        sys.exit("Invalid master password")
+
+    if args.trace_memory:
+        tracemalloc.start()
+    report = VaultImporter(vault, args.on_duplicate, args.chunk_size).import_file(
+        args.export, args.format,
+        progress=lambda count: print(f"\r{count} rows imported", end='', file=sys.stderr))
+    print(file=sys.stderr)
+
+    print(f"Format:             {report['format']}")
+    print(f"Rows read:          {report['rows']}")
+    print(f"Imported:           {report['imported']}")
+    print(f"Duplicates skipped: {report['duplicates']}")
+    print(f"Renamed:            {report['renamed']}")
+    print(f"Categories created: {report['categories_created']}")
+    print(f"Time:               {report['seconds']:.2f} s ({report['rows_per_sec']:.0f} rows/s)")
+    if args.trace_memory:
+        print(f"Peak Python heap:   {tracemalloc.get_traced_memory()[1] / 2**20:.1f} MiB")
+        tracemalloc.stop()
+    peak = peak_rss_bytes()
+    if peak is not None:
+        print(f"Peak RSS:           {peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Vault schema migrations, tracked with PRAGMA user_version.
+
+Each migration moves the schema from version - 1 to version in the same
+transaction as the user_version bump, so a failed migration leaves the file
+at the previous version. Append new migrations; never edit a shipped one.
+"""
+import sqlite3
+
+
+def _create_tables(cursor):
+    """Base tables (IF NOT EXISTS, so vaults from before versioning pass through)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS master_account (
+            username TEXT PRIMARY KEY,
+            master_password TEXT NOT NULL,
+            salt TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS vault (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            username TEXT,
+            encrypted_password BLOB NOT NULL,
+            salt BLOB,
+            website TEXT,
+            icon BLOB,
+            notes TEXT,
+            category TEXT,
+            favorite BOOLEAN DEFAULT 0,
+            deleted BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            category_names TEXT NOT NULL UNIQUE,
+            color TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+    ''')
+
+
+def _add_list_indexes(cursor):
+    """Indexes matching the list filters, each ending in title for ORDER BY title"""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_vault_deleted_title ON vault (deleted, title)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_vault_deleted_favorite_title ON vault (deleted, favorite, title)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_vault_deleted_category_title ON vault (deleted, category, title)')
+
+
+def _unique_titles(cursor):
+    """Entries are addressed by title; rename old duplicates, then enforce uniqueness"""
+    cursor.execute('''
+        SELECT id, title FROM vault
+        WHERE title IN (SELECT title FROM vault GROUP BY title HAVING COUNT(*) > 1)
+        ORDER BY title, id
+    ''')
+    seen = set()
+    for row_id, title in cursor.fetchall():
+        if title not in seen:
+            # The oldest row keeps its title
+            seen.add(title)
+            continue
+        new_title = f"{title} ({row_id})"
+        print(f"Debug - Renaming duplicate entry '{title}' to '{new_title}'")
+        cursor.execute('UPDATE vault SET title = ? WHERE id = ?', (new_title, row_id))
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_vault_title ON vault (title)')
+
+
+# Shortest query the trigram tokenizer can match
+TRIGRAM_LENGTH = 3
+
+
+# Settings key holding why the search index could not be built, while search falls back to LIKE
+SEARCH_FALLBACK_SETTING = 'search_index_unavailable'
+
+
+def _add_search_index(cursor):
+    """
+    FTS5 trigram index over title, username and website, kept in sync by triggers.
+
+    External content: the index stores only trigrams and reads values from
+    vault. SQLite builds without FTS5 or the trigram tokenizer (before 3.34)
+    record the reason under SEARCH_FALLBACK_SETTING instead, PasswordVault.search
+    falls back to LIKE, and migrate() tries again on every later open until
+    the index exists.
+    """
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE vault_fts USING fts5(
+                title, username, website,
+                content='vault', content_rowid='id', tokenize='trigram'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        print(f"Debug - Full-text search unavailable, using LIKE search: {str(e)}")
+        cursor.execute('INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)',
+                       (SEARCH_FALLBACK_SETTING, str(e)))
+        return False
+    cursor.execute('''
+        CREATE TRIGGER vault_fts_insert AFTER INSERT ON vault BEGIN
+            INSERT INTO vault_fts (rowid, title, username, website)
+            VALUES (new.id, new.title, new.username, new.website);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER vault_fts_delete AFTER DELETE ON vault BEGIN
+            INSERT INTO vault_fts (vault_fts, rowid, title, username, website)
+            VALUES ('delete', old.id, old.title, old.username, old.website);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER vault_fts_update AFTER UPDATE OF title, username, website ON vault BEGIN
+            INSERT INTO vault_fts (vault_fts, rowid, title, username, website)
+            VALUES ('delete', old.id, old.title, old.username, old.website);
+            INSERT INTO vault_fts (rowid, title, username, website)
+            VALUES (new.id, new.title, new.username, new.website);
+        END
+    ''')
+    cursor.execute("INSERT INTO vault_fts (vault_fts) VALUES ('rebuild')")
+    cursor.execute('DELETE FROM settings WHERE key = ?', (SEARCH_FALLBACK_SETTING,))
+    return True
+
+
+def _retry_search_index(conn: sqlite3.Connection) -> bool:
+    """Build the search index an older SQLite could not (see _add_search_index); True if built now"""
+    exists = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'vault_fts'"
+    if conn.execute(exists).fetchone():
+        return False
+    cursor = conn.cursor()
+    try:
+        cursor.execute('BEGIN IMMEDIATE')
+        # Another connection may have built it while we waited for the lock
+        built = not cursor.execute(exists).fetchone() and _add_search_index(cursor)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"Debug - Retrying the full-text search index failed: {str(e)}")
+        return False
+    if built:
+        print("Debug - Built the full-text search index an older SQLite could not")
+    return built
+
+
+def _add_last_used(cursor):
+    """When each entry was last opened, for ranking recently used entries first"""
+    cursor.execute('ALTER TABLE vault ADD COLUMN last_used_at TIMESTAMP')
+
+
+# (version, description, migration); versions are consecutive from 1
+MIGRATIONS = [
+    (1, "base tables", _create_tables),
+    (2, "list filter indexes", _add_list_indexes),
+    (3, "unique entry titles", _unique_titles),
+    (4, "full-text search index", _add_search_index),
+    (5, "entry last used time", _add_last_used),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+SEARCH_INDEX_VERSION = 4
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> list:
+    """
+    Bring the schema up to SCHEMA_VERSION.
+
+    Returns:
+        list: Versions applied; empty when the schema was already current.
+            Includes SEARCH_INDEX_VERSION when a search index that fell back
+            to LIKE was built on this open.
+    """
+    current = schema_version(conn)
+    applied = []
+    if current >= SEARCH_INDEX_VERSION and _retry_search_index(conn):
+        applied.append(SEARCH_INDEX_VERSION)
+    if current >= SCHEMA_VERSION:
+        return applied
+
+    for version, description, migration in MIGRATIONS:
+        if version <= current:
+            continue
+        cursor = conn.cursor()
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            # Another connection may have migrated while we waited for the lock
+            if schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            migration(cursor)
+            # PRAGMA does not take parameters; version is an int from MIGRATIONS
+            cursor.execute(f'PRAGMA user_version = {int(version)}')
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise Exception(f"Schema migration {version} ({description}) failed: {str(e)}")
+        print(f"Debug - Applied schema migration {version}: {description}")
+        applied.append(version)
+    return applied
@@ -0,0 +1,167 @@
+from array import array
+import sys
+import threading
+import numpy as np
+
+
+class TrigramIndex:
+    """
+    In-memory trigram index over entry title, username, website and category.
+
+    Every entry gets a slot; its fields are kept lowercased and joined with NUL
+    in one string, and each trigram maps to an array('I') of the slots that
+    contain it (sorted, since slots only grow). candidates() intersects the
+    postings of a query's trigrams, so fuzzy_search can rank the entries
+    that contain the query instead of the whole vault, without touching
+    SQLite.
+
+    Updates append a new slot and tombstone the old one; the index compacts
+    itself once tombstones pass COMPACT_RATIO. Mutations that arrive while the
+    initial build runs are queued and replayed when it finishes.
+    """
+
+    GRAM_LENGTH = 3
+    COMPACT_RATIO = 0.25
+    SEPARATOR = '\0'
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}
+        self._ids = array('q')
+        self._texts = []
+        self._slots = {}
+        self._removed = 0
+        self._pending = []
+        self.ready = False
+
+    @classmethod
+    def _text(cls, title, username, website, category) -> str:
+        return cls.SEPARATOR.join((value or '').lower() for value in (title, username, website, category))
+
+    @classmethod
+    def _grams(cls, text: str) -> set:
+        n = cls.GRAM_LENGTH
+        return {gram for gram in (text[i:i + n] for i in range(len(text) - n + 1))
+                if cls.SEPARATOR not in gram}
+
+    def _add_slot(self, row_id: int, text: str):
+        slot = len(self._ids)
+        self._ids.append(row_id)
+        self._texts.append(text)
+        self._slots[row_id] = slot
+        postings = self._postings
+        for gram in self._grams(text):
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array('I')
+            posting.append(slot)
+
+    def _remove_slot(self, row_id: int) -> bool:
+        slot = self._slots.pop(row_id, None)
+        if slot is None:
+            return False
+        # Postings keep pointing at the slot; an empty text never verifies
+        self._ids[slot] = -1
+        self._texts[slot] = ''
+        self._removed += 1
+        return True
+
+    def build(self, rows):
+        """
+        Replace the index contents.
+
+        Args:
+            rows: Iterable of (id, title, username, website, category)
+        """
+        fresh = TrigramIndex()
+        for row_id, title, username, website, category in rows:
+            fresh._add_slot(row_id, self._text(title, username, website, category))
+        with self._lock:
+            self._postings, self._ids, self._texts, self._slots = (
+                fresh._postings, fresh._ids, fresh._texts, fresh._slots)
+            self._removed = 0
+            self.ready = True
+            pending, self._pending = self._pending, []
+            for method, args in pending:
+                method(*args)
+
+    def upsert(self, row_id: int, title: str, username: str = None, website: str = None, category: str = None):
+        """Index a new entry or re-index a changed one"""
+        with self._lock:
+            if not self.ready:
+                self._pending.append((self.upsert, (row_id, title, username, website, category)))
+                return
+            self._remove_slot(row_id)
+            self._add_slot(row_id, self._text(title, username, website, category))
+            self._maybe_compact()
+
+    def remove(self, row_id: int):
+        """Drop an entry from the index"""
+        with self._lock:
+            if not self.ready:
+                self._pending.append((self.remove, (row_id,)))
+                return
+            if self._remove_slot(row_id):
+                self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self._removed > max(1024, len(self._ids) * self.COMPACT_RATIO):
+            live = [(row_id, *self._texts[slot].split(self.SEPARATOR))
+                    for slot, row_id in enumerate(self._ids) if row_id >= 0]
+            self.ready = False
+            self.build(live)
+
+    def candidates(self, text: str) -> np.ndarray:
+        """
+        Ids of the entries holding every trigram of text (case-insensitive).
+
+        That is every entry containing text, plus the odd one holding its
+        trigrams apart; the caller's matcher scores them. Returns None for
+        text shorter than a trigram, which the index can't narrow down.
+        """
+        needle = text.strip().lower()
+        if len(needle) < self.GRAM_LENGTH or self.SEPARATOR in needle:
+            return None
+        with self._lock:
+            postings = []
+            for gram in self._grams(needle):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    return np.zeros(0, dtype=np.int64)
+                postings.append(posting)
+            postings.sort(key=len)
+            # Copies: a view would pin the arrays, which upserts append to
+            slots = np.array(postings[0])
+            for posting in postings[1:]:
+                if not len(slots):
+                    break
+                # Postings are sorted: look the fewer slots up in the longer list
+                other = np.array(posting)
+                found = np.minimum(np.searchsorted(other, slots), len(other) - 1)
+                slots = slots[other[found] == slots]
+            ids = np.array(self._ids)[slots]
+        # Tombstoned slots hold -1
+        return ids[ids >= 0]
+
+    def __len__(self):
+        return len(self._slots)
+
+    def memory_report(self) -> dict:
+        """Approximate bytes held by each part of the index"""
+        with self._lock:
+            postings = sum(sys.getsizeof(posting) for posting in self._postings.values())
+            grams = sys.getsizeof(self._postings) + sum(sys.getsizeof(gram) for gram in self._postings)
+            texts = sys.getsizeof(self._texts) + sum(sys.getsizeof(text) for text in self._texts)
+            slots = sys.getsizeof(self._slots) + sum(sys.getsizeof(row_id) for row_id in self._slots)
+            ids = sys.getsizeof(self._ids)
+            return {
+                'entries': len(self._slots),
+                'slots': len(self._ids),
+                'trigrams': len(self._postings),
+                'postings_entries': sum(len(posting) for posting in self._postings.values()),
+                'postings_bytes': postings,
+                'trigram_table_bytes': grams,
+                'texts_bytes': texts,
+                'id_map_bytes': slots + ids,
+                'total_bytes': postings + grams + texts + slots + ids,
+            }
@@ -0,0 +1,194 @@
+import re
+from src.core.migrations import TRIGRAM_LENGTH
+
+# Field names accepted before a colon, and the vault column each one targets
+FIELDS = {
+    'title': 'title',
+    'user': 'username',
+    'username': 'username',
+    'site': 'website',
+    'website': 'website',
+    'url': 'website',
+    'cat': 'category',
+    'category': 'category',
+    'fav': 'favorite',
+    'favorite': 'favorite',
+    'deleted': 'deleted',
+    'trash': 'deleted',
+}
+
+# Columns matched by substring, in vault_fts column order (bm25 weights follow it)
+TEXT_COLUMNS = ('title', 'username', 'website')
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+FLAG_VALUES = {'yes': 1, 'y': 1, 'true': 1, '1': 1, 'no': 0, 'n': 0, 'false': 0, '0': 0}
+
+# field:value, field:"quoted value", "quoted words" or a bare word
+_TOKEN = re.compile(r'(?:(\w+):)?(?:"([^"]*)"?|(\S*))')
+
+
+class SearchQuery:
+    """
+    Parsed search-bar query such as `site:github user:ops cat:Work fav:yes deleted:no`.
+
+    Text fields (title:, user:, site: and bare words) become substring
+    terms; cat:, fav: and deleted: become equality conditions. Every part is
+    ANDed. The compiled SQL depends only on the query's shape(), never on the
+    values, so PasswordVault caches it per shape and binds the values as
+    parameters. Live entries only, unless the query says deleted:.
+    """
+
+    def __init__(self):
+        # (column or None for any text column, value)
+        self.terms = []
+        # (column, value) equality conditions
+        self.conditions = []
+
+    @classmethod
+    def parse(cls, text: str) -> 'SearchQuery':
+        """Parse search-bar text; unknown fields and non yes/no flags are searched as plain text"""
+        query = cls()
+        for match in _TOKEN.finditer(text or ''):
+            field, quoted, bare = match.groups()
+            value = quoted if quoted is not None else bare
+            if not value:
+                # Whitespace, or a field still being typed ("site:")
+                continue
+            column = FIELDS.get(field.lower()) if field else None
+            if column in ('favorite', 'deleted'):
+                flag = FLAG_VALUES.get(value.lower())
+                if flag is not None:
+                    query.conditions.append((column, flag))
+                    continue
+                column = None
+            elif column == 'category':
+                query.conditions.append((column, value))
+                continue
+            if column is None and field:
+                # Not a field we know; keep "field:value" as typed
+                value = match.group(0).replace('"', '')
+            query.terms.append((column, value))
+        return query
+
+    @classmethod
+    def for_filter(cls, filter_type: str = None, category: str = None) -> 'SearchQuery':
+        """The main window's list filter (favorites, trash, category or All Items) as a query"""
+        return cls().restrict(filter_type, category)
+
+    def restrict(self, filter_type: str = None, category: str = None) -> 'SearchQuery':
+        """AND a list filter into this query; returns self"""
+        if filter_type == "favorites":
+            self.conditions.append(('favorite', 1))
+        elif filter_type == "trash":
+            self.conditions.append(('deleted', 1))
+        elif category:
+            self.conditions.append(('category', category))
+        return self
+
+    def accepts(self, state: dict) -> bool:
+        """True if an entry with these column values matches the query, as the compiled SQL would"""
+        for column, value in self._conditions():
+            actual = state.get(column)
+            if column == 'category' and isinstance(actual, str) and isinstance(value, str):
+                # search() matches cat: to the stored name case-insensitively
+                actual, value = actual.lower(), value.lower()
+            if actual != value:
+                return False
+        for column, value in self.terms:
+            needle = value.lower()
+            if not any(needle in (state.get(name) or '').lower() for name in ((column,) if column else TEXT_COLUMNS)):
+                return False
+        return True
+
+    def is_qualified(self) -> bool:
+        """True if any part names a field"""
+        return bool(self.conditions) or any(column for column, _ in self.terms)
+
+    def _conditions(self) -> list:
+        conditions = sorted(set(self.conditions), key=lambda condition: (condition[0], str(condition[1])))
+        if not any(column == 'deleted' for column, _ in conditions):
+            conditions.insert(0, ('deleted', 0))
+        return conditions
+
+    def _split_terms(self, fts: bool) -> tuple:
+        """(terms for the FTS5 MATCH, terms left for LIKE ordered by column)"""
+        match, like = [], []
+        for column, value in self.terms:
+            (match if fts and len(value) >= TRIGRAM_LENGTH else like).append((column, value))
+        like.sort(key=lambda term: term[0] or '')
+        return match, like
+
+    def shape(self, fts: bool) -> tuple:
+        """Everything the SQL text depends on; the plan cache key"""
+        match, like = self._split_terms(fts)
+        return (tuple(column for column, _ in self._conditions()),
+                bool(match), tuple(column for column, _ in like))
+
+    def where(self, fts: bool = False, alias: str = "") -> tuple:
+        """
+        WHERE clause and its parameters.
+
+        Args:
+            fts (bool): Use the vault_fts table for terms of three characters or
+                more (the FROM clause must join it)
+            alias (str): Prefix for vault columns, e.g. "v."
+
+        Returns:
+            tuple: (sql, params)
+        """
+        clauses, params = [], []
+        for column, value in self._conditions():
+            clauses.append(f"{alias}{column} = ?")
+            params.append(value)
+
+        match, like = self._split_terms(fts)
+        if match:
+            clauses.append("vault_fts MATCH ?")
+            params.append(self._match_expression(match))
+        for column, value in like:
+            pattern = '%' + value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            columns = (column,) if column else TEXT_COLUMNS
+            clauses.append('(' + ' OR '.join(f"{alias}{name} LIKE ? ESCAPE '\\'" for name in columns) + ')')
+            params.extend([pattern] * len(columns))
+        return ' AND '.join(clauses), tuple(params)
+
+    @staticmethod
+    def _match_expression(terms: list) -> str:
+        """FTS5 expression ANDing one literal phrase per term, column-filtered where the field was given"""
+        phrases = []
+        for column, value in terms:
+            # Quote as one FTS5 phrase so operators and punctuation are matched literally
+            phrase = '"' + value.replace('"', '""') + '"'
+            phrases.append(f"{column} : {phrase}" if column else phrase)
+        return ' AND '.join(phrases)
+
+    def sql(self, fts: bool, limit: bool = False, keyed: bool = False, after: bool = False) -> str:
+        """
+        SELECT for the password list's (icon, title, username, id) rows, best match first.
+
+        Args:
+            fts (bool): Use the vault_fts table (see where())
+            limit (bool): End with a LIMIT parameter
+            keyed (bool): Keyset pages: rows are ordered by (title, id)
+                whatever the terms
+            after (bool): Only rows past a (title, id) key, bound after the
+                WHERE parameters (keyed queries only)
+        """
+        where, _ = self.where(fts, alias="v.")
+        if self._split_terms(fts)[0]:
+            weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+            source = "vault_fts JOIN vault v ON v.id = vault_fts.rowid"
+            order = f"bm25(vault_fts, {weights}), v.title"
+        else:
+            source = "vault v"
+            order = "v.title"
+        if keyed:
+            # Every list index ends in (title, rowid), so the next page is a seek, however deep
+            order = "v.title, v.id"
+            if after:
+                where += " AND (v.title, v.id) > (?, ?)"
+        return (f"SELECT v.icon, v.title, v.username, v.id FROM {source} "
+                f"WHERE {where} ORDER BY {order}" + (" LIMIT ?" if limit else ""))
+
+    def params(self, fts: bool) -> tuple:
+        return self.where(fts)[1]
@@ -0,0 +1,98 @@
+from argon2.low_level import hash_secret_raw, Type
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDFExpand
+import base64
+import hmac
+import json
+import os
+
+# Settings table key holding the vault's argon2 cost parameters
+UNLOCK_PARAMS_SETTING = 'unlock_params'
+
+# Stored in master_account.master_password for accounts on the unified unlock scheme
+VERIFIER_PREFIX = '$spm-unlock$v1$'
+
+# argon2-cffi PasswordHasher defaults, so migrated vaults keep the same cost
+DEFAULT_PARAMS = {
+    'time_cost': 3,
+    'memory_cost': 65536,
+    'parallelism': 4,
+}
+
+SALT_LENGTH = 16
+KEY_LENGTH = 32
+
+# HKDF info labels; add new labels here for future subkeys
+VERIFIER_INFO = b'spm-unlock-v1 login verifier'
+WRAPPING_KEY_INFO = b'spm-unlock-v1 data key wrapping'
+EXPORT_KEY_INFO = b'spm-export-v1 archive key'
+
+
+class UnlockKeys:
+    """Keys split from a single argon2id derivation of the master password"""
+
+    def __init__(self, master_secret: bytes):
+        self._master_secret = bytearray(master_secret)
+        self.verifier = self.subkey(VERIFIER_INFO)
+        self.wrapping_key = self.subkey(WRAPPING_KEY_INFO)
+
+    def subkey(self, info: bytes, length: int = KEY_LENGTH) -> bytes:
+        """Expand an independent subkey for the given purpose label"""
+        return HKDFExpand(
+            algorithm=hashes.SHA256(),
+            length=length,
+            info=info,
+        ).derive(bytes(self._master_secret))
+
+    def matches(self, stored_verifier: str) -> bool:
+        """Constant-time check of the login verifier against its stored form"""
+        return hmac.compare_digest(encode_verifier(self.verifier), stored_verifier)
+
+    def wipe(self):
+        """Zero the master secret once all needed subkeys are derived"""
+        for i in range(len(self._master_secret)):
+            self._master_secret[i] = 0
+
+
+def new_salt() -> bytes:
+    return os.urandom(SALT_LENGTH)
+
+
+def derive_unlock_keys(master_password: str, salt: bytes, params: dict = None) -> UnlockKeys:
+    """Run the one memory-hard KDF of an unlock and split its output with HKDF"""
+    params = params or DEFAULT_PARAMS
+    master_secret = hash_secret_raw(
+        secret=master_password.encode(),
+        salt=salt,
+        time_cost=params['time_cost'],
+        memory_cost=params['memory_cost'],
+        parallelism=params['parallelism'],
+        hash_len=KEY_LENGTH,
+        type=Type.ID,
+    )
+    return UnlockKeys(master_secret)
+
+
+def encode_verifier(verifier: bytes) -> str:
+    return VERIFIER_PREFIX + base64.b64encode(verifier).decode('ascii')
+
+
+def is_unlock_verifier(stored: str) -> bool:
+    """True if a master_account hash is on the unified scheme (not a legacy argon2 hash)"""
+    return bool(stored) and stored.startswith(VERIFIER_PREFIX)
+
+
+def encode_salt(salt: bytes) -> str:
+    return base64.b64encode(salt).decode('ascii')
+
+
+def decode_salt(salt: str) -> bytes:
+    return base64.b64decode(salt)
+
+
+def dump_params(params: dict) -> str:
+    return json.dumps(params, sort_keys=True)
+
+
+def load_params(value: str) -> dict:
+    return json.loads(value) if value else dict(DEFAULT_PARAMS)
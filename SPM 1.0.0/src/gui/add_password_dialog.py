@@ -12,6 +12,7 @@ from src.resources.styles import (ADD_PASSWORD_DIALOG_STYLE,
                                 CATEGORIES_LABEL_STYLE,
                                 CATEGORY_DROPDOWN_STYLE)
 from src.utils import resource_path, show_message_box
+from src.gui.pixmap_cache import DEFAULT_ICON, PixmapCache
 
 class AddPasswordDialog(QDialog):
     def __init__(self, vault, master_password):
@@ -126,9 +127,7 @@ class AddPasswordDialog(QDialog):
 
             if icon_response.status_code == 200:
                 self.icon_data = icon_response.content
-                pixmap = QPixmap()
-                pixmap.loadFromData(self.icon_data)
-                icon = QIcon(pixmap)
+                icon = QIcon(PixmapCache.shared().pixmap(self.icon_data))
                 return title, icon, self.icon_data
             else:
                 return self.set_default_icon(url)
@@ -140,11 +139,11 @@ class AddPasswordDialog(QDialog):
     def set_default_icon(self, url=None):
         """Set default icon when favicon cannot be fetched"""
         # default_icon_path = os.path.join(os.path.dirname(__file__), '..', 'resources', 'icons', 'web_icon.png')
-        default_icon_path = resource_path(os.path.join('resources', 'icons', 'web_icon.png'))
-        if os.path.exists(default_icon_path):
-            with open(default_icon_path, 'rb') as f:
-                self.icon_data = f.read()
-            default_icon = QIcon(default_icon_path)
+        icons = PixmapCache.shared()
+        default_data = icons.resource_data(DEFAULT_ICON)
+        if default_data:
+            self.icon_data = default_data
+            default_icon = QIcon(icons.default_icon())
             return url and urlparse(url).netloc or "Unknown", default_icon, self.icon_data
         return None, None, None
 
@@ -1,33 +1,37 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QLabel, 
                             QLineEdit, QPushButton, QMessageBox,
                             QHBoxLayout)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThreadPool, pyqtSignal
 from PyQt6.QtGui import QIcon  # Add this import
 from src.resources.styles import MAIN_STYLE, TITLE_STYLE # Import styles
 import os
 import re  # Add this import at the top
-from argon2 import PasswordHasher  # Add this import
-from argon2.exceptions import VerifyMismatchError
 from cryptography.fernet import Fernet  # Add this import
 import base64
 from src.utils import resource_path, show_message_box
+from src.gui.pixmap_cache import PixmapCache
+from src.gui.unlock_worker import UnlockWorker
 
 
 class  LoginDialog(QDialog):
+    # Emitted when the unlock KDF starts on the worker and when the vault key is installed
+    unlock_started = pyqtSignal()
+    keys_ready = pyqtSignal()
+
     def __init__(self, vault):
         super().__init__()
         self.setWindowTitle("SPM Login")
         self.setModal(True)
-        self.setFixedSize(275, 280)
+        self.setFixedSize(275, 300)
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowType.WindowMaximizeButtonHint)
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowType.WindowMinimizeButtonHint)
         self.vault = vault
         self.master_password = None
-        self.ph = PasswordHasher()
-        self.eye_open_icon = QIcon(resource_path(os.path.join('resources', 'icons', 'eyeOpen_icon.png')))
+        self.unlock_worker = None
+        self.eye_open_icon = QIcon(PixmapCache.shared().resource('eyeOpen_icon.png'))
         # self.eye_open_icon = QIcon(os.path.join(os.path.dirname(__file__), '..', 'resources', 'icons', 'eyeOpen_icon.png'))
         # self.eye_closed_icon = QIcon(os.path.join(os.path.dirname(__file__), '..', 'resources', 'icons', 'eyeClose_icon.png'))
-        self.eye_closed_icon = QIcon(resource_path(os.path.join('resources', 'icons', 'eyeClose_icon.png')))
+        self.eye_closed_icon = QIcon(PixmapCache.shared().resource('eyeClose_icon.png'))
         self.setStyleSheet(MAIN_STYLE)
         # self.master_key_file = os.path.join(os.path.dirname(__file__), '..', 'master.key')
         self.encryption_key = self.load_or_create_encryption_key()
@@ -74,8 +78,15 @@ class  LoginDialog(QDialog):
         layout.addSpacing(5)  # Small space between password and confirm password sections
         
         
+        # Unlock progress, shown while the KDF runs on the worker
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #808080;")
+        self.status_label.hide()
+
         # Button layout
         button_layout = QHBoxLayout()
+        self.login_button = None
+        self.signup_button = None
         
         if self.users_exist():
              # Update toggle confirm password visibility button
@@ -85,9 +96,10 @@ class  LoginDialog(QDialog):
             self.toggle_password_button.setIcon(self.eye_closed_icon)  # Start with closed eye
             self.toggle_password_button.clicked.connect(self.toggle_password_visibility)
             password_layout.addWidget(self.toggle_password_button)
-            login_button = QPushButton("Login")
-            login_button.clicked.connect(self.handle_login)
-            button_layout.addWidget(login_button)
+            layout.addWidget(self.status_label)
+            self.login_button = QPushButton("Login")
+            self.login_button.clicked.connect(self.handle_login)
+            button_layout.addWidget(self.login_button)
         else:
             # Confirm password section with reduced spacing
             self.confirm_password_label = QLabel("Confirm Password:")
@@ -112,10 +124,11 @@ class  LoginDialog(QDialog):
         
             layout.addLayout(confirm_password_layout)
         
+            layout.addWidget(self.status_label)
             layout.addSpacing(10)  # Space before buttons
-            signup_button = QPushButton("Sign Up")
-            signup_button.clicked.connect(self.handle_signup)
-            button_layout.addWidget(signup_button)
+            self.signup_button = QPushButton("Sign Up")
+            self.signup_button.clicked.connect(self.handle_signup)
+            button_layout.addWidget(self.signup_button)
         
         layout.addLayout(button_layout)
         self.setLayout(layout)
@@ -223,53 +236,9 @@ Example of a valid password: Secure2023!"""
                 show_message_box(self, QMessageBox.Icon.Warning, "Error", "Master account already exists!")
                 return
             
-            # Generate a salt - with error checking
-            try:
-                salt_bytes = os.urandom(16)
-                salt = base64.urlsafe_b64encode(salt_bytes).decode('utf-8')
-                if not salt:
-                    raise ValueError("Salt generation failed")
-            except Exception as e:
-                show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to generate salt: {str(e)}")
-                return
-            
-            # Hash the password - with error checking
-            try:
-                if not password or not salt:
-                    raise ValueError("Password or salt is empty")
-                password_with_salt = password + salt
-                master_password = self.ph.hash(password_with_salt)
-                if not master_password:
-                    raise ValueError("Password hashing failed")
-            except Exception as e:
-                show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to hash password: {str(e)}")
-                return
-            
-            # Store credentials in database
-            try:
-                with self.vault.conn:
-                    cursor = self.vault.conn.cursor()
-                    cursor.execute("""
-                        INSERT INTO master_account (username, master_password, salt)
-                        VALUES (?, ?, ?)
-                    """, (username, master_password, salt))
-            except Exception as e:
-                show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to store in database: {str(e)}")
-                return
-            
-            # Initialize encryption
-            try:
-                self.master_password = password
-            except Exception as e:
-                show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to setup encryption: {str(e)}")
-                return
-            
-            # After successful account creation
-            self.confirm_password_input.setVisible(False)
-            self.confirm_password_label.setVisible(False)
-            
-            show_message_box(self, QMessageBox.Icon.Information, "Success", "Master account created successfully!")
-            self.accept()
+            # Create the account off the UI thread: calibration, cipher timing and
+            # one KDF that yields the login verifier and the vault key
+            self.start_unlock(username, password, create=True)
             
         except Exception as e:
             show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to create account: {str(e)}")
@@ -285,31 +254,89 @@ Example of a valid password: Secure2023!"""
             
         try:
             # Get user from database
-            with self.vault.conn:
-                cursor = self.vault.conn.cursor()
-                cursor.execute("""
-                    SELECT master_password, salt 
-                    FROM master_account 
-                    WHERE username = ?
-                """, (username,))
-                result = cursor.fetchone()
-            
-            if result:
-                master_password, salt = result
-                try:
-                    self.ph.verify(master_password, password + salt)
-                    self.master_password = password 
-                    self.accept()
-                    return
-                except VerifyMismatchError:
-                    show_message_box(self, QMessageBox.Icon.Warning, "Error", "Invalid password")
-                    return
-            else:
+            if not self.vault.get_entry("master_account", username=username):
                 show_message_box(self, QMessageBox.Icon.Warning, "Error", "User not found")
+                return
+
+            # Single KDF pass, off the UI thread: verifies the password and unlocks the vault data key
+            self.start_unlock(username, password)
                 
         except Exception as e:
             show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to handle login: {str(e)}")
 
+    def start_unlock(self, username, password, create=False):
+        """Start the unlock worker (or, with create, the account setup) and keep the dialog responsive"""
+        if self.unlock_worker:
+            return
+        self.pending_password = password
+        self.unlock_worker = UnlockWorker(self.vault.db_path, username, password, create=create)
+        signals = self.unlock_worker.signals
+        signals.progress.connect(self.on_unlock_progress)
+        signals.keys_ready.connect(self.on_keys_ready)
+        signals.invalid_password.connect(self.on_invalid_password)
+        signals.account_exists.connect(self.on_account_exists)
+        signals.failed.connect(self.on_unlock_failed)
+        signals.cancelled.connect(self.on_unlock_cancelled)
+
+        self.set_form_enabled(False)
+        self.status_label.setText("Creating account..." if create else "Unlocking...")
+        self.status_label.show()
+
+        QThreadPool.globalInstance().start(self.unlock_worker)
+        self.unlock_started.emit()
+
+    def finish_unlock(self):
+        """Reset the form after the worker is done"""
+        self.unlock_worker = None
+        self.pending_password = None
+        self.set_form_enabled(True)
+        self.status_label.hide()
+
+    def set_form_enabled(self, enabled):
+        for widget in (self.login_button, self.signup_button, self.username_input, self.password_input,
+                       getattr(self, 'confirm_password_input', None)):
+            if widget is not None:
+                widget.setEnabled(enabled)
+
+    def on_unlock_progress(self, percent, message):
+        self.status_label.setText(f"{message}... {percent}%")
+
+    def on_keys_ready(self, data_key):
+        """Install the unwrapped data key on the UI thread's vault and close the dialog"""
+        password = self.pending_password
+        created = self.unlock_worker.create
+        self.finish_unlock()
+        self.vault.use_data_key(data_key)
+        self.master_password = password
+        self.keys_ready.emit()
+        if created:
+            self.confirm_password_input.setVisible(False)
+            self.confirm_password_label.setVisible(False)
+            show_message_box(self, QMessageBox.Icon.Information, "Success", "Master account created successfully!")
+        self.accept()
+
+    def on_invalid_password(self):
+        self.finish_unlock()
+        show_message_box(self, QMessageBox.Icon.Warning, "Error", "Invalid password")
+
+    def on_account_exists(self):
+        self.finish_unlock()
+        show_message_box(self, QMessageBox.Icon.Warning, "Error", "Master account already exists!")
+
+    def on_unlock_failed(self, error):
+        action = "create account" if self.unlock_worker.create else "handle login"
+        self.finish_unlock()
+        show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to {action}: {error}")
+
+    def on_unlock_cancelled(self):
+        self.finish_unlock()
+
+    def reject(self):
+        """Cancel a running unlock before closing"""
+        if self.unlock_worker:
+            self.unlock_worker.cancel()
+        super().reject()
+
     def toggle_password_visibility(self):
         """Toggle the password input's echo mode between Normal and Password"""
         if self.password_input.echoMode() == QLineEdit.EchoMode.Password:
@@ -1,3 +1,4 @@
+import bisect
 import os
 from io import BytesIO
 from PyQt6 import QtGui
@@ -7,16 +8,20 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,QGri
                             QFormLayout, QTextEdit, QDialog, QListWidgetItem, 
                             QLabel, QMessageBox, QApplication, QComboBox)
 from PyQt6.QtGui import QStandardItemModel, QStandardItem, QPixmap, QIcon, QFontDatabase
+from src.core import changes
 from src.core.encryption import Encryption
+from src.core.search_query import SearchQuery
 from src.gui.add_password_dialog import AddPasswordDialog
 from src.gui.add_category_dialog import AddCategoryDialog
+from src.gui.password_list import PasswordListModel, PasswordListView, TITLE_ROLE
+from src.gui.pixmap_cache import PixmapCache
+from src.gui.search_worker import SearchWorker
 from src.resources.styles import (
     MAIN_WINDOW_STYLE,
     PASSWORD_LIST_STYLE,
     CATEGORIES_LIST_STYLE,
     SIDEBAR_CONTAINER_STYLE,
     ACTION_BUTTON_STYLE,
-    ICON_LABEL_STYLE,
     CATEGORY_BUTTON_STYLE,
     CATEGORIES_LABEL_STYLE,
     SEARCH_BAR_STYLE,
@@ -26,11 +31,16 @@ from src.resources.styles import (
 )
 from src.utils import resource_path, show_message_box
 
+# Size of the entry icon in the details panel
+DETAIL_ICON_SIZE = 48
+
 class MainWindow(QMainWindow):
-    def __init__(self, vault, master_password):
+    def __init__(self, vault, master_password, prefetched=None):
         super().__init__()
         self.vault = vault
         self.master_password = master_password
+        # List metadata and decoded icons loaded during unlock (see src/gui/startup.py)
+        self.prefetched = prefetched
         self.setWindowTitle("Secure Password Manager")
         
         # Add edit mode tracking
@@ -40,21 +50,38 @@ class MainWindow(QMainWindow):
         self.setFixedSize(self.sizeHint())
         self.setWindowFlags(Qt.WindowType.Window | Qt.WindowType.WindowMinimizeButtonHint | Qt.WindowType.WindowCloseButtonHint)
         
+        # Sidebar counts as shown, kept current from the vault's change events
+        self.counts = {'total': 0, 'favorites': 0, 'trash': 0, 'categories': {}}
+        # What the list says when it has no rows
+        self.empty_text = ""
+        # (text, filter type, category) of the last search requested, and of the results shown (None for a listing)
+        self.requested_search = None
+        self.shown_search = None
+
         # Initial size without right panel
         self.reset_window_size()
         self.init_ui()
 
+        # Apply every add, edit, favorite, trash and delete to the list and sidebar as it happens,
+        # and to the search worker's matcher, which reads the vault through its own connection
+        self.vault.subscribe(self.on_vault_change)
+        self.vault.subscribe(self.search_worker.apply_change)
+
         # Apply styles
         self.setStyleSheet(MAIN_WINDOW_STYLE)
         self.password_list.setStyleSheet(PASSWORD_LIST_STYLE)
         self.search_bar.setStyleSheet(SEARCH_BAR_STYLE)
 
     def init_ui(self):
-        # Create password_list first
-        self.password_list = QListWidget()
+        # Create password_list first: a model of (icon, title, username, id) rows painted by a delegate
+        self.password_model = PasswordListModel(self)
+        self.password_list = PasswordListView(self.password_model)
         self.password_list.setStyleSheet(PASSWORD_LIST_STYLE)
-        self.password_list.setSpacing(2)
-        self.password_list.setVerticalScrollMode(QListWidget.ScrollMode.ScrollPerPixel)
+
+        # Search-box queries run on a worker thread; only the latest one's results are shown
+        self.search_worker = SearchWorker(self.vault.db_path, self.vault.profile, self)
+        self.search_worker.results.connect(self.show_search_results)
+        self.search_worker.failed.connect(self.on_search_failed)
 
         # Create central widget and main layout
         central_widget = QWidget()
@@ -81,10 +108,20 @@ class MainWindow(QMainWindow):
         self.right_panel_2.hide()
         main_layout.addWidget(self.right_panel_2)
         
-        # Load the entries and categories
-        self.load_vault_entries()
-        self.load_categories()
-        self.update_trash_count()         # Update the Trash count
+        # Load the entries and categories, straight from the startup prefetch if there is one
+        if self.prefetched:
+            counts = self.prefetched['counts']
+            self.load_vault_entries(entries=self.prefetched['entries'], counts=counts)
+            self.load_categories(categories=self.prefetched['categories'], counts=counts['categories'])
+            self.update_trash_count(counts['trash'])
+            self.prefetched = None
+        else:
+            self.load_vault_entries()
+            self.load_categories()
+            self.update_trash_count()         # Update the Trash count
+
+        # Build the search worker's index while the user looks at the list
+        self.search_worker.prepare()
 
     def setup_Toolbar_panel(self):
         sidebar_layout = QVBoxLayout()  # Create the layout first
@@ -201,12 +238,7 @@ class MainWindow(QMainWindow):
             if dialog.exec() == 1:
                 values = dialog.get_values()
                 if values:
-                    # Add category to sidebar
-                    self.add_category_to_list(values)
-                    
-                    # Refresh all category dropdowns
-                    self.load_categories()
-                    
+                    # on_vault_change has added it to the sidebar and dropdown
                     # Update right panel category combo if it exists and is visible
                     if hasattr(self, 'right_panel_1') and self.right_panel_1.isVisible():
                         self.categories_combo.clear()
@@ -234,8 +266,8 @@ class MainWindow(QMainWindow):
         except Exception as e:
             show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to show add category dialog: {str(e)}")
 
-    def add_category_to_list(self, category_data):
-        """Add a category to the sidebar list"""
+    def add_category_to_list(self, category_data, row=None):
+        """Add a category to the sidebar list (at the end unless a row is given)"""
         item = QListWidgetItem()
         item_widget = QWidget()
         item_layout = QHBoxLayout()
@@ -252,7 +284,10 @@ class MainWindow(QMainWindow):
         item_layout.addWidget(count_label)
 
         item.setSizeHint(item_widget.sizeHint())
-        self.categories_list.addItem(item)
+        if row is None:
+            self.categories_list.addItem(item)
+        else:
+            self.categories_list.insertItem(row, item)
         self.categories_list.setItemWidget(item, item_widget)
 
     def delete_selected_category(self):
@@ -276,34 +311,25 @@ class MainWindow(QMainWindow):
         
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                # Delete from database
-                with self.vault.conn:
-                    cursor = self.vault.conn.cursor()
-                    cursor.execute("DELETE FROM categories WHERE category_names = ?", (category_name,))
-                    
-                    # Update passwords in this category to have no category
-                    cursor.execute("UPDATE vault SET category = NULL WHERE category = ?", (category_name,))
-                
-                # Remove from UI
-                self.categories_list.takeItem(self.categories_list.row(current_item))
-                
-                # Remove from combo box
-                index = self.categories_combo.findText(category_name)
-                if index >= 0:
-                    self.categories_combo.removeItem(index)
-                    
+                # Delete from database; its passwords are kept without a category.
+                # on_vault_change takes it out of the sidebar and dropdown.
+                self.vault.delete_category(category_name)
+
                 show_message_box(self, QMessageBox.Icon.Information, "Success", "Category deleted successfully!")
                 
             except Exception as e:
                 show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to delete category: {str(e)}")
 
-    def update_category_counts(self):
-        """Update the counts for each category in the sidebar"""
+    def update_category_counts(self, counts=None):
+        """Update the counts for each category in the sidebar (optionally from known counts)"""
         try:
             with self.vault.conn:
                 cursor = self.vault.conn.cursor()
-                cursor.execute("SELECT category_names FROM categories")
-                categories = cursor.fetchall()
+                if counts is None:
+                    cursor.execute("SELECT category_names FROM categories")
+                    categories = cursor.fetchall()
+                else:
+                    categories = [(name,) for name in counts]
                 
                 print("Categories found in database:", categories)  # Debugging output
                 
@@ -311,14 +337,18 @@ class MainWindow(QMainWindow):
                     category_name = category[0]
                     
                     # Get the count of active entries in this category
-                    cursor.execute("""
-                        SELECT COUNT(*) FROM vault 
-                        WHERE category = ? AND deleted = 0
-                    """, (category_name,))
-                    count = cursor.fetchone()[0]
+                    if counts is None:
+                        cursor.execute("""
+                            SELECT COUNT(*) FROM vault 
+                            WHERE category = ? AND deleted = 0
+                        """, (category_name,))
+                        count = cursor.fetchone()[0]
+                    else:
+                        count = counts[category_name]
     
                     # Debugging output
                     print(f"Category: {category_name}, Count: {count}")
+                    self.counts['categories'][category_name] = count
         
                     # Find the corresponding category item in the sidebar
                     for i in range(self.categories_list.count()):
@@ -348,6 +378,13 @@ class MainWindow(QMainWindow):
 
         self.search_bar = QLineEdit()
         self.search_bar.setPlaceholderText("🔍 Search Vault")
+        self.search_bar.setToolTip("Filter with site:, user:, title:, cat:, fav:yes/no and deleted:yes/no")
+        fallback = self.vault.search_fallback()
+        if fallback:
+            # Older SQLite builds lack the FTS5 trigram index; say why searches scan every entry
+            self.search_bar.setToolTip(f"{self.search_bar.toolTip()}\n\nFull-text search is unavailable "
+                                       f"({fallback}), so searching scans every entry and may be slow "
+                                       f"on large vaults.")
         self.search_bar.textChanged.connect(self.search_entries)  # Connect to search function
         add_button = QPushButton("+")
         add_button.setStyleSheet(ACTION_BUTTON_STYLE)
@@ -361,14 +398,6 @@ class MainWindow(QMainWindow):
         list_layout = QVBoxLayout()
         list_container.setLayout(list_layout)
 
-        # Password list
-        self.password_list = QListWidget()
-        self.password_list.setStyleSheet(PASSWORD_LIST_STYLE)
-        self.password_list.setSpacing(2)
-        self.password_list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.password_list.setWordWrap(True)
-        self.password_list.setTextElideMode(Qt.TextElideMode.ElideMiddle)
-        
         # No results message
         self.no_results_widget = QWidget()
         no_results_layout = QVBoxLayout()
@@ -409,16 +438,13 @@ class MainWindow(QMainWindow):
         layout.addWidget(list_container)
         
         # Connect password list selection to handler
-        self.password_list.itemClicked.connect(self.on_password_selected)
+        self.password_list.clicked.connect(self.on_password_selected)
         
         return middle_panel
 
     def search_entries(self, search_text):
-        """Search through password entries"""
+        """Search through password entries once typing pauses (results arrive in show_search_results)"""
         try:
-            # Clear current list
-            self.password_list.clear()
-            
             if not search_text.strip():
                 # If search is empty, reload all entries with current filter
                 self.load_vault_entries(
@@ -426,64 +452,121 @@ class MainWindow(QMainWindow):
                     filter_type=self.current_filter_type
                 )
                 return
-            
-            with self.vault.conn:
-                cursor = self.vault.conn.cursor()
-                
-                # Prepare search query based on current filter
-                if self.current_filter_type == "trash":
-                    cursor.execute("""
-                        SELECT icon, title, username 
-                        FROM vault 
-                        WHERE deleted = 1 
-                        AND (title LIKE ? OR username LIKE ? OR website LIKE ?)
-                        ORDER BY title
-                    """, (f"%{search_text}%", f"%{search_text}%", f"%{search_text}%"))
-                elif self.current_filter_type == "favorites":
-                    cursor.execute("""
-                        SELECT icon, title, username 
-                        FROM vault 
-                        WHERE favorite = 1 AND deleted = 0 
-                        AND (title LIKE ? OR username LIKE ? OR website LIKE ?)
-                        ORDER BY title
-                    """, (f"%{search_text}%", f"%{search_text}%", f"%{search_text}%"))
-                elif self.current_filter_type == "category":
-                    cursor.execute("""
-                        SELECT icon, title, username 
-                        FROM vault 
-                        WHERE category = ? AND deleted = 0 
-                        AND (title LIKE ? OR username LIKE ? OR website LIKE ?)
-                        ORDER BY title
-                    """, (self.current_filter, f"%{search_text}%", f"%{search_text}%", f"%{search_text}%"))
-                else:
-                    cursor.execute("""
-                        SELECT icon, title, username 
-                        FROM vault 
-                        WHERE deleted = 0 
-                        AND (title LIKE ? OR username LIKE ? OR website LIKE ?)
-                        ORDER BY title
-                    """, (f"%{search_text}%", f"%{search_text}%", f"%{search_text}%"))
-                
-                entries = cursor.fetchall()
-                
-                # Handle no results
-                if not entries:
-                    self.password_list.hide()
-                    self.no_results_label.setText("No matching passwords found")
-                    self.no_results_widget.show()
-                else:
-                    self.no_results_widget.hide()
-                    self.password_list.show()
-                    for icon_data, title, username in entries:
-                        self.add_password_to_list({
-                            'icon_data': icon_data,
-                            'title': title,
-                            'username': username
-                        })
-                    
+
+            # Fuzzy-ranked within the current filter; favorites and recently used entries first.
+            # Field queries (site:github user:ops cat:Work fav:yes deleted:no) run as SQL.
+            # The list keeps showing the previous results until the new ones are in.
+            category = self.current_filter if self.current_filter_type == "category" else None
+            self.search_worker.request(search_text, filter_type=self.current_filter_type, category=category)
+            self.requested_search = (search_text, self.current_filter_type, category)
         except Exception as e:
             show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to search entries: {str(e)}")
 
+    def show_search_results(self, serial, entries):
+        """Apply the latest search's rows to the list in one reset"""
+        if not self.search_worker.is_current(serial):
+            return
+        self.empty_text = "No matching passwords found"
+        self.password_model.set_results(entries)
+        # Vault changes are matched against this search while its results are shown
+        self.shown_search = self.requested_search
+        self.update_empty_state()
+
+    def update_empty_state(self):
+        """Show the list, or the empty-state text when it has no rows"""
+        if self.password_model.rowCount() or self.password_model.canFetchMore():
+            self.no_results_widget.hide()
+            self.password_list.show()
+        else:
+            self.password_list.hide()
+            self.no_results_label.setText(self.empty_text)
+            self.no_results_widget.show()
+
+    def on_vault_change(self, change):
+        """
+        Apply one vault change (src/core/changes.py) to the list and sidebar.
+
+        Entry changes insert, remove, move or update a single list row and
+        adjust only the counts they touch; category changes add or remove one
+        sidebar row and dropdown item. Selection and scroll position are kept.
+        """
+        try:
+            if change.kind == changes.USED:
+                # Only the search ranking changes (SearchWorker listens too)
+                return
+            if change.kind == changes.RESET:
+                # Re-runs the search in the search bar, or reloads the listing if there is none
+                self.search_entries(self.search_bar.text())
+                self.load_categories()
+                self.update_trash_count()
+            elif change.table == 'categories':
+                self.apply_category_change(change)
+            elif change.table == 'vault':
+                if self.shown_search:
+                    accepts = self.vault.search_predicate(*self.shown_search)
+                else:
+                    category = self.current_filter if self.current_filter_type == "category" else None
+                    accepts = SearchQuery.for_filter(self.current_filter_type, category).accepts
+                self.password_model.apply_change(change, accepts)
+                self.update_empty_state()
+                self.apply_count_change(change.before, change.after)
+        except Exception as e:
+            print(f"Error applying vault change {change!r}: {str(e)}")
+
+    def apply_count_change(self, before, after):
+        """Move the sidebar counts of an entry from state before to state after (either may be None)"""
+        counts = {'total': 0, 'favorites': 0, 'trash': 0}
+        categories = {}
+        for state, sign in ((before, -1), (after, 1)):
+            if not state:
+                continue
+            if state['deleted']:
+                counts['trash'] += sign
+                continue
+            counts['total'] += sign
+            if state['favorite']:
+                counts['favorites'] += sign
+            if state['category'] in self.counts['categories']:
+                categories[state['category']] = categories.get(state['category'], 0) + sign
+
+        if counts['total']:
+            self.update_total_count(self.counts['total'] + counts['total'])
+        if counts['favorites']:
+            self.update_favorites_count(self.counts['favorites'] + counts['favorites'])
+        if counts['trash']:
+            self.update_trash_count(self.counts['trash'] + counts['trash'])
+        changed = {name: self.counts['categories'][name] + delta for name, delta in categories.items() if delta}
+        if changed:
+            self.update_category_counts(changed)
+
+    def apply_category_change(self, change):
+        """Add or remove one category in the sidebar and the details dropdown, keeping name order"""
+        names = [self.categories_list.itemWidget(self.categories_list.item(i)).layout().itemAt(0).widget().text()
+                 for i in range(self.categories_list.count())]
+        if change.kind == changes.INSERTED and change.after['name'] not in names:
+            name = change.after['name']
+            row = bisect.bisect_left(names, name)
+            self.add_category_to_list({'name': name}, row)
+            self.counts['categories'][name] = 0
+            if not names and self.categories_combo.findText("No Category") >= 0:
+                # "No Category" only stands in while there are none
+                self.categories_combo.removeItem(self.categories_combo.findText("No Category"))
+            # The dropdown lists "Create New Category" and a separator before the names
+            self.categories_combo.insertItem(2 + row, name)
+        elif change.kind == changes.REMOVED and change.before['name'] in names:
+            name = change.before['name']
+            self.categories_list.takeItem(names.index(name))
+            self.counts['categories'].pop(name, None)
+            index = self.categories_combo.findText(name)
+            if index >= 0:
+                self.categories_combo.removeItem(index)
+            if len(names) == 1:
+                self.categories_combo.addItem("No Category")
+
+    def on_search_failed(self, serial, error):
+        if self.search_worker.is_current(serial):
+            show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to search entries: {error}")
+
     def add_password_dialog(self):
         try:
             if not self.master_password:
@@ -491,94 +574,73 @@ class MainWindow(QMainWindow):
                 return
             dialog = AddPasswordDialog(self.vault, self.master_password)
             if dialog.exec() == 1:
-                values = dialog.get_values()
-                if values:
-                    self.load_vault_entries()  # Refresh the password list
-                    self.load_categories()     # Refresh categories and counts
+                # on_vault_change has put the new password in the list and counted it
+                dialog.get_values()
         except Exception as e:
             show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to create password dialog: {str(e)}")
     
-    def load_vault_entries(self, category=None, filter_type=None):
-        """Load vault entries with filtering and empty state handling"""
-        self.password_list.clear()
+    def load_vault_entries(self, category=None, filter_type=None, entries=None, counts=None):
+        """
+        Load vault entries with filtering and empty state handling.
+
+        The list is read one keyset page at a time as it is scrolled. `entries`
+        (the first page of (icon, title, username, id) rows) and `counts` may be
+        passed in when they were already loaded, e.g. by the startup prefetch.
+        """
+        # Results of a search still running would replace this listing
+        self.search_worker.cancel()
+        self.shown_search = None
+        self.password_model.clear()
         try:
             with self.vault.conn:
-                cursor = self.vault.conn.cursor()
-                
-                # Prepare query based on filter
+                # Pick the empty-state text for the filter
                 if filter_type == "favorites":
-                    cursor.execute("""
-                        SELECT icon, title, username 
-                        FROM vault 
-                        WHERE favorite = 1 AND deleted = 0
-                        ORDER BY title
-                    """)
                     filter_description = "favorite passwords"
                     empty_message = "No favorite passwords yet"
                     action_message = "Click the star icon while editing to mark items as favorites"
                 elif filter_type == "trash":
-                    cursor.execute("""
-                        SELECT icon, title, username 
-                        FROM vault 
-                        WHERE deleted = 1
-                        ORDER BY title
-                    """)
                     filter_description = "deleted passwords"
                     empty_message = "Trash is empty"
                     action_message = "Deleted passwords will appear here"
                 elif category and category not in ["🛡️ All Items", "⭐ Favorites", "🗑️ Trash"]:
-                    cursor.execute("""
-                        SELECT icon, title, username 
-                        FROM vault 
-                        WHERE category = ? AND deleted = 0
-                        ORDER BY title
-                    """, (category,))
                     filter_description = f"passwords in {category}"
                     empty_message = f"No passwords in {category}"
                     action_message = "Add a new password and select this category"
                 else:
-                    cursor.execute("""
-                        SELECT icon, title, username 
-                        FROM vault 
-                        WHERE deleted = 0
-                        ORDER BY title
-                    """)
+                    category = None
                     filter_description = "passwords"
                     empty_message = "No passwords yet"
                     action_message = "Click the + button to add your first password"
                     
-                entries = cursor.fetchall()
+                def fetch_page(after_key, limit):
+                    return self.vault.list_entries(filter_type, category, after_key, limit)
+
+                if entries is None:
+                    entries = fetch_page(None, self.password_model.PAGE_SIZE)
                 
                 # Handle empty state
-                if not entries:
-                    self.password_list.hide()
-                    self.no_results_label.setText(f"{empty_message}\n\n{action_message}")
-                    self.no_results_widget.show()
-                else:
-                    self.no_results_widget.hide()
-                    self.password_list.show()
-                    for icon_data, title, username in entries:
-                        self.add_password_to_list({
-                            'icon_data': icon_data,
-                            'title': title,
-                            'username': username
-                        })
+                self.empty_text = f"{empty_message}\n\n{action_message}"
+                self.password_model.set_pages(fetch_page, first_page=entries)
+                self.update_empty_state()
                     
                 # Update counts
-                self.update_total_count()
-                self.update_favorites_count()
+                self.update_total_count(counts['total'] if counts else None)
+                self.update_favorites_count(counts['favorites'] if counts else None)
                 
         except Exception as e:
             show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to load vault entries: {str(e)}")
 
-    def update_total_count(self):
+    def update_total_count(self, total_count=None):
         """Update the total count in All Items"""
         try:
             with self.vault.conn:
-                cursor = self.vault.conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM vault WHERE deleted = 0")
-                total_count = cursor.fetchone()[0]
+                if total_count is None:
+                    cursor = self.vault.conn.cursor()
+                    cursor.execute("SELECT COUNT(*) FROM vault WHERE deleted = 0")
+                    total_count = cursor.fetchone()[0]
                 
+                self.counts['total'] = total_count
+
                 # Update the count in the first item (All Items)
                 all_items_item = self.main_items_list.item(0)
                 if all_items_item:
@@ -590,69 +652,23 @@ class MainWindow(QMainWindow):
         except Exception as e:
             print(f"Error updating total count: {str(e)}")
 
-    def add_password_to_list(self, password_data):
-        if not password_data:
-            return
-        
-        item = QListWidgetItem()
-        item.password_data = password_data
-        item_widget = QWidget()
-        item_layout = QHBoxLayout()
-        item_layout.setContentsMargins(10, 8, 10, 8)
-        item_widget.setLayout(item_layout)
+    def closeEvent(self, event):
+        """Stop the search worker and lock the vault before the window goes away"""
+        self.vault.unsubscribe(self.on_vault_change)
+        self.vault.unsubscribe(self.search_worker.apply_change)
+        self.search_worker.stop()
+        self.vault.close()
+        super().closeEvent(event)
 
-        # Icon/Logo container
-        icon_label = QLabel()
-        icon_label.setFixedSize(40, 40)
-        icon_label.setStyleSheet(ICON_LABEL_STYLE)
-        
-        if 'icon_data' in password_data and password_data['icon_data']:
-            pixmap = QtGui.QPixmap()
-            if pixmap.loadFromData(password_data['icon_data']):
-                icon_label.setPixmap(pixmap.scaled(32, 32, Qt.AspectRatioMode.KeepAspectRatio))
-            else:
-                self.set_default_icon(icon_label)
-        else:
-            self.set_default_icon(icon_label)
-        
-        # Text container with only title
-        text_container = QWidget()
-        text_layout = QVBoxLayout()
-        text_layout.setSpacing(2)
-        text_layout.setContentsMargins(10, 0, 0, 0)
-        text_container.setLayout(text_layout)
-        
-        title_label = QLabel(password_data['title'])
-        title_label.setWordWrap(True)
-        title_label.setStyleSheet("color: white; font-size: 16px; font-weight: bold;")
-        
-        text_layout.addWidget(title_label)
-
-        item_layout.addWidget(icon_label)
-        item_layout.addWidget(text_container, 1)  # Give text container stretch priority
-
-        item.setSizeHint(item_widget.sizeHint())
-        self.password_list.addItem(item)
-        self.password_list.setItemWidget(item, item_widget)
-
-    def set_default_icon(self, icon_label):
-        try:
-            # default_icon_path = os.path.join(os.path.dirname(__file__), '..', 'resources', 'icons', 'web_icon.png')
-            default_icon_path = resource_path(os.path.join('resources', 'icons', 'web_icon.png'))
-            pixmap = QtGui.QPixmap(default_icon_path)
-            icon_label.setPixmap(pixmap.scaled(32, 32, Qt.AspectRatioMode.KeepAspectRatio))
-        except Exception as e:
-            print(f"Error - Unable to set default icon: {str(e)}")
-    
     def reset_window_size(self):
         """Reset window size to original dimensions without right panel"""
         initial_width = 150 + 300 + 5  # sidebar + middle + margins
         self.setMinimumSize(initial_width, 500)
         self.resize(initial_width, self.height())
 
-    def on_password_selected(self, item):
+    def on_password_selected(self, index):
         """Handle password selection from the list"""
-        if not item or not hasattr(item, 'password_data'):
+        if not index or not index.isValid():
             return
         
         # Check if in edit mode
@@ -668,7 +684,7 @@ class MainWindow(QMainWindow):
             if reply == QMessageBox.StandardButton.No:
                 # Revert selection
                 self.password_list.blockSignals(True)
-                self.password_list.setCurrentItem(self.password_list.currentItem())
+                self.password_list.setCurrentIndex(self.password_list.currentIndex())
                 self.password_list.blockSignals(False)
                 return
             else:
@@ -676,7 +692,7 @@ class MainWindow(QMainWindow):
                 self.restore_view_mode()
         
         # Continue with password selection
-        selected_title = item.password_data['title']
+        selected_title = index.data(TITLE_ROLE)
         current_title = self.detail_title.text() if hasattr(self, 'detail_title') else None
         
         # Check if clicking the same password (using title comparison)
@@ -695,7 +711,7 @@ class MainWindow(QMainWindow):
         # Check if the selected item is from the Trash
         if self.current_filter_type == "trash":
             self.right_panel_1.hide()  # Hide details panel
-            self.update_trash_details(item)
+            self.update_trash_details(index)
             self.right_panel_2.show()  # Show trash panel
             new_width = 150 + 300 + 400 + 5  # sidebar + middle + trash_panel + margin
             self.setMinimumSize(new_width, 500)
@@ -726,13 +742,14 @@ class MainWindow(QMainWindow):
                 
                 # Update all fields with the processed data
                 self.update_password_details(password_data)
+                self.vault.mark_used(selected_title)
                 
         except Exception as e:
             show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to load password details: {str(e)}")
 
-    def is_trash_item(self, item):
+    def is_trash_item(self, index):
         """Check if the selected item is from the Trash based on the deleted column."""
-        title = item.password_data['title']  # Assuming title is used to identify the item
+        title = index.data(TITLE_ROLE)  # Assuming title is used to identify the item
         
         with self.vault.conn:  # Use the vault's database connection
             cursor = self.vault.conn.cursor()
@@ -795,7 +812,7 @@ class MainWindow(QMainWindow):
         icon_title_widget.setLayout(icon_title_layout)
 
         self.detail_icon = QLabel()
-        self.detail_icon.setFixedSize(48, 48)
+        self.detail_icon.setFixedSize(DETAIL_ICON_SIZE, DETAIL_ICON_SIZE)
         self.detail_icon.setStyleSheet("QLabel { background-color: #1C1C1C; border-radius: 8px; }")
 
         title_widget = QWidget()
@@ -989,6 +1006,8 @@ class MainWindow(QMainWindow):
         """Copy password to clipboard"""
         clipboard = QApplication.clipboard()
         clipboard.setText(self.password_input.text())
+        if self.detail_title.text():
+            self.vault.mark_used(self.detail_title.text())
         
     def toggle_favorite(self):
         """Toggle favorite status of current password"""
@@ -996,16 +1015,8 @@ class MainWindow(QMainWindow):
             current_title = self.detail_title.text()
             is_favorite = self.favorite_btn.isChecked()
             
-            # Update the database
-            with self.vault.conn:
-                cursor = self.vault.conn.cursor()
-                cursor.execute("""
-                    UPDATE vault 
-                    SET favorite = ? 
-                    WHERE title = ?
-                """, (is_favorite, current_title))
-                
-                self.vault.conn.commit()
+            # Update the database (on_vault_change updates the Favorites count and list)
+            self.vault.set_favorite(current_title, is_favorite)
             
             # Update button text and style based on state
             self.favorite_btn.setText("⭐" if is_favorite else "☆")
@@ -1026,20 +1037,20 @@ class MainWindow(QMainWindow):
                 }
             """)
             
-            # Update favorites count in sidebar
-            self.update_favorites_count()
-            
         except Exception as e:
             show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to update favorite status: {str(e)}")
 
-    def update_favorites_count(self):
+    def update_favorites_count(self, favorites_count=None):
         """Update the count of favorite items in the sidebar"""
         try:
             with self.vault.conn:
-                cursor = self.vault.conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM vault WHERE favorite = 1 AND deleted = 0")
-                favorites_count = cursor.fetchone()[0]
+                if favorites_count is None:
+                    cursor = self.vault.conn.cursor()
+                    cursor.execute("SELECT COUNT(*) FROM vault WHERE favorite = 1 AND deleted = 0")
+                    favorites_count = cursor.fetchone()[0]
                 
+                self.counts['favorites'] = favorites_count
+
                 # Update the count in the second item (Favorites)
                 favorites_item = self.main_items_list.item(1)
                 if favorites_item:
@@ -1096,10 +1107,8 @@ class MainWindow(QMainWindow):
 
                 # Update title and icon
                 self.detail_title.setText(password_data.get('title', ''))
-                if 'icon_data' in password_data and password_data['icon_data']:
-                    pixmap = QPixmap()
-                    if pixmap.loadFromData(password_data['icon_data']):
-                        self.detail_icon.setPixmap(pixmap.scaled(48, 48, Qt.AspectRatioMode.KeepAspectRatio))
+                self.detail_icon.setPixmap(
+                    PixmapCache.shared().pixmap(password_data.get('icon_data'), DETAIL_ICON_SIZE))
                 
                 # Update form fields
                 self.username_input.setText(password_data.get('username', ''))
@@ -1203,8 +1212,7 @@ class MainWindow(QMainWindow):
                 )
                 
                 if success:
-                    # Reload the entries to reflect changes
-                    self.load_vault_entries()
+                    # on_vault_change has updated the entry's row and the category counts
                     self.restore_view_mode()
                     show_message_box(self, QMessageBox.Icon.Information, "Success", "Changes saved successfully!")
                 else:
@@ -1256,13 +1264,10 @@ class MainWindow(QMainWindow):
     def delete_current_entry(self):
         """Move the currently selected password entry to trash"""
         try:
-            selected_item = self.password_list.currentItem()
-            if not selected_item or not hasattr(selected_item, 'password_data'):
+            title = self.password_list.current_title()
+            if not title:
                 return
             
-            password_data = selected_item.password_data
-            title = password_data['title']
-            
             reply = QMessageBox.question(
                 self, 'Move to Trash',
                 'Are you sure you want to move this password entry to trash?',
@@ -1271,37 +1276,28 @@ class MainWindow(QMainWindow):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
-                # Move to trash in database
-                with self.vault.conn:
-                    cursor = self.vault.conn.cursor()
-                    cursor.execute("UPDATE vault SET deleted = 1 WHERE title = ?", (title,))
-                    self.vault.conn.commit()
-                
-                # Remove from list
-                self.password_list.takeItem(self.password_list.row(selected_item))
+                # Move to trash in database; on_vault_change removes the row and updates the counts
+                self.vault.trash_entry(title)
                 
                 # Clear the form
                 self.clear_right_panel()
                 
-                # Update counts
-                self.update_total_count()  # Update All Items count
-                self.update_favorites_count()  # Update Favorites count if applicable
-                self.update_category_counts()  # Update category counts
-                self.update_trash_count()  # Ensure trash count is updated
-                
                 show_message_box(self, QMessageBox.Icon.Information, "Success", "Password entry moved to trash!")
         
         except Exception as e:
             show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to move entry to trash: {str(e)}")
 
-    def update_trash_count(self):
+    def update_trash_count(self, trash_count=None):
         """Update the count of items in trash"""
         try:
             with self.vault.conn:
-                cursor = self.vault.conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM vault WHERE deleted = 1")
-                trash_count = cursor.fetchone()[0]
+                if trash_count is None:
+                    cursor = self.vault.conn.cursor()
+                    cursor.execute("SELECT COUNT(*) FROM vault WHERE deleted = 1")
+                    trash_count = cursor.fetchone()[0]
                 
+                self.counts['trash'] = trash_count
+
                 # Update the count in Trash item (third item in the list)
                 trash_item = self.main_items_list.item(2)
                 if trash_item:
@@ -1448,9 +1444,9 @@ class MainWindow(QMainWindow):
         trash_panel.setLayout(layout)
         return trash_panel
 
-    def update_trash_details(self, item):
+    def update_trash_details(self, index):
         """Update the trash panel details when an item is selected"""
-        if not item or not hasattr(item, 'password_data'):
+        if not index or not index.isValid():
             return
         
         try:
@@ -1460,7 +1456,7 @@ class MainWindow(QMainWindow):
                     SELECT title, username, website 
                     FROM vault 
                     WHERE title = ? AND deleted = 1
-                """, (item.password_data['title'],))
+                """, (index.data(TITLE_ROLE),))
                 result = cursor.fetchone()
                 
                 if result:
@@ -1505,30 +1501,18 @@ class MainWindow(QMainWindow):
 
     def restore_from_trash(self):
         """Restore the selected password entry from trash"""
-        current_item = self.password_list.currentItem()
-        if not current_item or not hasattr(current_item, 'password_data'):
+        title = self.password_list.current_title()
+        if not title:
             return
             
         try:
-            # Get the title from password data
-            title = current_item.password_data['title']
-            
-            # Restore from trash in database
-            with self.vault.conn:
-                cursor = self.vault.conn.cursor()
-                cursor.execute("UPDATE vault SET deleted = 0 WHERE title = ?", (title,))
-                self.vault.conn.commit()
             
-            # Remove from list
-            self.password_list.takeItem(self.password_list.row(current_item))
+            # Restore from trash in database; on_vault_change removes the row and updates the counts
+            self.vault.restore_entry(title)
             
             # Clear the form
             self.clear_right_panel()
             
-            # Update counts
-            self.update_total_count()
-            self.update_trash_count()
-            
             show_message_box(self, QMessageBox.Icon.Information, "Success", "Password entry restored from trash!")
             
         except Exception as e:
@@ -1536,8 +1520,8 @@ class MainWindow(QMainWindow):
 
     def permanently_delete_entry(self):
         """Permanently delete the selected password entry from trash"""
-        current_item = self.password_list.currentItem()
-        if not current_item or not hasattr(current_item, 'password_data'):
+        title = self.password_list.current_title()
+        if not title:
             return
             
         reply = QMessageBox.warning(
@@ -1549,20 +1533,12 @@ class MainWindow(QMainWindow):
         
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                # Get the title from password data
-                title = current_item.password_data['title']
-                
                 # Delete from database
                 if self.vault.delete_entry(title):
-                    # Remove from list
-                    self.password_list.takeItem(self.password_list.row(current_item))
-                    
+                    # on_vault_change has removed the row and updated the trash count
                     # Clear the form
                     self.clear_right_panel()
                     
-                    # Update trash count
-                    self.update_trash_count()
-                    
                     show_message_box(self, QMessageBox.Icon.Information, "Success", "Password entry permanently deleted!")
                 else:
                     show_message_box(self, QMessageBox.Icon.Warning, "Error", "Entry not found or already deleted.")
@@ -1582,23 +1558,27 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 show_message_box(self, QMessageBox.Icon.Warning, "Error", f"Failed to open website: {str(e)}")
 
-    def load_categories(self):
-        """Load categories into the sidebar list"""
+    def load_categories(self, categories=None, counts=None):
+        """Load categories into the sidebar list (optionally from already loaded names/counts)"""
         try:
             self.categories_list.clear()
             self.categories_combo.clear()
+            self.counts['categories'] = {}
             
             # Add "Create New Category" to combo
             self.categories_combo.addItem("➕ Create New Category")
             
             with self.vault.conn:
-                cursor = self.vault.conn.cursor()
-                cursor.execute("""
-                    SELECT category_names 
-                    FROM categories 
-                    ORDER BY category_names
-                """)
-                categories = cursor.fetchall()
+                if categories is None:
+                    cursor = self.vault.conn.cursor()
+                    cursor.execute("""
+                        SELECT category_names 
+                        FROM categories 
+                        ORDER BY category_names
+                    """)
+                    categories = cursor.fetchall()
+                else:
+                    categories = [(name,) for name in categories]
                 
                 if categories:
                     self.categories_combo.insertSeparator(1)
@@ -1614,7 +1594,7 @@ class MainWindow(QMainWindow):
                     self.categories_combo.insertSeparator(1)
                     self.categories_combo.addItem("No Category")
                     
-                self.update_category_counts()
+                self.update_category_counts(counts)
                     
         except Exception as e:
             show_message_box(self, QMessageBox.Icon.Critical, "Error", f"Failed to load categories: {str(e)}")
@@ -1760,9 +1740,8 @@ class MainWindow(QMainWindow):
                 result = dialog.exec()
                 
                 if result:
-                    # Get the new category name and reload
+                    # on_vault_change has added the new category to the dropdown
                     new_category = dialog.get_values()['name']
-                    self.load_categories()
                     
                     # Select the newly created category
                     index = self.categories_combo.findText(new_category)
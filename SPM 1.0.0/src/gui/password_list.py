@@ -0,0 +1,338 @@
+import bisect
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPixmap
+from PyQt6.QtWidgets import QApplication, QListView, QStyle, QStyledItemDelegate
+from src.gui.pixmap_cache import PixmapCache
+
+# Size the password list draws icons at
+LIST_ICON_SIZE = 32
+
+# Extra data roles on PasswordListModel (DisplayRole is the title too)
+TITLE_ROLE = Qt.ItemDataRole.UserRole + 1
+USERNAME_ROLE = Qt.ItemDataRole.UserRole + 2
+ICON_DATA_ROLE = Qt.ItemDataRole.UserRole + 3
+
+
+class PasswordListModel(QAbstractListModel):
+    """
+    Rows of the password list: (icon, title, username, id) tuples as returned
+    by PasswordVault.list_entries and search.
+
+    The model keeps only the tuples. Icons come from the shared PixmapCache
+    when a row is painted, decoded there once per distinct icon, so only
+    visible rows cost anything beyond their tuple and a reload decodes
+    nothing. Filter listings are paged (set_pages): the
+    view asks for the next keyset page through canFetchMore/fetchMore when it
+    is scrolled to the bottom. Search results (set_results) are already in
+    memory but are inserted the same way, a page at a time. Vault changes
+    are applied as row inserts, removals, moves and updates (apply_change),
+    so the view keeps its selection and scroll position.
+    """
+
+    PAGE_SIZE = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._shared = {}
+        self._fetch_page = None
+        self._after_key = None
+        self._backlog = []
+        self._backlog_at = 0
+        # Rows are in (title, id) order, as list_entries pages are
+        self._sorted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        row = self._rows[index.row()]
+        icon_data, title, username = row[0], row[1], row[2]
+        if role in (Qt.ItemDataRole.DisplayRole, TITLE_ROLE):
+            return title
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.icon(icon_data)
+        if role == USERNAME_ROLE:
+            return username
+        if role == ICON_DATA_ROLE:
+            return icon_data
+        return None
+
+    def set_rows(self, rows):
+        """
+        Replace the list contents.
+
+        Args:
+            rows: Iterable of (icon, title, username, id)
+        """
+        self.beginResetModel()
+        self._fetch_page = None
+        self._after_key = None
+        self._backlog = []
+        self._backlog_at = 0
+        self._sorted = False
+        self._shared = {}
+        self._rows = self._share_icons(rows)
+        self.endResetModel()
+
+    def set_pages(self, fetch_page, first_page=None):
+        """
+        Replace the list contents with a paged listing, reading the first page now.
+
+        Args:
+            fetch_page: Callable (after_key, limit) returning the next keyset page
+                of rows, e.g. PasswordVault.list_entries
+            first_page (list, optional): Already read first page (e.g. from the
+                startup prefetch)
+        """
+        self.set_rows([])
+        self._fetch_page = fetch_page
+        self._sorted = True
+        self._append_page(first_page if first_page is not None else fetch_page(None, self.PAGE_SIZE))
+
+    def set_results(self, rows):
+        """
+        Replace the list contents with search results in one reset.
+
+        Only the first page becomes rows now; the rest are inserted as the
+        view scrolls, so applying 100k results costs the same as applying 200.
+
+        Args:
+            rows (list): (icon, title, username, id) rows, best match first
+        """
+        self.beginResetModel()
+        self._fetch_page = None
+        self._after_key = None
+        self._sorted = False
+        self._shared = {}
+        self._backlog = rows
+        self._backlog_at = min(len(rows), self.PAGE_SIZE)
+        self._rows = self._share_icons(rows[:self._backlog_at])
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._fetch_page is not None or self._backlog_at < len(self._backlog)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        if self._backlog_at < len(self._backlog):
+            page = self._backlog[self._backlog_at:self._backlog_at + self.PAGE_SIZE]
+            self._backlog_at += len(page)
+            self._insert(page)
+        elif self._fetch_page is not None:
+            self._append_page(self._fetch_page(self._after_key, self.PAGE_SIZE))
+
+    def _append_page(self, rows):
+        if len(rows) < self.PAGE_SIZE:
+            # A short page is the last one
+            self._fetch_page = None
+        if rows:
+            self._after_key = (rows[-1][1], rows[-1][3])
+            self._insert(rows)
+
+    def _insert(self, rows):
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(rows) - 1)
+        self._rows.extend(self._share_icons(rows))
+        self.endInsertRows()
+
+    def _share_icons(self, rows) -> list:
+        # SQLite returns a new bytes object per row; rows with the same icon share one
+        shared = self._shared
+        return [(shared.setdefault(row[0], row[0]) if row[0] else None,) + tuple(row[1:]) for row in rows]
+
+    def clear(self):
+        self.set_rows([])
+
+    def apply_change(self, change, accepts) -> bool:
+        """
+        Apply one vault change (changes.VaultChange) to the rows.
+
+        A listing in (title, id) order finds and places rows by binary
+        search; search results are matched by id and new entries are left
+        for the next search, as their rank is unknown.
+
+        Args:
+            change (VaultChange): Committed change to a vault entry
+            accepts: Callable(state dict) -> bool, whether an entry in that
+                state belongs in this listing (e.g. SearchQuery.accepts)
+
+        Returns:
+            bool: True if a row was inserted, removed, moved or updated
+        """
+        before = change.before if change.before and accepts(change.before) else None
+        after = change.after if change.after and accepts(change.after) else None
+        # Search results are found by id whatever accepts says, so a shown row never goes stale
+        old = self._find(change.before) if before or (change.before and not self._sorted) else None
+        if old is None and change.before and not self._sorted:
+            # A search result not inserted yet, if it is one
+            self._patch_backlog(change.id, change.list_row(after) if after else None)
+            return False
+        if old is None and after is None:
+            return False
+
+        row = self._share_icons([change.list_row(after)])[0] if after else None
+        if old is None:
+            position = self._insert_position(row)
+            if position is None:
+                return False
+            self.beginInsertRows(QModelIndex(), position, position)
+            self._rows.insert(position, row)
+            self.endInsertRows()
+        elif row is None:
+            self.beginRemoveRows(QModelIndex(), old, old)
+            del self._rows[old]
+            self.endRemoveRows()
+        else:
+            position = self._insert_position(row, old)
+            if position is None:
+                # Sorts past the loaded pages now; the page it belongs to brings it back
+                self.beginRemoveRows(QModelIndex(), old, old)
+                del self._rows[old]
+                self.endRemoveRows()
+            elif position in (old, old + 1):
+                self._rows[old] = row
+                index = self.index(old)
+                self.dataChanged.emit(index, index)
+            else:
+                self.beginMoveRows(QModelIndex(), old, old, QModelIndex(), position)
+                del self._rows[old]
+                self._rows.insert(position - 1 if position > old else position, row)
+                self.endMoveRows()
+        return True
+
+    def _find(self, state):
+        """Row number of the entry in state, or None if it isn't loaded"""
+        if self._sorted:
+            key = (state['title'], state['id'])
+            position = bisect.bisect_left(self._rows, key, key=lambda row: (row[1], row[3]))
+            if position < len(self._rows) and self._rows[position][3] == state['id']:
+                return position
+            return None
+        for position, row in enumerate(self._rows):
+            if row[3] == state['id']:
+                return position
+        return None
+
+    def _patch_backlog(self, entry_id, row):
+        """Replace (or with None, drop) an entry in the search results still to be inserted"""
+        rest = []
+        for pending in self._backlog[self._backlog_at:]:
+            if pending[3] != entry_id:
+                rest.append(pending)
+            elif row is not None:
+                rest.append(row)
+        self._backlog, self._backlog_at = rest, 0
+
+    def _insert_position(self, row, current=None):
+        """
+        Where row goes (the row number to insert before), or None if it
+        isn't shown: it sorts after the loaded pages, or these are search results.
+        """
+        if not self._sorted:
+            return current
+        key = (row[1], row[3])
+        rows = self._rows
+        if current is not None and (current == 0 or (rows[current - 1][1], rows[current - 1][3]) < key) and \
+                (current + 1 == len(rows) or key < (rows[current + 1][1], rows[current + 1][3])):
+            return current
+        position = bisect.bisect_left(rows, key, key=lambda other: (other[1], other[3]))
+        if position == len(rows) and self._fetch_page is not None:
+            return None
+        return position
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or count < 1 or row + count > len(self._rows):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self._rows[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    def title(self, row: int) -> str:
+        return self._rows[row][1]
+
+    def icon(self, icon_data: bytes) -> QPixmap:
+        """List-size pixmap for icon bytes, the default icon if missing or unreadable"""
+        return PixmapCache.shared().pixmap(icon_data, LIST_ICON_SIZE)
+
+
+class PasswordItemDelegate(QStyledItemDelegate):
+    """
+    Paints a password list row: the icon in a 40px box and the bold title,
+    laid out like the per-row QLabel widgets it replaces. Hover and selection
+    backgrounds come from the list's stylesheet (PASSWORD_LIST_STYLE).
+    """
+
+    MARGIN_X = 10
+    MARGIN_Y = 8
+    ICON_BOX = 40
+    TEXT_GAP = 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._title_font = QFont()
+        self._title_font.setPixelSize(16)
+        self._title_font.setBold(True)
+        self._title_metrics = QFontMetrics(self._title_font)
+        self._title_color = QColor("white")
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ICON_BOX + 2 * self.MARGIN_Y)
+
+    def paint(self, painter, option, index):
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, widget)
+
+        rect = option.rect
+        icon_box = QRect(rect.left() + self.MARGIN_X, rect.top() + (rect.height() - self.ICON_BOX) // 2,
+                         self.ICON_BOX, self.ICON_BOX)
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+        if pixmap is not None and not pixmap.isNull():
+            # Pixmaps may carry a device pixel ratio; center on their logical size
+            size = pixmap.deviceIndependentSize()
+            painter.drawPixmap(icon_box.left() + int(self.ICON_BOX - size.width()) // 2,
+                               icon_box.top() + int(self.ICON_BOX - size.height()) // 2, pixmap)
+
+        text_rect = QRect(icon_box.right() + self.TEXT_GAP, rect.top(),
+                          rect.right() - self.MARGIN_X - icon_box.right() - self.TEXT_GAP, rect.height())
+        title = self._title_metrics.elidedText(index.data(TITLE_ROLE) or "", Qt.TextElideMode.ElideRight,
+                                               text_rect.width())
+        painter.save()
+        painter.setFont(self._title_font)
+        painter.setPen(self._title_color)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, title)
+        painter.restore()
+
+
+class PasswordListView(QListView):
+    """The middle-panel password list: a PasswordListModel drawn by PasswordItemDelegate"""
+
+    LAYOUT_BATCH = 2000
+
+    def __init__(self, model: PasswordListModel, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setItemDelegate(PasswordItemDelegate(self))
+        # Every row is the same height, so the view never measures rows it doesn't show.
+        # Laying out still visits each row (through Python's rowCount); in batches the
+        # first screen paints right away and the rest is laid out between events.
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(self.LAYOUT_BATCH)
+        self.setSpacing(2)
+        self.setMouseTracking(True)
+        self.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QListView.SelectionMode.SingleSelection)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+
+    def current_title(self):
+        """Title of the current row, or None"""
+        index = self.currentIndex()
+        return index.data(TITLE_ROLE) if index.isValid() else None
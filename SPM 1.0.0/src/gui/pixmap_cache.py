@@ -0,0 +1,175 @@
+import hashlib
+import os
+from collections import OrderedDict
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap
+from src.utils import resource_path
+
+ICONS_DIR = os.path.join('resources', 'icons')
+# Shown for entries without an icon or with one that won't decode
+DEFAULT_ICON = 'web_icon.png'
+
+
+class PixmapCache:
+    """
+    Decoded, scaled icon pixmaps shared by every view in the process.
+
+    Entries are keyed by (content hash, size), so the same favicon stored on
+    many entries, or the default icon saved as an entry's icon, is decoded
+    once per size however many rows, views or reloads show it. Entry icons
+    live in an LRU bounded by their pixel bytes. The icons under
+    resources/icons are read once (preload) and never evicted.
+
+    QPixmap belongs to the UI thread: use the cache only from there. Images
+    decoded elsewhere come in through insert_image.
+    """
+
+    BUDGET_BYTES = 16 * 2**20
+
+    _shared = None
+
+    def __init__(self, budget_bytes: int = None):
+        self.budget_bytes = budget_bytes if budget_bytes is not None else self.BUDGET_BYTES
+        # (digest, size) -> (pixmap, bytes counted against the budget)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # Resource icons: name -> file bytes, and (digest, size) -> pixmap, never evicted
+        self._resource_data = {}
+        self._pinned = {}
+        self.decodes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls) -> 'PixmapCache':
+        """The process-wide cache"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def key(data: bytes, size: int = None) -> tuple:
+        return hashlib.blake2b(data, digest_size=16).digest(), size
+
+    def preload(self, sizes=()):
+        """Read every icon under resources/icons, plus the default icon at each of sizes"""
+        directory = resource_path(ICONS_DIR)
+        try:
+            names = sorted(name for name in os.listdir(directory) if name.endswith('.png'))
+        except OSError as e:
+            print(f"Debug - Could not list icons: {str(e)}")
+            return
+        for name in names:
+            self.resource(name)
+        for size in sizes:
+            self.default_icon(size)
+
+    def resource_data(self, name: str) -> bytes:
+        """Raw bytes of a resources/icons file (empty if it can't be read)"""
+        data = self._resource_data.get(name)
+        if data is None:
+            try:
+                with open(resource_path(os.path.join(ICONS_DIR, name)), 'rb') as f:
+                    data = f.read()
+            except OSError as e:
+                print(f"Debug - Could not read icon {name}: {str(e)}")
+                data = b''
+            self._resource_data[name] = data
+        return data
+
+    def resource(self, name: str, size: int = None) -> QPixmap:
+        """A resources/icons pixmap, at its own size or scaled to fit size x size"""
+        data = self.resource_data(name)
+        key = self.key(data, size)
+        pixmap = self._pinned.get(key)
+        if pixmap is None:
+            pixmap = self._decode(data, size) or QPixmap()
+            self._pinned[key] = pixmap
+        return pixmap
+
+    def default_icon(self, size: int = None) -> QPixmap:
+        return self.resource(DEFAULT_ICON, size)
+
+    def pixmap(self, data: bytes, size: int = None) -> QPixmap:
+        """
+        Decoded pixmap for icon bytes.
+
+        Args:
+            data (bytes): Encoded image (PNG, ICO, ...), e.g. an entry's icon
+            size (int, optional): Scale to fit a size x size box, keeping the aspect ratio
+
+        Returns:
+            QPixmap: The default icon at that size if data is empty or won't decode
+        """
+        if not data:
+            return self.default_icon(size)
+        key = self.key(data, size)
+        pixmap = self._pinned.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            return pixmap
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        pixmap = self._decode(data, size)
+        self._store(key, pixmap, size)
+        return self._entries[key][0]
+
+    def insert_image(self, data: bytes, size: int, image):
+        """
+        Add an icon decoded off the UI thread (e.g. by the startup prefetch).
+
+        Args:
+            data (bytes): The icon bytes the image was decoded from
+            size (int): Box the image was scaled to fit
+            image (QImage): The decoded image, None if data didn't decode
+        """
+        if not data:
+            return
+        key = self.key(data, size)
+        if key in self._pinned or key in self._entries:
+            return
+        self._store(key, QPixmap.fromImage(image) if image is not None else None, size)
+
+    def clear(self):
+        """Drop every entry icon; resource icons stay"""
+        self._entries.clear()
+        self._bytes = 0
+
+    def cache_stats(self) -> dict:
+        """Return entry count, bytes used and hit/miss/decode counters"""
+        return {
+            'size': len(self._entries),
+            'bytes': self._bytes,
+            'budget_bytes': self.budget_bytes,
+            'pinned': len(self._pinned),
+            'hits': self.hits,
+            'misses': self.misses,
+            'decodes': self.decodes,
+        }
+
+    def _decode(self, data: bytes, size: int = None):
+        """QPixmap for data scaled to size, None if it doesn't decode"""
+        self.decodes += 1
+        pixmap = QPixmap()
+        if not data or not pixmap.loadFromData(data):
+            return None
+        if size is not None:
+            pixmap = pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio)
+        return pixmap
+
+    def _store(self, key: tuple, pixmap, size: int = None):
+        """Insert an entry icon, evicting the least recently used past the budget"""
+        if pixmap is None:
+            # Unreadable: remember that, and show the default icon it shares
+            pixmap, cost = self.default_icon(size), 0
+        else:
+            cost = pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+        self._entries[key] = (pixmap, cost)
+        self._bytes += cost
+        while self._bytes > self.budget_bytes and len(self._entries) > 1:
+            _, (_, old_cost) = self._entries.popitem(last=False)
+            self._bytes -= old_cost
@@ -0,0 +1,196 @@
+import sqlite3
+import threading
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from src.core import changes
+from src.core.database import PasswordVault
+
+
+class SearchWorker(QObject):
+    """
+    Run search-box queries on a background thread, newest query only.
+
+    request() restarts a short debounce timer, so a burst of keystrokes
+    becomes one query. When the timer fires, the query is handed to a worker
+    thread with its own PasswordVault connection (sqlite connections are
+    bound to their thread), which keeps its FuzzyMatcher across queries;
+    prepare() builds it before the first keystroke, and starts the
+    TrigramIndex that narrows long queries down. Changes committed
+    through the GUI's vault come in through apply_change and patch both
+    before the next query, instead of rebuilding them.
+
+    Every request supersedes the ones before it:
+    - a query still waiting is dropped;
+    - a query running in SQLite is interrupted;
+    - an older query's results are never emitted.
+
+    results and failed carry the query's serial number, and only the
+    latest serial is ever emitted.
+    """
+
+    results = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+    DEBOUNCE_MS = 120
+    # Past this many changes waiting for the worker, rebuilding its matcher is cheaper than patching it
+    MAX_QUEUED_CHANGES = 256
+
+    def __init__(self, db_path, profile=None, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.profile = profile
+        self._serial = 0
+        # Debounced request not yet handed to the worker
+        self._queued = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._submit)
+
+        # Shared with the worker thread
+        self._condition = threading.Condition()
+        self._pending = None
+        self._running = None
+        # VaultChanges not yet applied to the worker's matcher
+        self._changes = []
+        self._conn = None
+        self._stopped = False
+        self._thread = None
+
+    def request(self, text: str, filter_type: str = None, category: str = None) -> int:
+        """Search for text (see PasswordVault.fuzzy_search) once typing pauses; returns its serial"""
+        self._serial += 1
+        self._queued = (self._serial, text, filter_type, category)
+        self._interrupt_stale()
+        self._timer.start(self.DEBOUNCE_MS)
+        return self._serial
+
+    def prepare(self):
+        """Start the worker and build its FuzzyMatcher and search index now, so the first keystroke doesn't wait"""
+        with self._condition:
+            if self._pending is None:
+                self._pending = (None, None, None, None)
+            self._start()
+
+    def apply_change(self, change):
+        """Queue a committed change (PasswordVault listener) for the worker's matcher"""
+        with self._condition:
+            if self._thread is None:
+                # No matcher yet; the worker's first query builds one that includes it
+                return
+            if len(self._changes) >= self.MAX_QUEUED_CHANGES:
+                self._changes = [changes.VaultChange(changes.RESET)]
+            else:
+                self._changes.append(change)
+
+    def cancel(self):
+        """Drop every query requested so far"""
+        self._serial += 1
+        self._queued = None
+        self._timer.stop()
+        with self._condition:
+            self._pending = None
+        self._interrupt_stale()
+
+    def is_current(self, serial: int) -> bool:
+        return serial == self._serial
+
+    def is_idle(self) -> bool:
+        """True once nothing is waiting for the debounce timer or the worker"""
+        with self._condition:
+            return self._queued is None and self._pending is None and self._running is None
+
+    def stop(self):
+        """Cancel everything and let the worker thread close its connection"""
+        self.cancel()
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _submit(self):
+        if self._queued is None:
+            return
+        with self._condition:
+            if self._stopped:
+                return
+            self._pending, self._queued = self._queued, None
+            self._start()
+
+    def _start(self):
+        # Called with the condition held
+        if self._stopped:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="search", daemon=True)
+            self._thread.start()
+        self._condition.notify()
+
+    def _interrupt_stale(self):
+        """Abort the worker's SQL if it belongs to a superseded query"""
+        with self._condition:
+            serial = self._running[0] if self._running else None
+            if serial is not None and not self.is_current(serial) and self._conn is not None:
+                self._conn.interrupt()
+
+    def _run(self):
+        vault = None
+        try:
+            vault = PasswordVault(self.db_path, profile=self.profile)
+            with self._condition:
+                self._conn = vault.conn
+            while True:
+                with self._condition:
+                    while self._pending is None and not self._stopped:
+                        self._condition.wait()
+                    if self._stopped:
+                        return
+                    request, self._pending = self._pending, None
+                    vault_changes, self._changes = self._changes, []
+                    self._running = request
+
+                try:
+                    vault.apply_changes(vault_changes)
+                except Exception as e:
+                    print(f"Debug - Search worker could not apply vault changes: {str(e)}")
+                    vault.apply_changes([changes.VaultChange(changes.RESET)])
+
+                serial, text, filter_type, category = request
+                if serial is None:
+                    # prepare()
+                    try:
+                        vault.fuzzy_matcher()
+                        if vault.search_index is None:
+                            vault.start_search_index()
+                    except Exception as e:
+                        print(f"Debug - Search worker could not build its matcher: {str(e)}")
+                    with self._condition:
+                        self._running = None
+                    continue
+                try:
+                    rows = vault.fuzzy_search(text, filter_type, category)
+                except sqlite3.OperationalError as e:
+                    rows = None
+                    if self.is_current(serial):
+                        if 'interrupt' in str(e):
+                            # Hit by an interrupt meant for the query before it; run it again
+                            with self._condition:
+                                if self._pending is None:
+                                    self._pending = request
+                        else:
+                            self.failed.emit(serial, str(e))
+                except Exception as e:
+                    rows = None
+                    if self.is_current(serial):
+                        self.failed.emit(serial, str(e))
+                finally:
+                    with self._condition:
+                        self._running = None
+
+                if rows is not None and self.is_current(serial):
+                    self.results.emit(serial, rows)
+        except Exception as e:
+            print(f"Debug - Search worker failed: {str(e)}")
+        finally:
+            with self._condition:
+                self._conn = None
+                self._thread = None
+            if vault and vault.conn:
+                vault.conn.close()
@@ -0,0 +1,119 @@
+import threading
+import time
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage
+from src.core.database import PasswordVault
+from src.gui.password_list import LIST_ICON_SIZE, PasswordListModel
+from src.gui.pixmap_cache import PixmapCache
+
+
+class StartupTimer:
+    """Wall-clock marks for the startup pipeline, printed as a report"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.marks = {}
+
+    def mark(self, name):
+        self.marks.setdefault(name, time.perf_counter() - self.origin)
+
+    def span(self, start, end):
+        if start in self.marks and end in self.marks:
+            return self.marks[start], self.marks[end]
+        return None
+
+    def report(self):
+        """Return the startup report lines, including how much prefetch overlapped the KDF"""
+        lines = ["Startup timing (ms since launch):"]
+        for name, at in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"  {name:<20}{at * 1000:9.1f}")
+
+        prefetch = self.span('prefetch_start', 'prefetch_done')
+        unlock = self.span('unlock_start', 'keys_ready')
+        if prefetch:
+            lines.append(f"  prefetch took        {(prefetch[1] - prefetch[0]) * 1000:9.1f}")
+        if unlock:
+            lines.append(f"  unlock KDF took      {(unlock[1] - unlock[0]) * 1000:9.1f}")
+        if prefetch and unlock:
+            overlap = max(0.0, min(prefetch[1], unlock[1]) - max(prefetch[0], unlock[0]))
+            lines.append(f"  prefetch/KDF overlap {overlap * 1000:9.1f}")
+        shown = self.span('keys_ready', 'window_shown')
+        if shown:
+            lines.append(f"  keys -> window shown {(shown[1] - shown[0]) * 1000:9.1f}")
+        return lines
+
+
+class MetadataPrefetch:
+    """
+    Load list metadata and decode icons on a background thread.
+
+    Nothing in the list needs the vault key, so this runs while the user types
+    the password and the unlock KDF runs. Rows and counts come from a private
+    vault connection; icons are decoded into QImages (safe off the UI thread)
+    and handed to the shared PixmapCache in result(), which must be called on
+    the UI thread.
+    """
+
+    def __init__(self, db_path, timer=None):
+        self.db_path = db_path
+        self.timer = timer
+        self.metadata = None
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="metadata-prefetch", daemon=True)
+
+    def start(self):
+        if self.timer:
+            self.timer.mark('prefetch_start')
+        self._thread.start()
+        return self
+
+    def _decode_icon(self, data):
+        image = QImage.fromData(data) if data else QImage()
+        if image.isNull():
+            return None
+        return image.scaled(LIST_ICON_SIZE, LIST_ICON_SIZE, Qt.AspectRatioMode.KeepAspectRatio)
+
+    def _run(self):
+        vault = None
+        try:
+            vault = PasswordVault(self.db_path)
+            # Only the first page; the list reads the rest as it is scrolled
+            metadata = vault.read_list_metadata(limit=PasswordListModel.PAGE_SIZE)
+
+            # Decode each distinct icon once
+            images = {}
+            for icon_data, *_ in metadata['entries']:
+                if icon_data and icon_data not in images:
+                    images[icon_data] = self._decode_icon(icon_data)
+            metadata['images'] = images
+            self.metadata = metadata
+        except Exception as e:
+            self.error = e
+            print(f"Debug - Metadata prefetch failed: {str(e)}")
+        finally:
+            if vault and vault.conn:
+                vault.conn.close()
+            if self.timer:
+                self.timer.mark('prefetch_done')
+
+    def result(self, timeout=None):
+        """
+        Wait for the prefetch, cache its decoded icons and return the list rows.
+
+        Returns:
+            dict: 'entries' (first page of (icon, title, username, id) rows),
+            'categories' and 'counts', or None if the prefetch failed
+        """
+        self._thread.join(timeout)
+        if self._thread.is_alive() or self.metadata is None:
+            return None
+
+        metadata = self.metadata
+        cache = PixmapCache.shared()
+        for data, image in metadata['images'].items():
+            cache.insert_image(data, LIST_ICON_SIZE, image)
+        return {
+            'entries': metadata['entries'],
+            'categories': metadata['categories'],
+            'counts': metadata['counts'],
+        }
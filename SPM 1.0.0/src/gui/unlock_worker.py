@@ -0,0 +1,72 @@
+import threading
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from src.core.database import PasswordVault
+
+
+class UnlockSignals(QObject):
+    """Signals emitted by UnlockWorker (delivered on the UI thread)"""
+    progress = pyqtSignal(int, str)
+    keys_ready = pyqtSignal(bytes)
+    invalid_password = pyqtSignal()
+    account_exists = pyqtSignal()
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class UnlockWorker(QRunnable):
+    """
+    Run the unlock KDF on a QThreadPool thread.
+
+    The worker opens its own PasswordVault connection (sqlite connections are
+    bound to their thread), runs the login there, or with create=True the
+    first-time account setup, and hands the data key back through keys_ready.
+    A cancelled unlock still lets the current KDF finish, but its result is
+    discarded.
+    """
+
+    def __init__(self, db_path, username, password, create=False):
+        super().__init__()
+        self.db_path = db_path
+        self.username = username
+        self.password = password
+        self.create = create
+        self.signals = UnlockSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def report_progress(self, percent, message):
+        if not self.is_cancelled():
+            self.signals.progress.emit(percent, message)
+
+    def run(self):
+        vault = None
+        try:
+            vault = PasswordVault(self.db_path)
+            if self.create:
+                unlocked = vault.create_master_account(self.username, self.password, progress=self.report_progress)
+            else:
+                unlocked = vault.login(self.username, self.password, progress=self.report_progress)
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+            elif unlocked:
+                self.signals.progress.emit(100, "Unlocked")
+                self.signals.keys_ready.emit(vault.cipher.get_data_key())
+            elif self.create:
+                self.signals.account_exists.emit()
+            else:
+                self.signals.invalid_password.emit()
+        except Exception as e:
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.failed.emit(str(e))
+        finally:
+            if vault:
+                # Wipe this connection's copy of the keys; the UI thread's vault installs its own
+                vault.close()
+            self.password = None
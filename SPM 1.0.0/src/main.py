@@ -5,7 +5,11 @@ from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QIcon
 from src.gui.main_window import MainWindow
 from src.gui.login_dialog import LoginDialog
+from src.gui.password_list import LIST_ICON_SIZE
+from src.gui.pixmap_cache import PixmapCache
+from src.gui.startup import MetadataPrefetch, StartupTimer
 from src.core.database import PasswordVault
+from src.core.encryption import Encryption
 from src.utils import resource_path
 
 def initialize_database():
@@ -31,18 +35,45 @@ def resource_path(relative_path):
 
 def main():
     try:
+        timer = StartupTimer()
         vault = initialize_database()
         app = QApplication(sys.argv)
         app.setStyle('Fusion')
+        # Wipe any keys still held when the application shuts down (the window locks its vault on close),
+        # after the ciphertext migration has finished its batch
+        app.aboutToQuit.connect(vault.stop_ciphertext_migration)
+        app.aboutToQuit.connect(Encryption.clear_all_key_caches)
         # icon_path = resource_path(os.path.join(os.path.join(os.path.dirname(__file__), '..', 'resources', 'icons', 'lock_icon.png'))
-        icon_path = resource_path(os.path.join('resources', 'icons', 'lock_icon.png'))
-        app.setWindowIcon(QIcon(icon_path))
+        # Decode the bundled icons once; every view draws them from the shared cache
+        icons = PixmapCache.shared()
+        icons.preload(sizes=(LIST_ICON_SIZE,))
+        app.setWindowIcon(QIcon(icons.resource('lock_icon.png')))
         
+        # List metadata and icons need no key: load them while the user logs in
+        prefetch = MetadataPrefetch(vault.db_path, timer).start()
+
         login = LoginDialog(vault)
+        windows = []
+
+        def build_main_window():
+            # Build the window while the unlock KDF runs, populated from the prefetch
+            if not windows:
+                windows.append(MainWindow(vault, login.master_password, prefetch.result()))
+                timer.mark('window_built')
+
+        login.unlock_started.connect(lambda: timer.mark('unlock_start'))
+        login.unlock_started.connect(build_main_window)
+        login.keys_ready.connect(lambda: timer.mark('keys_ready'))
         if login.exec():
-            vault.setup_encryption(login.master_password)
-            window = MainWindow(vault, login.master_password)
+            # The vault cipher was already unlocked by the login KDF
+            vault.start_ciphertext_migration()
+            build_main_window()
+            window = windows[0]
+            window.master_password = login.master_password
             window.show()
+            timer.mark('window_shown')
+            for line in timer.report():
+                print(f"Debug - {line}")
             sys.exit(app.exec())
     except Exception as e:
         print(f"Application error: {str(e)}")
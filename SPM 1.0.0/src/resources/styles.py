@@ -75,19 +75,19 @@ TITLE_STYLE_ENHANCED = """
 
 # Password List style
 PASSWORD_LIST_STYLE = """
-    QListWidget {
+    QListView {
         background-color: #1e1e1e;
         border: none;
     }
-    QListWidget::item {
+    QListView::item {
         padding: 5px;
         margin: 2px;
     }
-    QListWidget::item:hover {
+    QListView::item:hover {
         background-color: #3D3D3D;
         border-radius: 4px;
     }
-    QListWidget::item:selected {
+    QListView::item:selected {
         background-color: #2D2D2D;
         border-radius: 4px;
     }